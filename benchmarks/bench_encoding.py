@@ -0,0 +1,67 @@
+"""Measure the cost of encoding a large ``Table`` card with each available encoder.
+
+Encodes the serialized data structure of a card holding a table of ``--rows`` rows and
+``--columns`` columns with every installed encoder, and compares that with sending a
+card whose encoded JSON is already cached by ``Entity.to_json()``.
+
+    python benchmarks/bench_encoding.py --rows 500 --columns 6
+"""
+import argparse
+import timeit
+
+from msteams_webhooks import AdaptiveCard, Column, Table, TableCell, TableRow, TextBlock, encoders
+
+
+def build_card(rows: int, columns: int) -> AdaptiveCard:
+    header = TableRow(cells=[TableCell(items=[TextBlock(f"Column {c}")]) for c in range(columns)])
+    body = [
+        TableRow(cells=[TableCell(items=[TextBlock(f"Row {r} value {c}")]) for c in range(columns)])
+        for r in range(rows)
+    ]
+    table = Table(
+        columns=[Column(width="auto") for _ in range(columns)],
+        rows=[header, *body],
+        first_row_as_headers=True,
+    )
+    return AdaptiveCard(body=[table])
+
+
+def measure(func: object, number: int) -> float:
+    """Return the best average time per call, in seconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number  # type: ignore[arg-type]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--columns", type=int, default=6)
+    parser.add_argument("--number", type=int, default=20, help="encodes per measurement")
+    args = parser.parse_args()
+
+    card = build_card(args.rows, args.columns)
+    payload = card.serialize()
+    size = len(encoders.json_encoder(payload))
+    print(f"Table card: {args.rows} rows x {args.columns} columns, {size / 1024:.1f} KiB encoded")
+
+    candidates = [("json (stdlib)", encoders.json_encoder)]
+    if encoders.orjson is not None:
+        candidates.append(("orjson", encoders.orjson_encoder))
+    if encoders.msgspec is not None:
+        candidates.append(("msgspec", encoders.msgspec_encoder))
+
+    baseline = None
+    for label, encoder in candidates:
+        seconds = measure(lambda encoder=encoder: encoder(payload), args.number)
+        baseline = baseline or seconds
+        print(
+            f"{label:>16}: {seconds * 1e3:8.3f} ms/encode, {size / seconds / 1e6:8.1f} MB/s,"
+            f" {baseline / seconds:5.1f}x",
+        )
+
+    card.to_json()
+    seconds = measure(lambda: encoders.encode_message(card.to_json()), args.number * 100)
+    print(f"{'cached to_json':>16}: {seconds * 1e3:8.3f} ms/encode, {baseline / seconds:8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Compare HTTP/1.1 and HTTP/2 throughput of ``AsyncTeamsWebhook``.
+
+Starts a local server that answers like a Teams webhook after a fixed delay (to stand in
+for network and server latency), then posts the same batch of cards over HTTP/1.1 and
+over HTTP/2, reporting throughput and the number of connections each opened.
+
+HTTP/2 is spoken in cleartext with prior knowledge, since the local server has no TLS
+certificate. Against Teams itself, HTTP/2 is negotiated during the TLS handshake.
+
+Requires the ``http2`` extra::
+
+    pip install msteams_webhooks[http2]
+    python benchmarks/bench_http2.py --cards 1000 --concurrency 100 --latency 0.05
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+except ImportError as exc:  # pragma: no cover
+    raise SystemExit("This benchmark requires h2: pip install msteams_webhooks[http2]") from exc
+
+from msteams_webhooks import AdaptiveCard, AsyncTeamsWebhook, TextBlock
+
+
+class Server:
+    """Minimal local webhook server speaking HTTP/1.1 and cleartext HTTP/2."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.connections = 0
+
+    async def handle_http1(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    name, _, value = line.partition(b":")
+                    if name.lower() == b"content-length":
+                        length = int(value)
+                await reader.readexactly(length)
+                await asyncio.sleep(self.latency)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\n1")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    async def handle_http2(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        self.connections += 1
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+
+        async def respond(stream_id: int) -> None:
+            await asyncio.sleep(self.latency)
+            conn.send_headers(stream_id, [(":status", "200"), ("content-length", "1")])
+            conn.send_data(stream_id, b"1", end_stream=True)
+            writer.write(conn.data_to_send())
+
+        tasks = set()
+        while data := await reader.read(65536):
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.DataReceived):
+                    conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                elif isinstance(event, h2.events.StreamEnded):
+                    task = asyncio.create_task(respond(event.stream_id))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            writer.write(conn.data_to_send())
+        writer.close()
+
+
+async def run(cards: int, concurrency: int, latency: float, max_connections: int) -> None:
+    server = Server(latency)
+    http1_server = await asyncio.start_server(server.handle_http1, "127.0.0.1", 0)
+    http2_server = await asyncio.start_server(server.handle_http2, "127.0.0.1", 0)
+    limits = httpx.Limits(max_connections=max_connections)
+    batch = [AdaptiveCard(body=[TextBlock(f"Message {n}")]) for n in range(cards)]
+    print(f"{cards} cards, concurrency {concurrency}, {latency * 1000:.0f} ms latency")
+    for label, listener, transport in (
+        ("HTTP/1.1", http1_server, httpx.AsyncHTTPTransport(limits=limits)),
+        ("HTTP/2", http2_server, httpx.AsyncHTTPTransport(limits=limits, http1=False, http2=True)),
+    ):
+        port = listener.sockets[0].getsockname()[1]
+        channel = AsyncTeamsWebhook(f"http://127.0.0.1:{port}/webhook", transport=transport)
+        server.connections = 0
+        start = time.perf_counter()
+        results = await channel.send_many(batch, concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+        await channel.close()
+        failed = sum(not result.ok for result in results)
+        print(
+            f"{label:>8}: {cards / elapsed:8.1f} cards/s, {server.connections:3d} connections"
+            + (f", {failed} failed" if failed else ""),
+        )
+    http1_server.close()
+    http2_server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per response")
+    parser.add_argument("--max-connections", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.cards, args.concurrency, args.latency, args.max_connections))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Measure the memory used by card entities.
+
+Creates ``--number`` instances of several element and container classes, and reports the
+bytes allocated per instance, including their attribute storage but not their argument
+values. Run it against two revisions to compare them.
+
+    python benchmarks/bench_memory.py --number 10000
+"""
+import argparse
+import tracemalloc
+from typing import Callable
+
+from msteams_webhooks import Fact, Image, TableCell, TableRow, TextBlock
+from msteams_webhooks.base import Entity
+
+TEXT = "Lorem ipsum"
+URL = "https://example.com/image.png"
+
+CASES: list[tuple[str, Callable[[], Entity]]] = [
+    ("TextBlock", lambda: TextBlock(TEXT)),
+    ("TextBlock (styled)", lambda: TextBlock(TEXT, weight="bolder", size="large", wrap=True)),
+    ("Fact", lambda: Fact(TEXT, TEXT)),
+    ("Image", lambda: Image(URL)),
+    ("TableCell", lambda: TableCell(items=[])),
+    ("TableRow", lambda: TableRow(cells=[])),
+]
+
+
+def per_instance(factory: Callable[[], Entity], number: int) -> float:
+    """Return the average number of bytes allocated by each call to `factory`."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    instances = [factory() for _ in range(number)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Don't count the list holding the instances.
+    return (after - before - instances.__sizeof__()) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=10_000, help="instances per class")
+    args = parser.parse_args()
+
+    for label, factory in CASES:
+        print(f"{label:>20}: {per_instance(factory, args.number):8.1f} bytes/instance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Measure the cost of serializing a large, deeply nested card from scratch.
+
+Builds a dashboard-like card of ``--sections`` containers, each holding a column set, a
+fact set and a table, nested ``--depth`` containers deep, and times ``serialize()`` with
+every entity's cache cleared beforehand, both recursively (the default) and with the
+explicit-stack walk used for cards nested too deeply to recurse. Also reports the number
+of Python function calls made, which unlike timings is not affected by a noisy machine.
+
+    python benchmarks/bench_serialize.py --sections 20 --depth 8
+    python benchmarks/bench_serialize.py --sections 1 --depth 5000
+"""
+import argparse
+import sys
+import timeit
+from typing import Any, Callable
+
+from msteams_webhooks import (
+    AdaptiveCard,
+    Column,
+    ColumnSet,
+    Container,
+    Fact,
+    FactSet,
+    Image,
+    OpenURLAction,
+    Table,
+    TableCell,
+    TableRow,
+    TextBlock,
+    base,
+)
+from msteams_webhooks.base import Entity
+
+
+def build_section(index: int, depth: int) -> Container:
+    columns = ColumnSet(
+        columns=[
+            Column(items=[TextBlock(f"Metric {c}", weight="bolder"), TextBlock(f"{c * index}%")])
+            for c in range(4)
+        ],
+    )
+    facts = FactSet(facts=[Fact(f"Key {f}", f"Value {f}") for f in range(6)])
+    table = Table(
+        columns=[Column(width="auto") for _ in range(4)],
+        rows=[
+            TableRow(cells=[TableCell(items=[TextBlock(f"{r}:{c}", wrap=True)]) for c in range(4)])
+            for r in range(10)
+        ],
+        first_row_as_headers=True,
+    )
+    image = Image("https://example.com/chart.png", alt_text="Chart", size="medium")
+    section = Container(
+        items=[TextBlock(f"Section {index}", size="large"), columns, facts, table, image],
+        select_action=OpenURLAction("https://example.com/"),
+        style="emphasis",
+    )
+    for _ in range(depth):
+        section = Container(items=[section], bleed=False)
+    return section
+
+
+def entities(value: Any) -> list[Entity]:  # noqa: ANN401
+    """Return every entity reachable from `value`."""
+    found = []
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, Entity):
+            found.append(value)
+            stack.extend(value.__getstate__().values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return found
+
+
+def count_calls(func: Callable[[], None]) -> int:
+    """Return the number of Python function calls made by `func`."""
+    calls = 0
+
+    def profile(frame: Any, event: str, arg: Any) -> None:  # noqa: ANN401, ARG001
+        nonlocal calls
+        if event == "call":
+            calls += 1
+
+    sys.setprofile(profile)
+    try:
+        func()
+    finally:
+        sys.setprofile(None)
+    return calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--number", type=int, default=20, help="serializations per measurement")
+    args = parser.parse_args()
+
+    card = AdaptiveCard(body=[build_section(i, args.depth) for i in range(args.sections)])
+    tree = entities(card)
+    print(f"Card: {len(tree)} entities, nesting depth {args.depth + 3}")
+
+    def clear() -> None:
+        for entity in tree:
+            entity._payload = None
+
+    overhead = min(timeit.repeat(clear, number=args.number, repeat=15))
+    methods = [
+        ("serialize()", card.serialize),
+        ("explicit stack", lambda: base._serialize_tree(card)),
+    ]
+    for label, method in methods:
+
+        def run(method: Callable[[], Any] = method) -> None:
+            clear()
+            method()
+
+        seconds = min(timeit.repeat(run, number=args.number, repeat=15)) - overhead
+        clear()
+        calls = count_calls(method)
+        print(f"{label:>14}: {seconds / args.number * 1e3:8.3f} ms, {calls} Python function calls")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Measure the throughput of a ``Spool`` under sustained load, with each fsync policy.
+
+Appends ``--messages`` messages of ``--size`` bytes to a fresh spool in a temporary
+directory, then replays them all, and reports the rate of each. The number of segment
+files left once the spool is drained shows that replayed segments are retired.
+
+    python benchmarks/bench_spool.py --messages 20000 --size 2048
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from msteams_webhooks import Spool
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--size", type=int, default=2048, help="bytes per message")
+    args = parser.parse_args()
+
+    content = b"x" * args.size
+    print(f"{args.messages} messages of {args.size} bytes")
+    for policy in ("never", "interval", "always"):
+        # Syncing every message is orders of magnitude slower, so measure fewer.
+        count = args.messages if policy != "always" else max(1, args.messages // 100)
+        with tempfile.TemporaryDirectory() as directory, Spool(directory, fsync=policy) as spool:
+            start = time.perf_counter()
+            for _ in range(count):
+                spool.append(content)
+            appended = time.perf_counter() - start
+            start = time.perf_counter()
+            while spool.peek() is not None:
+                spool.ack()
+            replayed = time.perf_counter() - start
+            segments = len(list(Path(directory).glob("*.seg")))
+        print(
+            f"{policy:>9}: {count / appended:9.0f} appends/s, {count / replayed:9.0f} replays/s,"
+            f" {segments} segment(s) left",
+        )
+
+
+if __name__ == "__main__":
+    main()
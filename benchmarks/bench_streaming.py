@@ -0,0 +1,70 @@
+"""Compare encoding a large ``Table`` card with ``to_json()`` and with a ``MessageWriter``.
+
+Encodes a fresh card holding a table of ``--rows`` rows and ``--columns`` columns as a
+complete webhook message both ways, and reports the time taken and the peak memory
+allocated while encoding, on top of the card itself.
+
+    python benchmarks/bench_streaming.py --rows 500 --columns 6
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Callable
+
+from bench_encoding import build_card
+
+from msteams_webhooks import AdaptiveCard, MessageWriter, encoders
+
+
+def encode_to_json(card: AdaptiveCard) -> int:
+    return len(encoders.encode_message(card.to_json(encoders.json_encoder)))
+
+
+def measure(
+    encode: Callable[[AdaptiveCard], int],
+    rows: int,
+    columns: int,
+    number: int,
+) -> tuple[float, int, int]:
+    """Return the best time in seconds, peak allocation in bytes and size of a message."""
+    best = float("inf")
+    for _ in range(number):
+        card = build_card(rows, columns)
+        start = time.perf_counter()
+        size = encode(card)
+        best = min(best, time.perf_counter() - start)
+    card = build_card(rows, columns)
+    tracemalloc.start()
+    encode(card)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--columns", type=int, default=6)
+    parser.add_argument("--number", type=int, default=5, help="encodes per measurement")
+    args = parser.parse_args()
+
+    writer = MessageWriter(encoder=encoders.json_encoder)
+
+    def encode_streaming(card: AdaptiveCard) -> int:
+        with writer.message(card) as content:
+            return len(content)
+
+    # Warm the writer's buffer pool, as a long-running webhook would.
+    encode_streaming(build_card(args.rows, args.columns))
+
+    print(f"Table card: {args.rows} rows x {args.columns} columns")
+    for label, encode in [("to_json", encode_to_json), ("MessageWriter", encode_streaming)]:
+        seconds, peak, size = measure(encode, args.rows, args.columns, args.number)
+        print(
+            f"{label:>14}: {seconds * 1e3:8.2f} ms/encode, {peak / 1024:8.1f} KiB peak,"
+            f" {size / 1024:7.1f} KiB message",
+        )
+
+
+if __name__ == "__main__":
+    main()
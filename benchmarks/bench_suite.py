@@ -0,0 +1,218 @@
+"""Run the standard benchmarks and record the results, to catch performance regressions.
+
+Times ``serialize()`` on representative cards, with every entity's cache cleared
+beforehand: a message of one ``TextBlock``, a ``FactSet`` of 20 facts, a ``Table`` of 200
+rows and a ``ColumnSet`` nested 25 deep. Then times ``send_card`` end to end, from
+serializing the card to checking the response, through ``TeamsWebhook`` and
+``AsyncTeamsWebhook`` against an in-process ``MockTeamsServer``, so that no network or
+server latency is included. Each benchmark is repeated ``--repeat`` times, and the best
+run is reported.
+
+``--json`` writes the results to a file, and ``--compare`` checks them against a file
+written by an earlier run, exiting with status 1 if any benchmark is slower by more than
+``--threshold``. Compare results from the same machine and Python version only.
+
+    python benchmarks/bench_suite.py --json results.json
+    python benchmarks/bench_suite.py --compare results.json --threshold 0.2
+    nox -s benchmarks -- --compare results.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import timeit
+from typing import Any, Callable
+
+from bench_encoding import build_card
+from bench_serialize import entities
+
+from msteams_webhooks import (
+    AdaptiveCard,
+    AsyncTeamsWebhook,
+    Column,
+    ColumnSet,
+    Fact,
+    FactSet,
+    MockTeamsServer,
+    TeamsWebhook,
+    TextBlock,
+    encoders,
+)
+from msteams_webhooks.__version__ import __version__
+from msteams_webhooks.cards import Card
+
+URL = "https://example.webhook.office.com/webhookb2/benchmark"
+
+
+def message_card() -> AdaptiveCard:
+    return AdaptiveCard(body=[TextBlock("Deployment of api-server finished.", wrap=True)])
+
+
+def facts_card() -> AdaptiveCard:
+    facts = [Fact(f"Key {f}", f"Value of fact number {f}") for f in range(20)]
+    return AdaptiveCard(body=[TextBlock("Build report", weight="bolder"), FactSet(facts=facts)])
+
+
+def table_card() -> AdaptiveCard:
+    return build_card(199, 4)
+
+
+def nested_card(depth: int = 25) -> AdaptiveCard:
+    item: Any = TextBlock("Innermost", wrap=True)
+    for level in range(depth):
+        item = ColumnSet(
+            columns=[
+                Column(items=[TextBlock(f"Level {level}", weight="bolder")], width="auto"),
+                Column(items=[item], width="stretch"),
+            ],
+        )
+    return AdaptiveCard(body=[item])
+
+
+def clearer(cards: list[Card]) -> Callable[[], None]:
+    """Return a function that clears the cache of every entity in `cards`."""
+    tree = [entity for card in cards for entity in entities(card)]
+
+    def clear() -> None:
+        for entity in tree:
+            entity._payload = None
+            entity._json = None
+
+    return clear
+
+
+def measure(func: Callable[[], Any], clear: Callable[[], None], repeat: int, ops: int = 1) -> float:
+    """Return the best time per operation in seconds, with caches cleared before each call.
+
+    Each call of `func` performs `ops` operations. The time taken to clear the caches is
+    measured separately and subtracted.
+    """
+
+    def run() -> None:
+        clear()
+        func()
+
+    number, _ = timeit.Timer(run).autorange()
+    overhead = min(timeit.repeat(clear, number=number, repeat=repeat))
+    seconds = min(timeit.repeat(run, number=number, repeat=repeat)) - overhead
+    return max(seconds, 0.0) / number / ops
+
+
+def run_benchmarks(repeat: int) -> dict[str, float]:
+    """Run every benchmark, printing each result as it is measured.
+
+    Returns:
+        The best time per operation in seconds, by benchmark name.
+    """
+    results: dict[str, float] = {}
+
+    def record(name: str, seconds: float) -> None:
+        results[name] = seconds
+        print(f"{name:>24}: {seconds * 1e6:10.2f} us/op, {1 / seconds:12,.0f} ops/s")
+
+    cards = {
+        "serialize_message": message_card(),
+        "serialize_facts": facts_card(),
+        "serialize_table": table_card(),
+        "serialize_nested": nested_card(),
+    }
+    for name, card in cards.items():
+        record(name, measure(card.serialize, clearer([card]), repeat))
+
+    card = facts_card()
+    server = MockTeamsServer(keep_messages=False)
+    channel = TeamsWebhook(URL, transport=server.transport())
+    record("send_card_sync", measure(lambda: channel.send_card(card), clearer([card]), repeat))
+    channel.close()
+
+    loop = asyncio.new_event_loop()
+    try:
+        achannel = AsyncTeamsWebhook(URL, transport=server.async_transport())
+        seconds = measure(
+            lambda: loop.run_until_complete(achannel.send_card(card)),
+            clearer([card]),
+            repeat,
+        )
+        record("send_card_async", seconds)
+        batch = [facts_card() for _ in range(100)]
+        seconds = measure(
+            lambda: loop.run_until_complete(achannel.send_many(batch, concurrency=16)),
+            clearer(batch),
+            repeat,
+            ops=len(batch),
+        )
+        record("send_many_async", seconds)
+        loop.run_until_complete(achannel.close())
+    finally:
+        loop.close()
+    if server.requests != server.accepted:
+        raise SystemExit(f"The mock server rejected {server.requests - server.accepted} requests")
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, Any], threshold: float) -> bool:
+    """Print the change of each benchmark from `baseline`.
+
+    Returns:
+        Whether any benchmark is slower than its baseline by more than `threshold`.
+    """
+    regressed = False
+    print(f"\nCompared with {baseline['python']} on {baseline['platform']}:")
+    for name, seconds in results.items():
+        if name not in baseline["results"]:
+            continue
+        change = seconds / baseline["results"][name]["seconds_per_op"] - 1
+        slower = change > threshold
+        regressed = regressed or slower
+        print(f"{name:>24}: {change:+8.1%}{'  REGRESSION' if slower else ''}")
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="measurements per benchmark")
+    parser.add_argument("--json", metavar="PATH", help="write the results to a JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="compare with results from --json")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="slowdown reported as a regression by --compare, as a fraction",
+    )
+    args = parser.parse_args()
+
+    # Read the baseline first, in case it is the file about to be overwritten.
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+    python = f"{platform.python_implementation()} {platform.python_version()}"
+    encoder = encoders.default_encoder().__name__
+    print(f"msteams_webhooks {__version__}, {python}, encoder {encoder}")
+    started = time.perf_counter()
+    results = run_benchmarks(args.repeat)
+    print(f"Finished in {time.perf_counter() - started:.1f} s")
+
+    if args.json:
+        document = {
+            "version": __version__,
+            "python": python,
+            "platform": platform.platform(),
+            "encoder": encoder,
+            "results": {
+                name: {"seconds_per_op": seconds, "ops_per_second": 1 / seconds}
+                for name, seconds in results.items()
+            },
+        }
+        with open(args.json, "w") as file:
+            json.dump(document, file, indent=2)
+            file.write("\n")
+    if baseline is not None and compare(results, baseline, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Compare building and serializing a large ``Table`` with a ``ColumnarTable``.
+
+Builds a table of ``--rows`` rows and ``--columns`` columns both ways, and reports the
+time to build and serialize it, and the memory allocated by the card objects.
+
+    python benchmarks/bench_table.py --rows 500 --columns 6
+"""
+import argparse
+import timeit
+import tracemalloc
+from typing import Callable
+
+from msteams_webhooks import (
+    AdaptiveCard,
+    Column,
+    ColumnarTable,
+    Table,
+    TableCell,
+    TableRow,
+    TextBlock,
+)
+
+
+def build_table(data: list[tuple[str, ...]], headers: list[str]) -> AdaptiveCard:
+    rows = [
+        TableRow(cells=[TableCell(items=[TextBlock(text)]) for text in row])
+        for row in [headers, *data]
+    ]
+    columns = [Column() for _ in headers]
+    return AdaptiveCard(body=[Table(columns=columns, rows=rows, first_row_as_headers=True)])
+
+
+def build_columnar(data: list[tuple[str, ...]], headers: list[str]) -> AdaptiveCard:
+    return AdaptiveCard(body=[ColumnarTable(data, headers=headers)])
+
+
+def allocated(build: Callable[[], AdaptiveCard]) -> int:
+    """Return the number of bytes still allocated by the card ``build`` returns."""
+    tracemalloc.start()
+    card = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del card
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--columns", type=int, default=6)
+    parser.add_argument("--number", type=int, default=10, help="builds per measurement")
+    args = parser.parse_args()
+
+    headers = [f"Column {c}" for c in range(args.columns)]
+    data = [tuple(f"Row {r} value {c}" for c in range(args.columns)) for r in range(args.rows)]
+    print(f"Table: {args.rows} rows x {args.columns} columns")
+
+    for label, build in [("Table", build_table), ("ColumnarTable", build_columnar)]:
+        assert build(data, headers).serialize() == build_table(data, headers).serialize()
+        seconds = min(
+            timeit.repeat(lambda build=build: build(data, headers).serialize(), number=args.number)
+        )
+        size = allocated(lambda build=build: build(data, headers))
+        print(
+            f"{label:>14}: {seconds / args.number * 1e3:8.2f} ms build + serialize,"
+            f" {size / 1024:8.0f} KiB allocated",
+        )
+
+
+if __name__ == "__main__":
+    main()
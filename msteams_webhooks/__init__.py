@@ -1,16 +1,25 @@
 """msteams_webhooks."""
+import asyncio
 import ssl
-from typing import Any, Optional, Union
+import threading
+import time
+from collections.abc import AsyncIterable, Hashable, Iterable, Sequence
+from concurrent.futures import Future
+from typing import Any, Callable, Optional, Union, cast
 
 import httpx
 
 from msteams_webhooks import types
 from msteams_webhooks.actions import Action, OpenURLAction
+from msteams_webhooks.broadcast import Broadcaster
 from msteams_webhooks.buttons import OpenURLButton
 from msteams_webhooks.cards import AdaptiveCard, Card, HeroCard, ReceiptCard
+from msteams_webhooks.circuit import CircuitBreaker
+from msteams_webhooks.coalesce import AsyncMessageCoalescer, MessageCoalescer
 from msteams_webhooks.containers import (
     ActionSet,
     Column,
+    ColumnarTable,
     ColumnSet,
     Container,
     Fact,
@@ -22,8 +31,31 @@ from msteams_webhooks.containers import (
     TableCell,
     TableRow,
 )
+from msteams_webhooks.dedup import Deduplicator
+from msteams_webhooks.dispatch import DispatchQueue, SendResult
 from msteams_webhooks.elements import Image, Media, MediaSource, TextBlock
-from msteams_webhooks.exceptions import TeamsRateLimitError, TeamsWebhookError
+from msteams_webhooks.encoders import Encoder, default_encoder
+from msteams_webhooks.exceptions import (
+    TeamsCircuitOpenError,
+    TeamsRateLimitError,
+    TeamsResponseError,
+    TeamsWebhookError,
+)
+from msteams_webhooks.handlers import TeamsLogHandler
+from msteams_webhooks.metrics import MetricsCollector, Observer
+from msteams_webhooks.pool import (
+    DEFAULT_LIMITS,
+    DEFAULT_TIMEOUT,
+    AsyncConnectionPool,
+    ConnectionPool,
+)
+from msteams_webhooks.ratelimit import RateLimiter
+from msteams_webhooks.retry import DEFAULT_RETRY_ON, RetryPolicy
+from msteams_webhooks.sizing import MAX_PAYLOAD_SIZE, check_size, encode_card
+from msteams_webhooks.spool import Spool
+from msteams_webhooks.streaming import MessageWriter
+from msteams_webhooks.templates import CardTemplate, Placeholder
+from msteams_webhooks.testing import MockTeamsServer
 
 
 class TeamsWebhook:
@@ -37,7 +69,22 @@ class TeamsWebhook:
         url: str,
         *,
         verify: Union[str, bool, ssl.SSLContext] = True,
-        timeout: float = 15.0,
+        timeout: float = DEFAULT_TIMEOUT,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        queue: Optional[DispatchQueue] = None,
+        pool: Optional[ConnectionPool] = None,
+        http2: bool = False,
+        limits: Optional[httpx.Limits] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+        encoder: Optional[Encoder] = None,
+        max_payload_size: Optional[int] = MAX_PAYLOAD_SIZE,
+        split_oversized: bool = False,
+        writer: Optional[MessageWriter] = None,
+        dedup: Optional[Deduplicator] = None,
+        spool: Optional[Spool] = None,
+        circuit: Optional[CircuitBreaker] = None,
+        observer: Optional[Observer] = None,
     ) -> None:
         """Construct webhook object.
 
@@ -46,55 +93,378 @@ class TeamsWebhook:
             verify: How to handle HTTPS certificate verification.
             timeout: Global timeout in seconds for all HTTP operations.
                 May be further tuned with an ``httpx.Timeout`` object.
+            rate_limiter: Optional ``RateLimiter`` used to pace requests to `url`. Sends
+                wait until the limiter allows them, rather than failing.
+            retry: Optional ``RetryPolicy`` used to retry sends that fail with rate
+                limiting or transient network errors.
+            queue: Optional ``DispatchQueue``. When provided, ``send_card`` and
+                ``send_message`` queue the serialized card and return immediately, and
+                the queue's worker threads post it in the background.
+            pool: Optional ``ConnectionPool`` to borrow an HTTP client from, so that
+                connections are shared with other webhooks. The client's settings are
+                then the pool's, so `verify`, `timeout`, `http2`, `limits` and
+                `transport` must not be given.
+            http2: If true, negotiate HTTP/2 where supported, so that concurrent sends
+                share a single multiplexed connection. Requires the ``http2`` extra:
+                ``pip install msteams_webhooks[http2]``. Default: ``False``
+            limits: Optional ``httpx.Limits`` controlling the maximum number of
+                connections, idle keep-alive connections, and keep-alive expiry.
+            transport: Optional ``httpx`` transport to send requests through instead of
+                the network. Useful for testing.
+            encoder: Optional function used to encode payloads as JSON bytes. Defaults
+                to the fastest encoder installed; see ``msteams_webhooks.encoders``.
+            max_payload_size: Maximum size in bytes of an encoded message. Larger
+                messages are rejected before they are sent, or split if
+                `split_oversized` is true. ``None`` disables the check, and posts
+                messages of any size, as earlier releases did.
+                Default: ``MAX_PAYLOAD_SIZE`` (28 KB)
+            split_oversized: If true, split an ``AdaptiveCard`` that is larger than
+                `max_payload_size` into continuation cards that are sent in order; see
+                ``msteams_webhooks.sizing.split_card``. Default: ``False``
+            writer: Optional ``MessageWriter`` used to encode cards into a reusable
+                buffer, which is posted without copying it. Cards sent through a
+                `queue` are encoded with `encoder` instead, since they are posted after
+                ``send_card`` returns.
+            dedup: Optional ``Deduplicator`` used to suppress messages that repeat one
+                sent recently.
+            spool: Optional ``Spool`` that messages failing with a transient error
+                (those retried by `retry`, or by default) are written to, to be replayed
+                in order by a background thread once Teams is reachable again. Messages
+                left in the spool by a previous process are replayed straight away.
+            circuit: Optional ``CircuitBreaker``. While it is open, sends fail fast with
+                ``TeamsCircuitOpenError``, or are spooled if a `spool` is configured,
+                instead of waiting for requests that are likely to fail.
+            observer: Optional ``Observer``, such as a ``MetricsCollector``, told how long
+                each card takes to serialize and encode, and the size, latency and
+                outcome of each request.
 
         Returns:
             None.
 
         Raises:
-            None.
+            ValueError: if `pool` is given with `verify`, `timeout`, `http2`, `limits` or
+                `transport`.
         """
         self.url = url
-        self.client = httpx.Client(verify=verify, timeout=timeout)
+        if pool is not None:
+            if (
+                verify is not True
+                or timeout != DEFAULT_TIMEOUT
+                or http2
+                or limits is not None
+                or transport is not None
+            ):
+                msg = (
+                    "`verify`, `timeout`, `http2`, `limits` and `transport` cannot be used "
+                    "with `pool`; configure the pool instead."
+                )
+                raise ValueError(msg)
+            self.client = pool.client_for(url)
+        else:
+            self.client = httpx.Client(
+                verify=verify,
+                timeout=timeout,
+                http2=http2,
+                limits=limits or DEFAULT_LIMITS,
+                transport=transport,
+            )
+        self._owns_client = pool is None
+        self.encoder = encoder or default_encoder()
+        self.max_payload_size = max_payload_size
+        self.split_oversized = split_oversized
+        self.writer = writer
+        self.dedup = dedup
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.queue = queue
         self.response = None
+        self.spool = spool
+        self.circuit = circuit
+        self.observer = observer
+        self._replayer: Optional[threading.Thread] = None
+        self._replay_lock = threading.Lock()
+        self._stopping = threading.Event()
+        if spool is not None and len(spool):
+            self.start_replay()
 
-    def _send_json(self, json: dict[Any, Any]) -> None:
-        """Posts a raw JSON payload to the webhook URL.
+    def _send_json(self, json: Union[dict[Any, Any], bytes, memoryview]) -> httpx.Response:
+        """Posts a raw JSON payload to the webhook URL, retrying if so configured.
 
         Args:
-            json: Data dict that will be converted to JSON before posting to webhook.
+            json: Data dict that will be converted to JSON with ``encoder`` before
+                posting to webhook, or already-encoded JSON bytes or a view of them.
 
         Returns:
-            None.
+            The response to the successful request.
+
+        Raises:
+            TeamsWebhookError: if the response was anything other than 200/OK.
+            TeamsRateLimitError: if "429" was found inside the response body.
+            TeamsCircuitOpenError: if the circuit breaker is open.
+        """
+        content = self.encoder(json) if isinstance(json, dict) else json
+        circuit = self.circuit
+        attempts = 0
+
+        def attempt() -> httpx.Response:
+            nonlocal attempts
+            attempts += 1
+            if attempts > 1 and self.observer is not None:
+                self.observer.on_retry(attempts)
+            if circuit is not None:
+                return circuit.call(lambda: self._post(content))
+            return self._post(content)
+
+        if self.retry:
+            return self.retry.call(attempt)
+        return attempt()
+
+    def _post(self, content: Union[bytes, memoryview]) -> httpx.Response:
+        """Makes a single attempt to post an encoded JSON payload to the webhook URL.
+
+        Args:
+            content: Encoded JSON to post, or a view of it.
+
+        Returns:
+            The response to the request.
 
         Raises:
             TeamsWebhookError: if the response was anything other than 200/OK.
             TeamsRateLimitError: if "429" was found inside the response body.
         """
         headers = {"Content-Type": "application/json"}
-        self.response = self.client.post(url=self.url, json=json, headers=headers)
-        if self.response.status_code != httpx.codes.OK:
-            raise TeamsWebhookError(self.response.text)
-        if "400" in self.response.text:
-            # Malformed requests return HTTP code 200 with 400 in response body.
-            msg = "Bad request. Check that the message payload syntax is correct."
-            raise TeamsWebhookError(msg)
-        if "429" in self.response.text:
-            # Rate limit errors receive HTTP code 200 with 429 in response body.
-            raise TeamsRateLimitError()
-
-    def send_card(self, card: Optional[Card] = None, data: Optional[dict[Any, Any]] = None) -> None:
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        started = time.perf_counter()
+        outcome: types.RequestOutcomes = "error"
+        try:
+            if isinstance(content, memoryview):
+                response = self.client.send(self._build_request(content, headers))
+            else:
+                response = self.client.post(url=self.url, content=content, headers=headers)
+            self.response = response
+            if response.status_code != httpx.codes.OK:
+                raise TeamsResponseError(response.status_code, response.text)
+            if "400" in response.text:
+                # Malformed requests return HTTP code 200 with 400 in response body.
+                msg = "Bad request. Check that the message payload syntax is correct."
+                raise TeamsWebhookError(msg)
+            if "429" in response.text:
+                # Rate limit errors receive HTTP code 200 with 429 in response body.
+                outcome = "rate_limited"
+                raise TeamsRateLimitError()
+            outcome = "ok"
+            return response
+        finally:
+            if self.observer is not None:
+                self.observer.on_request(time.perf_counter() - started, len(content), outcome)
+
+    def _build_request(self, content: memoryview, headers: dict[str, str]) -> httpx.Request:
+        """Builds a request that posts a view of an encoded JSON payload without copying it.
+
+        ``httpx`` would treat a ``memoryview`` passed as `content` as an iterable of
+        chunks, so the request is given a stream over the view instead.
+
+        Args:
+            content: View of the encoded JSON to post.
+            headers: Request headers.
+
+        Returns:
+            The request.
+        """
+        headers = {**headers, "Content-Length": str(content.nbytes)}
+        request = self.client.build_request("POST", self.url, headers=headers)
+        return httpx.Request(
+            "POST",
+            request.url,
+            headers=request.headers,
+            # ByteStream only hands the view to the transport, which writes it as is.
+            stream=httpx.ByteStream(cast(bytes, content)),
+            extensions=request.extensions,
+        )
+
+    def _send_queued(
+        self,
+        contents: Sequence[Union[bytes, memoryview]],
+        key: Optional[Hashable] = None,
+    ) -> Optional[httpx.Response]:
+        """Posts messages taken from the `queue`, reporting the depth left to the observer."""
+        if self.observer is not None and self.queue is not None:
+            self.observer.on_queue(len(self.queue))
+        return self._send_messages(contents, key)
+
+    def _send_messages(
+        self,
+        contents: Sequence[Union[bytes, memoryview]],
+        key: Optional[Hashable] = None,
+    ) -> Optional[httpx.Response]:
+        """Posts several encoded messages in order, stopping at the first failure.
+
+        With a `spool`, messages are spooled instead if earlier messages are still
+        waiting to be replayed, and from the first that fails with a transient error.
+
+        Args:
+            contents: Encoded messages to post, e.g. the pages of a split card.
+            key: The messages' key in `dedup`, which is forgotten if sending fails so
+                that they are not suppressed when sent again.
+
+        Returns:
+            The response to the last message, or None if the messages were spooled.
+
+        Raises:
+            TeamsWebhookError: if the response was anything other than 200/OK.
+            TeamsRateLimitError: if "429" was found inside the response body.
+        """
+        if self.spool is not None and len(self.spool):
+            return self._spool_messages(self.spool, contents)
+        sent = 0
+        response = None
+        try:
+            for content in contents:
+                response = self._send_json(content)
+                sent += 1
+        except Exception as exc:
+            if self.spool is not None and isinstance(exc, self._spooled_errors):
+                return self._spool_messages(self.spool, contents[sent:])
+            if self.dedup is not None and key is not None:
+                self.dedup.discard(key)
+            raise
+        return response
+
+    @property
+    def _spooled_errors(self) -> tuple[type[BaseException], ...]:
+        """Errors that cause a message to be spooled, rather than raised."""
+        return (*(self.retry.retry_on if self.retry else DEFAULT_RETRY_ON), TeamsCircuitOpenError)
+
+    def _spool_messages(self, spool: Spool, contents: Sequence[Union[bytes, memoryview]]) -> None:
+        """Writes messages to the spool, and makes sure they will be replayed."""
+        for content in contents:
+            spool.append(content)
+        self.start_replay()
+
+    def start_replay(self) -> None:
+        """Start replaying spooled messages in a background thread, if not already running.
+
+        Called automatically when messages are spooled, and when the webhook is created
+        with a spool that still holds messages.
+
+        Returns:
+            None.
+        """
+        with self._replay_lock:
+            if self.spool is None or self._replayer is not None or self._stopping.is_set():
+                return
+            self._replayer = threading.Thread(
+                target=self._replay,
+                args=(self.spool,),
+                name="msteams-webhooks-spool",
+            )
+            self._replayer.daemon = True
+            self._replayer.start()
+
+    def _replay(self, spool: Spool) -> None:
+        """Replay thread main loop: sends spooled messages in order until none are left.
+
+        A message that fails with a transient error is retried with backoff until it is
+        sent. One that fails with any other error can never be sent, so it is discarded.
+        """
+        backoff = self.retry or RetryPolicy()
+        attempt = 0
+        while not self._stopping.is_set():
+            with self._replay_lock:
+                content = spool.peek()
+                if content is None:
+                    self._replayer = None
+                    return
+            try:
+                self._send_json(content)
+            except self._spooled_errors:
+                attempt += 1
+                self._stopping.wait(backoff.backoff(attempt))
+            except Exception:
+                spool.discard()
+            else:
+                attempt = 0
+                spool.ack()
+        with self._replay_lock:
+            self._replayer = None
+
+    def _dispatch(
+        self,
+        contents: Sequence[Union[bytes, memoryview]],
+        card: Optional[Card] = None,
+        priority: types.Priorities = "normal",
+    ) -> Optional["Future[httpx.Response]"]:
+        """Checks encoded messages for size and repeats, then sends or queues them.
+
+        Args:
+            contents: Encoded messages to send in order.
+            card: The card the messages encode, if any, for `dedup` to identify it by.
+            priority: Priority to queue the messages with.
+
+        Returns:
+            If a ``DispatchQueue`` is configured, a future that resolves to the response
+            to the last message once all have been sent. Otherwise, or if the messages
+            were suppressed as a duplicate, None.
+
+        Raises:
+            TeamsPayloadTooLargeError: if a message is larger than `max_payload_size`.
+        """
+        for content in contents:
+            check_size(content, self.max_payload_size)
+        key = None
+        if self.dedup is not None:
+            key = self.dedup.key_for(contents, card)
+            if self.dedup.check(key):
+                return None
+        if self.queue is not None:
+            try:
+                future = self.queue.submit(self._send_queued, contents, key, priority=priority)
+            except BaseException:
+                self._forget(key)
+                raise
+            if key is not None:
+                # A job dropped or cancelled by the queue was never sent.
+                future.add_done_callback(
+                    lambda f: self._forget(key) if f.cancelled() or f.exception() else None,
+                )
+            if self.observer is not None:
+                self.observer.on_queue(len(self.queue))
+            return future
+        self._send_messages(contents, key)
+        return None
+
+    def _forget(self, key: Optional[Hashable]) -> None:
+        """Forget a message that was not sent, so that `dedup` doesn't suppress it again."""
+        if self.dedup is not None and key is not None:
+            self.dedup.discard(key)
+
+    def send_card(
+        self,
+        card: Optional[Card] = None,
+        data: Optional[dict[Any, Any]] = None,
+        *,
+        priority: types.Priorities = "normal",
+    ) -> Optional["Future[httpx.Response]"]:
         """Sends a card to the channel.
 
         Args:
             card: The ``Card`` to send. Only one card may be sent at a time.
             data: Raw card data structure to send. Must conform to a card schema
                 spec. Useful for debugging or testing.
+            priority: ``"high"``, ``"normal"`` or ``"low"``. With a ``DispatchQueue``,
+                higher priority cards are sent first, and lower priority ones are
+                dropped first when the queue is full. Ignored without a queue.
+                Default: ``"normal"``
 
         Returns:
-            None.
+            If a ``DispatchQueue`` is configured, a future that resolves to the response
+            once the card has been sent. Otherwise, or if `dedup` suppressed the card as
+            a duplicate, None.
 
         Raises:
-            None.
+            TeamsPayloadTooLargeError: if the encoded card is larger than
+                `max_payload_size` and cannot be split.
         """
         # Since the attachments value is a list, you might think you can send more
         # than one card to the channel at once, but this isn't true. If you send
@@ -103,10 +473,73 @@ class TeamsWebhook:
         if not card and not data:
             raise ValueError("Must provide either `card` or `data` values.")  # noqa TRY003
         if card:
-            json = {"type": "message", "attachments": [card.serialize()]}
-        else:
-            json = {"type": "message", "attachments": [data]}
-        self._send_json(json=json)
+            return self._send_card(card, priority)
+        message = self.encoder({"type": "message", "attachments": [data]})
+        return self._dispatch([message], priority=priority)
+
+    def _send_card(
+        self,
+        card: Card,
+        priority: types.Priorities = "normal",
+    ) -> Optional["Future[httpx.Response]"]:
+        """Encodes a card, then sends or queues it.
+
+        With a `writer` and no `queue`, the card is encoded into one of the writer's
+        buffers and posted from there. It is encoded again with ``encode_card`` only if
+        it is larger than `max_payload_size`, to be split or rejected.
+
+        Args:
+            card: The card to send.
+            priority: Priority to queue the card with.
+
+        Returns:
+            If a ``DispatchQueue`` is configured, a future that resolves to the response
+            once the card has been sent. Otherwise, or if `dedup` suppressed the card as
+            a duplicate, None.
+
+        Raises:
+            TeamsPayloadTooLargeError: if the encoded card is larger than
+                `max_payload_size` and cannot be split.
+        """
+        if self.writer is not None and self.queue is None:
+            started = time.perf_counter()
+            with self.writer.message(card) as content:
+                if self.max_payload_size is None or len(content) <= self.max_payload_size:
+                    if self.observer is not None:
+                        self.observer.on_encode(time.perf_counter() - started)
+                    return self._dispatch([content], card)
+        return self._dispatch(self._encode_card(card), card, priority)
+
+    def _encode_card(self, card: Card) -> list[bytes]:
+        """Encodes a card with ``encode_card``, timing each step for the `observer`.
+
+        Args:
+            card: The card to encode.
+
+        Returns:
+            The encoded messages, to be sent in order.
+
+        Raises:
+            TeamsPayloadTooLargeError: if the encoded card is larger than
+                `max_payload_size` and cannot be split.
+        """
+        started = time.perf_counter()
+        if self.observer is not None:
+            # Serialize first, so that encode_card reuses the cached data structure
+            # and the two steps can be timed separately.
+            card.serialize()
+            serialized = time.perf_counter()
+            self.observer.on_serialize(serialized - started)
+            started = serialized
+        contents = encode_card(
+            card,
+            encoder=self.encoder,
+            max_size=self.max_payload_size,
+            split=self.split_oversized,
+        )
+        if self.observer is not None:
+            self.observer.on_encode(time.perf_counter() - started)
+        return contents
 
     def send_message(
         self,
@@ -122,7 +555,8 @@ class TeamsWebhook:
         style: Optional[types.TextBlockStyles] = None,
         wrap: bool = True,
         version: Optional[str] = None,
-    ) -> None:
+        priority: types.Priorities = "normal",
+    ) -> Optional["Future[httpx.Response]"]:
         """Sends a basic text message to the channel.
 
         Convenience method that builds an ``AdaptiveCard`` and adds a single ``TextBlock``
@@ -144,9 +578,15 @@ class TeamsWebhook:
             wrap: If true, allow `text` to wrap. Otherwise, text is clipped. Default: False
             style: The style of this TextBlock for accessibility purposes.
             version: Schema version to advertise.
+            priority: ``"high"``, ``"normal"`` or ``"low"``. With a ``DispatchQueue``,
+                higher priority messages are sent first, and lower priority ones are
+                dropped first when the queue is full. Ignored without a queue.
+                Default: ``"normal"``
 
         Returns:
-            None.
+            If a ``DispatchQueue`` is configured, a future that resolves to the response
+            once the message has been sent. Otherwise, or if `dedup` suppressed the message as
+            a duplicate, None.
 
         Raises:
             None.
@@ -163,7 +603,134 @@ class TeamsWebhook:
             wrap=wrap,
             style=style,
         )
-        self.send_card(card=AdaptiveCard(body=[text_block], version=version))
+        return self.send_card(
+            card=AdaptiveCard(body=[text_block], version=version),
+            priority=priority,
+        )
+
+    def send_template(
+        self,
+        template: CardTemplate,
+        /,
+        **values: Any,  # noqa: ANN401
+    ) -> Optional["Future[httpx.Response]"]:
+        """Renders a card template and sends the result to the channel.
+
+        Args:
+            template: The ``CardTemplate`` to render.
+            **values: Value for each of the template's placeholders, by name.
+
+        Returns:
+            If a ``DispatchQueue`` is configured, a future that resolves to the response
+            once the card has been sent. Otherwise, or if `dedup` suppressed the card as
+            a duplicate, None.
+
+        Raises:
+            KeyError: if no value was given for a placeholder.
+        """
+        return self.send_raw_bytes(template.render(**values))
+
+    def send_raw_bytes(
+        self,
+        content: bytes,
+        *,
+        priority: types.Priorities = "normal",
+    ) -> Optional["Future[httpx.Response]"]:
+        """Sends an already-encoded webhook message to the channel.
+
+        Useful for payloads that were encoded ahead of time, e.g. rendered from a
+        ``CardTemplate`` or cached from a previous send, since they skip encoding.
+
+        Args:
+            content: The complete message, as UTF-8 encoded JSON. Must conform to the
+                webhook message schema: ``{"type": "message", "attachments": [...]}``.
+            priority: ``"high"``, ``"normal"`` or ``"low"``. With a ``DispatchQueue``,
+                higher priority messages are sent first, and lower priority ones are
+                dropped first when the queue is full. Ignored without a queue.
+                Default: ``"normal"``
+
+        Returns:
+            If a ``DispatchQueue`` is configured, a future that resolves to the response
+            once the message has been sent. Otherwise, or if `dedup` suppressed the message as
+            a duplicate, None.
+
+        Raises:
+            TeamsPayloadTooLargeError: if `content` is larger than `max_payload_size`.
+            TeamsWebhookError: if the response was anything other than 200/OK.
+            TeamsRateLimitError: if "429" was found inside the response body.
+        """
+        return self._dispatch([content], priority=priority)
+
+    def send_encoded(
+        self,
+        contents: Sequence[bytes],
+        card: Optional[Card] = None,
+        *,
+        priority: types.Priorities = "normal",
+    ) -> Optional["Future[httpx.Response]"]:
+        """Sends several already-encoded webhook messages to the channel, in order.
+
+        Useful to post messages encoded once for several channels, e.g. the pages of a
+        card split by ``msteams_webhooks.sizing.encode_card``. Sending stops at the first
+        failure.
+
+        Args:
+            contents: The complete messages, as UTF-8 encoded JSON.
+            card: The card the messages encode, if any, for `dedup` to identify it by.
+            priority: ``"high"``, ``"normal"`` or ``"low"``. With a ``DispatchQueue``,
+                higher priority messages are sent first, and lower priority ones are
+                dropped first when the queue is full. Ignored without a queue.
+                Default: ``"normal"``
+
+        Returns:
+            If a ``DispatchQueue`` is configured, a future that resolves to the response
+            to the last message once all have been sent. Otherwise, or if `dedup`
+            suppressed the messages as a duplicate, None.
+
+        Raises:
+            TeamsPayloadTooLargeError: if a message is larger than `max_payload_size`.
+            TeamsWebhookError: if the response was anything other than 200/OK.
+            TeamsRateLimitError: if "429" was found inside the response body.
+        """
+        return self._dispatch(list(contents), card, priority)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for all queued cards to be sent.
+
+        Args:
+            timeout: Maximum time in seconds to wait. Waits forever if ``None``.
+
+        Returns:
+            ``True`` if all queued cards were sent (or no queue is configured), ``False``
+            if `timeout` expired first.
+        """
+        if self.queue is not None:
+            return self.queue.flush(timeout)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Send any queued cards, then release the dispatch queue and HTTP client.
+
+        A client borrowed from a ``ConnectionPool`` is left open for other webhooks.
+        Replaying spooled messages stops, and those not yet sent stay in the spool, to be
+        replayed by the next webhook that uses it.
+
+        Args:
+            timeout: Maximum time in seconds to spend sending queued cards. Cards still
+                queued after `timeout` are discarded.
+
+        Returns:
+            ``True`` if all queued cards were sent (or no queue is configured), ``False``
+            if `timeout` expired first.
+        """
+        drained = self.queue.close(timeout) if self.queue is not None else True
+        self._stopping.set()
+        replayer = self._replayer
+        if replayer is not None:
+            replayer.join(timeout)
+        if self._owns_client:
+            self.client.close()
+        return drained
 
 
 class AsyncTeamsWebhook:
@@ -177,7 +744,21 @@ class AsyncTeamsWebhook:
         url: str,
         *,
         verify: Union[str, bool, ssl.SSLContext] = True,
-        timeout: float = 15.0,
+        timeout: float = DEFAULT_TIMEOUT,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        pool: Optional[AsyncConnectionPool] = None,
+        http2: bool = False,
+        limits: Optional[httpx.Limits] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        encoder: Optional[Encoder] = None,
+        max_payload_size: Optional[int] = MAX_PAYLOAD_SIZE,
+        split_oversized: bool = False,
+        writer: Optional[MessageWriter] = None,
+        dedup: Optional[Deduplicator] = None,
+        spool: Optional[Spool] = None,
+        circuit: Optional[CircuitBreaker] = None,
+        observer: Optional[Observer] = None,
     ) -> None:
         """Construct webhook object.
 
@@ -186,41 +767,277 @@ class AsyncTeamsWebhook:
             verify: How to handle HTTPS certificate verification.
             timeout: Global timeout in seconds for all HTTP operations.
                 May be further tuned with an ``httpx.Timeout`` object.
+            rate_limiter: Optional ``RateLimiter`` used to pace requests to `url`. Sends
+                wait until the limiter allows them, rather than failing.
+            retry: Optional ``RetryPolicy`` used to retry sends that fail with rate
+                limiting or transient network errors.
+            pool: Optional ``AsyncConnectionPool`` to borrow an HTTP client from, so that
+                connections are shared with other webhooks. The client's settings are
+                then the pool's, so `verify`, `timeout`, `http2`, `limits` and
+                `transport` must not be given.
+            http2: If true, negotiate HTTP/2 where supported, so that concurrent sends
+                share a single multiplexed connection. Requires the ``http2`` extra:
+                ``pip install msteams_webhooks[http2]``. Default: ``False``
+            limits: Optional ``httpx.Limits`` controlling the maximum number of
+                connections, idle keep-alive connections, and keep-alive expiry.
+            transport: Optional ``httpx`` transport to send requests through instead of
+                the network. Useful for testing.
+            encoder: Optional function used to encode payloads as JSON bytes. Defaults
+                to the fastest encoder installed; see ``msteams_webhooks.encoders``.
+            max_payload_size: Maximum size in bytes of an encoded message. Larger
+                messages are rejected before they are sent, or split if
+                `split_oversized` is true. ``None`` disables the check, and posts
+                messages of any size, as earlier releases did.
+                Default: ``MAX_PAYLOAD_SIZE`` (28 KB)
+            split_oversized: If true, split an ``AdaptiveCard`` that is larger than
+                `max_payload_size` into continuation cards that are sent in order; see
+                ``msteams_webhooks.sizing.split_card``. Default: ``False``
+            writer: Optional ``MessageWriter`` used to encode cards into a reusable
+                buffer, which is posted without copying it.
+            dedup: Optional ``Deduplicator`` used to suppress messages that repeat one
+                sent recently.
+            spool: Optional ``Spool`` that messages failing with a transient error
+                (those retried by `retry`, or by default) are written to, to be replayed
+                in order by a background task once Teams is reachable again. Call
+                ``start_replay`` to replay messages left by a previous process before
+                anything else is sent.
+            circuit: Optional ``CircuitBreaker``. While it is open, sends fail fast with
+                ``TeamsCircuitOpenError``, or are spooled if a `spool` is configured,
+                instead of waiting for requests that are likely to fail.
+            observer: Optional ``Observer``, such as a ``MetricsCollector``, told how long
+                each card takes to serialize and encode, and the size, latency and
+                outcome of each request.
 
         Returns:
             None.
 
         Raises:
-            None.
+            ValueError: if `pool` is given with `verify`, `timeout`, `http2`, `limits` or
+                `transport`.
         """
         self.url = url
-        self.client = httpx.AsyncClient(verify=verify, timeout=timeout)
+        if pool is not None:
+            if (
+                verify is not True
+                or timeout != DEFAULT_TIMEOUT
+                or http2
+                or limits is not None
+                or transport is not None
+            ):
+                msg = (
+                    "`verify`, `timeout`, `http2`, `limits` and `transport` cannot be used "
+                    "with `pool`; configure the pool instead."
+                )
+                raise ValueError(msg)
+            self.client = pool.client_for(url)
+        else:
+            self.client = httpx.AsyncClient(
+                verify=verify,
+                timeout=timeout,
+                http2=http2,
+                limits=limits or DEFAULT_LIMITS,
+                transport=transport,
+            )
+        self._owns_client = pool is None
+        self.encoder = encoder or default_encoder()
+        self.max_payload_size = max_payload_size
+        self.split_oversized = split_oversized
+        self.writer = writer
+        self.dedup = dedup
+        self.rate_limiter = rate_limiter
+        self.retry = retry
         self.response = None
+        self.spool = spool
+        self.circuit = circuit
+        self.observer = observer
+        self._replayer: Optional[asyncio.Task[None]] = None
 
-    async def _send_json(self, json: dict[Any, Any]) -> None:
-        """Posts a raw JSON payload to the webhook URL.
+    async def _send_json(self, json: Union[dict[Any, Any], bytes, memoryview]) -> httpx.Response:
+        """Posts a raw JSON payload to the webhook URL, retrying if so configured.
 
         Args:
-            json: Data dict that will be converted to JSON before posting to webhook.
+            json: Data dict that will be converted to JSON with ``encoder`` before
+                posting to webhook, or already-encoded JSON bytes or a view of them.
 
         Returns:
-            None.
+            The response to the successful request.
+
+        Raises:
+            TeamsWebhookError: if the response was anything other than 200/OK.
+            TeamsRateLimitError: if "429" was found inside the response body.
+            TeamsCircuitOpenError: if the circuit breaker is open.
+        """
+        content = self.encoder(json) if isinstance(json, dict) else json
+        circuit = self.circuit
+        attempts = 0
+
+        async def attempt() -> httpx.Response:
+            nonlocal attempts
+            attempts += 1
+            if attempts > 1 and self.observer is not None:
+                self.observer.on_retry(attempts)
+            if circuit is not None:
+                return await circuit.call_async(lambda: self._post(content))
+            return await self._post(content)
+
+        if self.retry:
+            return await self.retry.call_async(attempt)
+        return await attempt()
+
+    async def _post(self, content: Union[bytes, memoryview]) -> httpx.Response:
+        """Makes a single attempt to post an encoded JSON payload to the webhook URL.
+
+        Args:
+            content: Encoded JSON to post, or a view of it.
+
+        Returns:
+            The response to the request.
 
         Raises:
             TeamsWebhookError: if the response was anything other than 200/OK.
             TeamsRateLimitError: if "429" was found inside the response body.
         """
         headers = {"Content-Type": "application/json"}
-        self.response = await self.client.post(url=self.url, json=json, headers=headers)
-        if self.response.status_code != httpx.codes.OK:
-            raise TeamsWebhookError(self.response.text)
-        if "400" in self.response.text:
-            # Malformed requests return HTTP code 200 with 400 in response body.
-            msg = "Bad request. Check that the message payload syntax is correct."
-            raise TeamsWebhookError(msg)
-        if "429" in self.response.text:
-            # Rate limit errors receive HTTP code 200 with 429 in response body.
-            raise TeamsRateLimitError()
+        if self.rate_limiter:
+            await self.rate_limiter.acquire_async()
+        started = time.perf_counter()
+        outcome: types.RequestOutcomes = "error"
+        try:
+            if isinstance(content, memoryview):
+                response = await self.client.send(self._build_request(content, headers))
+            else:
+                response = await self.client.post(url=self.url, content=content, headers=headers)
+            self.response = response
+            if response.status_code != httpx.codes.OK:
+                raise TeamsResponseError(response.status_code, response.text)
+            if "400" in response.text:
+                # Malformed requests return HTTP code 200 with 400 in response body.
+                msg = "Bad request. Check that the message payload syntax is correct."
+                raise TeamsWebhookError(msg)
+            if "429" in response.text:
+                # Rate limit errors receive HTTP code 200 with 429 in response body.
+                outcome = "rate_limited"
+                raise TeamsRateLimitError()
+            outcome = "ok"
+            return response
+        finally:
+            if self.observer is not None:
+                self.observer.on_request(time.perf_counter() - started, len(content), outcome)
+
+    def _build_request(self, content: memoryview, headers: dict[str, str]) -> httpx.Request:
+        """Builds a request that posts a view of an encoded JSON payload without copying it.
+
+        ``httpx`` would treat a ``memoryview`` passed as `content` as an iterable of
+        chunks, so the request is given a stream over the view instead.
+
+        Args:
+            content: View of the encoded JSON to post.
+            headers: Request headers.
+
+        Returns:
+            The request.
+        """
+        headers = {**headers, "Content-Length": str(content.nbytes)}
+        request = self.client.build_request("POST", self.url, headers=headers)
+        return httpx.Request(
+            "POST",
+            request.url,
+            headers=request.headers,
+            # ByteStream only hands the view to the transport, which writes it as is.
+            stream=httpx.ByteStream(cast(bytes, content)),
+            extensions=request.extensions,
+        )
+
+    async def _send_messages(
+        self,
+        contents: Sequence[Union[bytes, memoryview]],
+        card: Optional[Card] = None,
+    ) -> Optional[httpx.Response]:
+        """Checks encoded messages for size and repeats, then posts them in order.
+
+        Stops at the first failure. With a `spool`, messages are spooled instead if
+        earlier messages are still waiting to be replayed, and from the first that fails
+        with a transient error.
+
+        Args:
+            contents: Encoded messages to post, e.g. the pages of a split card.
+            card: The card the messages encode, if any, for `dedup` to identify it by.
+
+        Returns:
+            The response to the last message, or None if the messages were suppressed as
+            a duplicate or spooled.
+
+        Raises:
+            TeamsPayloadTooLargeError: if a message is larger than `max_payload_size`.
+            TeamsWebhookError: if the response was anything other than 200/OK.
+            TeamsRateLimitError: if "429" was found inside the response body.
+        """
+        for content in contents:
+            check_size(content, self.max_payload_size)
+        key = None
+        if self.dedup is not None:
+            key = self.dedup.key_for(contents, card)
+            if self.dedup.check(key):
+                return None
+        if self.spool is not None and len(self.spool):
+            return self._spool_messages(self.spool, contents)
+        sent = 0
+        response = None
+        try:
+            for content in contents:
+                response = await self._send_json(content)
+                sent += 1
+        except Exception as exc:
+            if self.spool is not None and isinstance(exc, self._spooled_errors):
+                return self._spool_messages(self.spool, contents[sent:])
+            if self.dedup is not None:
+                self.dedup.discard(key)
+            raise
+        return response
+
+    @property
+    def _spooled_errors(self) -> tuple[type[BaseException], ...]:
+        """Errors that cause a message to be spooled, rather than raised."""
+        return (*(self.retry.retry_on if self.retry else DEFAULT_RETRY_ON), TeamsCircuitOpenError)
+
+    def _spool_messages(self, spool: Spool, contents: Sequence[Union[bytes, memoryview]]) -> None:
+        """Writes messages to the spool, and makes sure they will be replayed."""
+        for content in contents:
+            spool.append(content)
+        self.start_replay()
+
+    def start_replay(self) -> None:
+        """Start replaying spooled messages in a background task, if not already running.
+
+        Called automatically when messages are spooled. Must be called from a running
+        event loop.
+
+        Returns:
+            None.
+        """
+        if self.spool is not None and len(self.spool) and self._replayer is None:
+            self._replayer = asyncio.get_running_loop().create_task(self._replay(self.spool))
+
+    async def _replay(self, spool: Spool) -> None:
+        """Replay task: sends spooled messages in order until none are left.
+
+        A message that fails with a transient error is retried with backoff until it is
+        sent. One that fails with any other error can never be sent, so it is discarded.
+        """
+        backoff = self.retry or RetryPolicy()
+        attempt = 0
+        while (content := spool.peek()) is not None:
+            try:
+                await self._send_json(content)
+            except self._spooled_errors:
+                attempt += 1
+                await asyncio.sleep(backoff.backoff(attempt))
+            except Exception:
+                spool.discard()
+            else:
+                attempt = 0
+                spool.ack()
+        self._replayer = None
 
     async def send_card(
         self,
@@ -238,7 +1055,8 @@ class AsyncTeamsWebhook:
             None.
 
         Raises:
-            None.
+            TeamsPayloadTooLargeError: if the encoded card is larger than
+                `max_payload_size` and cannot be split.
         """
         # Since the attachments value is a list, you might think you can send more
         # than one card to the channel at once, but this isn't true. If you send
@@ -247,10 +1065,69 @@ class AsyncTeamsWebhook:
         if not card and not data:
             raise ValueError("Must provide either `card` or `data` values.")  # noqa: TRY003
         if card:
-            json = {"type": "message", "attachments": [card.serialize()]}
+            await self._send_card(card)
         else:
-            json = {"type": "message", "attachments": [data]}
-        await self._send_json(json=json)
+            await self._send_messages([self.encoder({"type": "message", "attachments": [data]})])
+
+    async def _send_card(self, card: Card) -> Optional[httpx.Response]:
+        """Encodes a card, then sends it.
+
+        With a `writer`, the card is encoded into one of the writer's buffers and posted
+        from there. It is encoded again with ``encode_card`` only if it is larger than
+        `max_payload_size`, to be split or rejected.
+
+        Args:
+            card: The card to send.
+
+        Returns:
+            The response to the last message sent, or None if the card was suppressed as
+            a duplicate.
+
+        Raises:
+            TeamsPayloadTooLargeError: if the encoded card is larger than
+                `max_payload_size` and cannot be split.
+            TeamsWebhookError: if the response was anything other than 200/OK.
+            TeamsRateLimitError: if "429" was found inside the response body.
+        """
+        if self.writer is not None:
+            started = time.perf_counter()
+            with self.writer.message(card) as content:
+                if self.max_payload_size is None or len(content) <= self.max_payload_size:
+                    if self.observer is not None:
+                        self.observer.on_encode(time.perf_counter() - started)
+                    return await self._send_messages([content], card)
+        return await self._send_messages(self._encode_card(card), card)
+
+    def _encode_card(self, card: Card) -> list[bytes]:
+        """Encodes a card with ``encode_card``, timing each step for the `observer`.
+
+        Args:
+            card: The card to encode.
+
+        Returns:
+            The encoded messages, to be sent in order.
+
+        Raises:
+            TeamsPayloadTooLargeError: if the encoded card is larger than
+                `max_payload_size` and cannot be split.
+        """
+        started = time.perf_counter()
+        if self.observer is not None:
+            # Serialize first, so that encode_card reuses the cached data structure
+            # and the two steps can be timed separately.
+            card.serialize()
+            serialized = time.perf_counter()
+            self.observer.on_serialize(serialized - started)
+            started = serialized
+        contents = encode_card(
+            card,
+            encoder=self.encoder,
+            max_size=self.max_payload_size,
+            split=self.split_oversized,
+        )
+        if self.observer is not None:
+            self.observer.on_encode(time.perf_counter() - started)
+        return contents
 
     async def send_message(
         self,
@@ -309,15 +1186,166 @@ class AsyncTeamsWebhook:
         )
         await self.send_card(card=AdaptiveCard(body=[text_block], version=version))
 
+    async def send_template(self, template: CardTemplate, /, **values: Any) -> None:  # noqa: ANN401
+        """Renders a card template and sends the result to the channel.
+
+        Args:
+            template: The ``CardTemplate`` to render.
+            **values: Value for each of the template's placeholders, by name.
+
+        Returns:
+            None.
+
+        Raises:
+            KeyError: if no value was given for a placeholder.
+        """
+        await self.send_raw_bytes(template.render(**values))
+
+    async def send_raw_bytes(self, content: bytes) -> None:
+        """Sends an already-encoded webhook message to the channel.
+
+        Useful for payloads that were encoded ahead of time, e.g. rendered from a
+        ``CardTemplate`` or cached from a previous send, since they skip encoding.
+
+        Args:
+            content: The complete message, as UTF-8 encoded JSON. Must conform to the
+                webhook message schema: ``{"type": "message", "attachments": [...]}``.
+
+        Returns:
+            None.
+
+        Raises:
+            TeamsPayloadTooLargeError: if `content` is larger than `max_payload_size`.
+            TeamsWebhookError: if the response was anything other than 200/OK.
+            TeamsRateLimitError: if "429" was found inside the response body.
+        """
+        await self._send_messages([content])
+
+    async def send_encoded(
+        self,
+        contents: Sequence[bytes],
+        card: Optional[Card] = None,
+    ) -> Optional[httpx.Response]:
+        """Sends several already-encoded webhook messages to the channel, in order.
+
+        Useful to post messages encoded once for several channels, e.g. the pages of a
+        card split by ``msteams_webhooks.sizing.encode_card``. Sending stops at the first
+        failure.
+
+        Args:
+            contents: The complete messages, as UTF-8 encoded JSON.
+            card: The card the messages encode, if any, for `dedup` to identify it by.
+
+        Returns:
+            The response to the last message, or None if the messages were suppressed as
+            a duplicate or spooled.
+
+        Raises:
+            TeamsPayloadTooLargeError: if a message is larger than `max_payload_size`.
+            TeamsWebhookError: if the response was anything other than 200/OK.
+            TeamsRateLimitError: if "429" was found inside the response body.
+        """
+        return await self._send_messages(contents, card)
+
+    async def send_many(
+        self,
+        cards: Union[Iterable[Card], AsyncIterable[Card]],
+        *,
+        concurrency: int = 4,
+        key: Optional[Callable[[Card], Hashable]] = None,
+    ) -> list[SendResult]:
+        """Sends many cards to the channel concurrently.
+
+        At most `concurrency` cards are in flight at once, so a large batch doesn't
+        flood Teams the way an unbounded ``asyncio.gather`` would. A failure to send one
+        card doesn't affect the others.
+
+        Args:
+            cards: Iterable or async iterable of the ``Card`` objects to send. Async
+                iterables are consumed no faster than cards can be sent.
+            concurrency: Maximum number of cards to send at the same time. Default: ``4``
+            key: Optional function returning a grouping key for each card. Cards with the
+                same key are sent one at a time, in the order given, while cards with
+                different keys are sent concurrently.
+
+        Returns:
+            A ``SendResult`` for each card, in the order given.
+
+        Raises:
+            ValueError: if `concurrency` is less than one.
+        """
+        if concurrency < 1:
+            raise ValueError("`concurrency` must be at least 1.")  # noqa: TRY003
+        semaphore = asyncio.Semaphore(concurrency)
+        results: list[SendResult] = []
+        tasks: list[asyncio.Task[None]] = []
+        lanes: dict[Hashable, asyncio.Task[None]] = {}
+
+        async def send(index: int, card: Card, previous: Optional[asyncio.Task[None]]) -> None:
+            try:
+                if previous is not None:
+                    await asyncio.wait([previous])
+                results[index].response = await self._send_card(card)
+            except Exception as exc:
+                results[index].exception = exc
+            finally:
+                semaphore.release()
+
+        async def iterate() -> AsyncIterable[Card]:
+            if isinstance(cards, AsyncIterable):
+                async for card in cards:
+                    yield card
+            else:
+                for card in cards:
+                    yield card
+
+        try:
+            async for card in iterate():
+                await semaphore.acquire()
+                results.append(SendResult(card))
+                lane = key(card) if key else None
+                task = asyncio.create_task(send(len(tasks), card, lanes.get(lane)))
+                if key:
+                    lanes[lane] = task
+                tasks.append(task)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return results
+
+    async def close(self) -> None:
+        """Release the HTTP client.
+
+        A client borrowed from an ``AsyncConnectionPool`` is left open for other webhooks.
+        Replaying spooled messages stops, and those not yet sent stay in the spool, to be
+        replayed by the next webhook that uses it.
+        """
+        if self._replayer is not None:
+            self._replayer.cancel()
+            await asyncio.wait([self._replayer])
+            self._replayer = None
+        if self._owns_client:
+            await self.client.aclose()
+
 
 __all__ = (
     "Action",
     "ActionSet",
     "AdaptiveCard",
+    "AsyncConnectionPool",
+    "AsyncMessageCoalescer",
     "AsyncTeamsWebhook",
+    "Broadcaster",
+    "CardTemplate",
+    "CircuitBreaker",
     "Column",
     "ColumnSet",
+    "ColumnarTable",
+    "ConnectionPool",
     "Container",
+    "Deduplicator",
+    "DispatchQueue",
     "Fact",
     "FactSet",
     "HeroCard",
@@ -325,14 +1353,25 @@ __all__ = (
     "ImageSet",
     "Media",
     "MediaSource",
+    "MessageCoalescer",
+    "MessageWriter",
+    "MetricsCollector",
+    "MockTeamsServer",
+    "Observer",
     "OpenURLAction",
     "OpenURLButton",
+    "Placeholder",
+    "RateLimiter",
     "ReceiptCard",
     "ReceiptFact",
     "ReceiptItem",
+    "RetryPolicy",
+    "SendResult",
+    "Spool",
     "Table",
     "TableCell",
     "TableRow",
+    "TeamsLogHandler",
     "TeamsWebhook",
     "TextBlock",
 )
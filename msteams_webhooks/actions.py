@@ -3,14 +3,16 @@
 Not all actions defined in the Adaptive Card standard work with webhooks. Only those
 actions which work with webhooks are implemented.
 """
-from typing import Any, Optional
+from typing import Optional
 
-from msteams_webhooks.base import Entity
+from msteams_webhooks.base import Entity, Field
 
 
 class Action(Entity):
     """Base action class."""
 
+    __slots__ = ()
+
 
 class OpenURLAction(Action):
     """Opens a URL when clicked or tapped.
@@ -18,6 +20,10 @@ class OpenURLAction(Action):
     Schema Explorer: https://adaptivecards.io/explorer/Action.OpenUrl.html
     """
 
+    __slots__ = ("title", "url")
+    _type = "Action.OpenUrl"
+    _schema = (Field("url", omit="never"), Field("title"))
+
     def __init__(
         self,
         url: str,
@@ -41,13 +47,3 @@ class OpenURLAction(Action):
         """
         self.url = url
         self.title = title
-
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload: dict[str, Any] = {
-            "type": "Action.OpenUrl",
-            "url": self.url,
-        }
-        if self.title:
-            payload["title"] = self.title
-        return payload
@@ -1,9 +1,326 @@
 """Base classes from which other classes inherit."""
-from typing import Any
+import itertools
+import operator
+import weakref
+from collections.abc import Iterable
+from typing import Any, Callable, Literal, NamedTuple, Optional, SupportsIndex, TypeVar, Union
+
+from msteams_webhooks.encoders import Encoder, default_encoder
+
+OmitRules = Literal["falsy", "none", "never"]
+FieldKinds = Literal["value", "entity", "entities", "str", "url", "urls"]
+_E = TypeVar("_E", bound="Entity")
+
+
+class Field(NamedTuple):
+    """How one attribute of an ``Entity`` is serialized.
+
+    Attributes:
+        name: Name of the attribute.
+        key: JSON key. Defaults to `name` in camelCase.
+        omit: When to leave the key out: ``"falsy"`` if the value is falsy, ``"none"`` if
+            the value is ``None``, or ``"never"``.
+        kind: How to convert the value: ``"value"`` as is, ``"entity"`` with its
+            ``serialize()`` method, ``"entities"`` for a list of entities, ``"str"`` with
+            ``str()``, ``"url"`` as ``{"url": value}``, or ``"urls"`` for a list of those.
+    """
+
+    name: str
+    key: Optional[str] = None
+    omit: OmitRules = "falsy"
+    kind: FieldKinds = "value"
+
+
+# Source code of the test applied by each omit rule, and of the conversion of each kind.
+_TESTS = {"falsy": "if value:", "none": "if value is not None:", "never": ""}
+_CONVERSIONS = {
+    "value": ["payload[{key}] = value"],
+    "entity": ["payload[{key}] = value._serialize_cached()"],
+    "entities": ["payload[{key}] = list(map(_serialize_each, value))"],
+    "str": ["payload[{key}] = str(value)"],
+    "url": ['payload[{key}] = {{"url": value}}'],
+    "urls": ['payload[{key}] = [{{"url": x}} for x in value]'],
+}
+_GENERATED = ("_serialize", "_serialize_cached", "_serialize_node")
+# In ``_serialize_node``, child entities that are not cached yet are left for
+# ``_serialize_tree`` to fill in, instead of being serialized recursively.
+_NODE_CONVERSIONS = {
+    **_CONVERSIONS,
+    "entity": [
+        "payload[{key}] = child = value._payload",
+        "if child is None:",
+        "    pending.append((payload, {key}, value))",
+    ],
+    "entities": [
+        "payload[{key}] = children = [None] * len(value)",
+        "pending.extend(zip(repeat(children), count(), value))",
+    ],
+}
+
+
+def _camel_case(name: str) -> str:
+    """Convert a snake_case attribute name into a camelCase JSON key."""
+    first, *rest = name.split("_")
+    return first + "".join(word.capitalize() for word in rest)
+
+
+def _type_first(cls: type["Entity"]) -> bool:
+    """Whether the ``type`` key comes first, rather than where the schema places it."""
+    return bool(cls._type) and all(field.name != "_type" for field in cls._schema)
+
+
+def _generate(cls: type["Entity"], conversions: dict[str, list[str]]) -> list[str]:
+    """Generate the body of a serialization method from a class's ``_schema``."""
+    body = [f"payload = {{'type': {cls._type!r}}}" if _type_first(cls) else "payload = {}"]
+    for field in cls._schema:
+        if not field.name.isidentifier():
+            raise ValueError(f"Invalid field name {field.name!r}.")  # noqa: TRY003
+        key = repr(field.key or _camel_case(field.name))
+        body.append(f"value = self.{field.name}")
+        lines = [line.format(key=key) for line in conversions[field.kind]]
+        if field.omit == "never":
+            body.extend(lines)
+        else:
+            body.append(_TESTS[field.omit])
+            body.extend(f"    {line}" for line in lines)
+    if cls._content_type:
+        body.append(f"return {{'contentType': {cls._content_type!r}, 'content': payload}}")
+    else:
+        body.append("return payload")
+    return body
+
+
+def _compile(cls: type["Entity"]) -> dict[str, Callable[..., Any]]:
+    """Generate the serialization methods of an entity class from its ``_schema``.
+
+    The generated methods check and convert each field in turn, exactly like a
+    hand-written chain of ``if`` statements, without looping over the schema at runtime:
+
+    * ``_serialize`` builds the entity's data structure.
+    * ``_serialize_cached`` does the same unless it is cached, and caches it. Child
+      entities are serialized by recursive calls to their own ``_serialize_cached``.
+    * ``_serialize_node`` builds the data structure except for child entities, which it
+      leaves to ``_serialize_tree``.
+    """
+    body = _generate(cls, _CONVERSIONS)
+    source = "\n".join(
+        [
+            "def _serialize(self):",
+            *(f"    {line}" for line in body),
+            "def _serialize_cached(self):",
+            "    cached = self._payload",
+            "    if cached is not None:",
+            "        return cached",
+            *(f"    {line}" for line in body[:-1]),
+            f"    result = {body[-1][len('return '):]}",
+            "    _store(self, result)",
+            "    return result",
+            "def _serialize_node(self, pending):",
+            *(f"    {line}" for line in _generate(cls, _NODE_CONVERSIONS)),
+        ],
+    )
+    namespace: dict[str, Any] = {
+        "_serialize_each": operator.methodcaller("_serialize_cached"),
+        "_store": _store_payload,
+        "count": itertools.count,
+        "repeat": itertools.repeat,
+    }
+    exec(source, namespace)  # noqa: S102
+    methods = {name: namespace[name] for name in _GENERATED}
+    for name, method in methods.items():
+        method.__qualname__ = f"{cls.__qualname__}.{name}"
+        method.__doc__ = getattr(Entity, name).__doc__
+    return methods
+
+
+def _serialize_tree(root: "Entity") -> dict[str, Any]:
+    """Serialize an entity and all the entities it contains, without recursion.
+
+    Each entity's data structure is created by its ``_serialize_node`` method, which
+    leaves a placeholder for every child entity that isn't cached yet and pushes it onto
+    an explicit stack. Children are then serialized in turn and written into their
+    parent's placeholder, so the depth of a card is not limited by the interpreter's
+    recursion limit.
+
+    Args:
+        root: The entity to serialize.
+
+    Returns:
+        The root entity's data structure.
+    """
+    pending: list[tuple[Any, Any, Entity]] = []
+    pop = pending.pop
+    store = _store_payload
+    result = root._serialize_node(pending)
+    # Caches are stored as soon as each data structure is created, so that an entity
+    # that appears more than once is only serialized once.
+    store(root, result)
+    done = [root]
+    try:
+        while pending:
+            target, key, entity = pop()
+            payload = entity._payload
+            if payload is None:
+                payload = entity._serialize_node(pending)
+                store(entity, payload)
+                done.append(entity)
+            target[key] = payload
+    except BaseException:
+        # Don't leave partially built data structures in the caches.
+        for entity in done:
+            store(entity, None)
+        raise
+    return result
+
+
+def _serialize_overridden(self: "Entity") -> dict[str, Any]:
+    """``_serialize_cached`` of subclasses that override ``serialize()``."""
+    return self.serialize()
+
+
+def _serialize_node_overridden(
+    self: "Entity",
+    pending: list[tuple[Any, Any, "Entity"]],
+) -> dict[str, Any]:
+    """``_serialize_node`` of subclasses that override ``serialize()``."""
+    return self.serialize()
 
 
 class Entity:
-    """Base class for all other entities."""
+    """Base class for all other entities.
+
+    The first call to ``serialize()`` caches the resulting data structure, and the first
+    call to ``to_json()`` caches the encoded JSON. Assigning to a public attribute, or
+    modifying a list held by one, discards the cache of the entity and of every entity
+    that contains it. Serializing an unchanged card again is therefore almost free, and
+    after a change only the changed entity and its ancestors are rebuilt.
+
+    Cached data structures are shared between the entity and its ancestors, and must not
+    be modified. Copy the result of ``serialize()`` before changing it.
+
+    Subclasses declare their public attributes in ``__slots__``, so that entities don't
+    carry a per-instance ``__dict__``, and describe how they are serialized with class
+    attributes, from which their serialization methods are generated:
+
+    * ``_schema``: ``Field`` for each attribute, in JSON key order.
+    * ``_type``: Optional value of the ``type`` key, which comes first, unless the schema
+      places it with ``Field("_type", key="type", omit="never")``.
+    * ``_content_type``: Optional card content type. If set, the serialized fields are
+      wrapped in a card attachment: ``{"contentType": ..., "content": {...}}``.
+
+    Subclasses whose output the schema cannot describe override ``_serialize()`` instead.
+    Subclasses may also override ``serialize()`` itself, for example to post-process the
+    data structure built by ``super().serialize()``. Their instances are then serialized
+    through the override wherever they appear in a card, at the cost of a recursive call
+    for each of them, and their output is not cached separately.
+
+    ``serialize()`` makes one Python call per entity, recursively. Cards nested too deeply
+    for the interpreter's recursion limit are serialized with an explicit stack instead.
+    """
+
+    __slots__ = ("__weakref__", "_json", "_parents", "_payload")
+
+    _fields: tuple[str, ...] = ()
+    _schema: tuple[Field, ...] = ()
+    _type: Optional[str] = None
+    _content_type: Optional[str] = None
+    _overrides_serialize = False
+    _json: Optional[bytes]
+    _parents: Optional[list["weakref.ref[Entity]"]]
+    _payload: Optional[dict[str, Any]]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:  # noqa: ANN401
+        """Collect public attribute names, and generate serialization methods."""
+        super().__init_subclass__(**kwargs)
+        slots = [vars(klass).get("__slots__", ()) for klass in reversed(cls.__mro__)]
+        cls._fields = tuple(name for names in slots for name in names if name[0] != "_")
+        if "_serialize" in vars(cls):
+            # Don't inherit generated methods, which would bypass _serialize().
+            for name in _GENERATED[1:]:
+                if name not in vars(cls):
+                    setattr(cls, name, getattr(Entity, name))
+        elif "_schema" in vars(cls):
+            for name, method in _compile(cls).items():
+                setattr(cls, name, method)
+        cls._overrides_serialize = cls.serialize is not Entity.serialize
+        if cls._overrides_serialize:
+            # Nested instances are serialized through the overriding serialize(), while
+            # Entity.serialize() keeps using the class's own methods.
+            own = cls._serialize_cached
+            if own is not _serialize_overridden:
+                cls._serialize_own = own
+            cls._serialize_cached = _serialize_overridden
+            cls._serialize_node = _serialize_node_overridden
+
+    def __new__(cls: type[_E], *args: Any, **kwargs: Any) -> _E:  # noqa: ANN401
+        """Create an entity with empty caches."""
+        entity = super().__new__(cls)  # pyright: ignore[reportArgumentType]
+        entity._payload = None
+        entity._json = None
+        entity._parents = None
+        return entity
+
+    def __setattr__(self, name: str, value: Any) -> None:  # noqa: ANN401
+        """Set an attribute, tracking child entities and discarding stale caches."""
+        if name[0] != "_":
+            if isinstance(value, Entity):
+                value._add_parent(self)
+            elif isinstance(value, list):
+                value = EntityList(self, value)
+            if self._payload is not None or self._json is not None or self._parents:
+                self._invalidate()
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Public attributes, without caches or links to parent entities."""
+        state = {name: getattr(self, name) for name in self._fields if hasattr(self, name)}
+        # Subclasses defined without __slots__ keep further attributes in a __dict__.
+        state.update(
+            (name, value) for name, value in getattr(self, "__dict__", {}).items() if name[0] != "_"
+        )
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore public attributes, re-linking child entities."""
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def _add_parent(self, parent: "Entity") -> None:
+        """Record that `parent` contains this entity, so changes propagate to it.
+
+        Links to parents that no longer exist are dropped, so that an entity held by many
+        short-lived containers doesn't keep a link to each of them.
+        """
+        parents = self._parents
+        if not parents:
+            self._parents = [weakref.ref(parent)]
+            return
+        live = [ref for ref in parents if ref() is not None]
+        if not any(ref() is parent for ref in live):
+            live.append(weakref.ref(parent))
+        self._parents = live
+
+    def _invalidate(self) -> None:
+        """Discard the cache of this entity and of every entity containing it."""
+        stack: list[Entity] = [self]
+        seen: set[int] = set()
+        while stack:
+            entity = stack.pop()
+            if id(entity) in seen:
+                continue
+            seen.add(id(entity))
+            entity._payload = None
+            entity._json = None
+            parents = entity._parents
+            if parents:
+                live = []
+                for ref in parents:
+                    parent = ref()
+                    if parent is not None:
+                        live.append(ref)
+                        stack.append(parent)
+                if len(live) < len(parents):
+                    entity._parents = live
 
     def dump(self) -> dict[str, Any]:
         """Convenience alias."""
@@ -11,4 +328,180 @@ class Entity:
 
     def serialize(self) -> dict[str, Any]:
         """Serialize object into data structure."""
+        payload = self._payload
+        if payload is None:
+            try:
+                payload = self._serialize_own()
+            except RecursionError:
+                # Too deeply nested to serialize recursively. Entities serialized before
+                # the error are cached, and reused by the explicit-stack walk.
+                payload = _serialize_tree(self)
+        return payload
+
+    def _serialize(self) -> dict[str, Any]:
+        """Build the data structure returned by ``serialize()``."""
         return {}
+
+    def _serialize_cached(self) -> dict[str, Any]:
+        """Return the cached data structure, building and caching it if necessary."""
+        payload = self._payload
+        if payload is None:
+            payload = self._serialize()
+            _store_payload(self, payload)
+        return payload
+
+    def _serialize_own(self) -> dict[str, Any]:
+        """Return the data structure built by the class itself, caching it.
+
+        The same as ``_serialize_cached()``, except for subclasses that override
+        ``serialize()``, whose ``_serialize_cached()`` calls the override instead.
+        """
+        return self._serialize_cached()
+
+    def _serialize_node(self, pending: list[tuple[Any, Any, "Entity"]]) -> dict[str, Any]:
+        """Build the data structure returned by ``serialize()``, except for child entities.
+
+        Args:
+            pending: Stack onto which to push a ``(container, key, entity)`` tuple for each
+                child entity that the caller must serialize and store in ``container[key]``.
+
+        Returns:
+            The entity's data structure.
+        """
+        return self._serialize()
+
+    def to_json(self, encoder: Optional[Encoder] = None) -> bytes:
+        """Serialize object into UTF-8 encoded JSON.
+
+        Args:
+            encoder: Encoder to use if the encoded JSON is not already cached. Defaults
+                to the fastest encoder installed.
+
+        Returns:
+            Compact UTF-8 encoded JSON.
+        """
+        encoded = self._json
+        if encoded is None:
+            encoded = self._json = (encoder or default_encoder())(self.serialize())
+        return encoded
+
+
+# Setting the cache slot through its descriptor skips ``Entity.__setattr__``.
+_store_payload = vars(Entity)["_payload"].__set__
+
+
+class EntityList(list):
+    """A list held by an ``Entity``, which discards the entity's cache when modified.
+
+    Lists assigned to an entity's attributes are converted to ``EntityList`` objects
+    automatically. Any ``Entity`` added to the list is linked to the entity holding it.
+    """
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner: Entity, items: Iterable[Any] = ()) -> None:
+        """Wrap `items` in a list owned by `owner`.
+
+        Args:
+            owner: The entity holding the list.
+            items: Initial contents of the list.
+
+        Returns:
+            None.
+
+        Raises:
+            None.
+        """
+        super().__init__(items)
+        self._owner = weakref.ref(owner)
+        self._adopt(self)
+
+    def __reduce_ex__(self, protocol: SupportsIndex) -> Any:  # noqa: ANN401
+        """Copy and pickle as a plain list; the copy is re-wrapped when assigned."""
+        return (list, (list(self),))
+
+    def _adopt(self, items: Iterable[Any]) -> None:
+        """Link entities in `items` to the owner."""
+        owner = self._owner()
+        if owner is not None:
+            for item in items:
+                if isinstance(item, Entity):
+                    item._add_parent(owner)
+
+    def _changed(self) -> None:
+        """Discard the owner's cache."""
+        owner = self._owner()
+        if owner is not None:
+            owner._invalidate()
+
+    def append(self, item: Any) -> None:  # noqa: ANN401
+        """Append `item` to the end of the list."""
+        super().append(item)
+        self._adopt((item,))
+        self._changed()
+
+    def extend(self, items: Iterable[Any]) -> None:
+        """Extend the list by appending `items`."""
+        items = list(items)
+        super().extend(items)
+        self._adopt(items)
+        self._changed()
+
+    def insert(self, index: SupportsIndex, item: Any) -> None:  # noqa: ANN401
+        """Insert `item` before `index`."""
+        super().insert(index, item)
+        self._adopt((item,))
+        self._changed()
+
+    def __setitem__(self, index: Union[SupportsIndex, slice], value: Any) -> None:  # noqa: ANN401
+        """Replace the item (or slice of items) at `index`."""
+        if isinstance(index, slice):
+            value = list(value)
+            super().__setitem__(index, value)
+            self._adopt(value)
+        else:
+            super().__setitem__(index, value)
+            self._adopt((value,))
+        self._changed()
+
+    def __delitem__(self, index: Union[SupportsIndex, slice]) -> None:
+        """Delete the item (or slice of items) at `index`."""
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, items: Iterable[Any]) -> "EntityList":
+        """Extend the list in place."""
+        self.extend(items)
+        return self
+
+    def __imul__(self, count: SupportsIndex) -> "EntityList":
+        """Repeat the contents of the list in place."""
+        super().__imul__(count)
+        self._changed()
+        return self
+
+    def pop(self, index: SupportsIndex = -1) -> Any:  # noqa: ANN401
+        """Remove and return the item at `index`."""
+        item = super().pop(index)
+        self._changed()
+        return item
+
+    def remove(self, item: Any) -> None:  # noqa: ANN401
+        """Remove the first occurrence of `item`."""
+        super().remove(item)
+        self._changed()
+
+    def clear(self) -> None:
+        """Remove all items from the list."""
+        super().clear()
+        self._changed()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Sort the list in place."""
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self) -> None:
+        """Reverse the list in place."""
+        super().reverse()
+        self._changed()
@@ -0,0 +1,160 @@
+"""Sending one card to many channels at once.
+
+Posting the same incident card to dozens of channels with an ``AsyncTeamsWebhook`` for
+each means a client, and an encoding of the card, for every channel. A ``Broadcaster``
+encodes the card once, then posts the same bytes to every channel concurrently, over
+clients shared per host by an ``AsyncConnectionPool``. Each channel keeps its own
+``RateLimiter``, so a busy channel is paced without holding up the others, and a failure
+to post to one channel doesn't affect the rest.
+"""
+import asyncio
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Optional
+
+from msteams_webhooks.cards import Card
+from msteams_webhooks.dispatch import SendResult
+from msteams_webhooks.encoders import Encoder, default_encoder
+from msteams_webhooks.metrics import Observer
+from msteams_webhooks.pool import AsyncConnectionPool
+from msteams_webhooks.ratelimit import RateLimiter
+from msteams_webhooks.retry import RetryPolicy
+from msteams_webhooks.sizing import MAX_PAYLOAD_SIZE, encode_card
+
+if TYPE_CHECKING:
+    from msteams_webhooks import AsyncTeamsWebhook
+
+
+class Broadcaster:
+    """Sends the same card to many channels concurrently, encoding it only once.
+
+    One ``AsyncTeamsWebhook`` is kept for each URL, and they all borrow their clients
+    from the same pool. Use the broadcaster as an async context manager, or call
+    ``close`` when finished with it.
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        *,
+        pool: Optional[AsyncConnectionPool] = None,
+        rate: Optional[float] = None,
+        burst: int = 1,
+        retry: Optional[RetryPolicy] = None,
+        concurrency: int = 32,
+        encoder: Optional[Encoder] = None,
+        max_payload_size: Optional[int] = MAX_PAYLOAD_SIZE,
+        split_oversized: bool = False,
+        observer: Optional[Observer] = None,
+    ) -> None:
+        """Construct a broadcaster.
+
+        Args:
+            urls: Teams webhook URLs to send every card to. Repeated URLs are sent to
+                once.
+            pool: Optional ``AsyncConnectionPool`` to borrow HTTP clients from. If not
+                given, the broadcaster creates its own, and closes it in ``close``.
+            rate: Optional sustained number of requests per second allowed to each URL.
+                Every URL gets its own ``RateLimiter``, so each channel is paced
+                separately. No limit if ``None``.
+            burst: Maximum number of requests sent back-to-back to a URL after a period
+                of inactivity, with `rate`. Default: ``1``
+            retry: Optional ``RetryPolicy`` used to retry posts that fail with rate
+                limiting or transient network errors.
+            concurrency: Maximum number of posts in flight at the same time, across all
+                channels. Default: ``32``
+            encoder: Optional function used to encode cards as JSON bytes. Defaults to
+                the fastest encoder installed; see ``msteams_webhooks.encoders``.
+            max_payload_size: Maximum size in bytes of an encoded message. ``None``
+                disables the check. Default: ``MAX_PAYLOAD_SIZE`` (28 KB)
+            split_oversized: If true, split an ``AdaptiveCard`` that is larger than
+                `max_payload_size` into continuation cards that are sent in order.
+                Default: ``False``
+            observer: Optional ``Observer``, such as a ``MetricsCollector``, told the
+                size, latency and outcome of each request to each channel.
+
+        Returns:
+            None.
+
+        Raises:
+            ValueError: if `concurrency` is less than one, or `rate` or `burst` is
+                invalid.
+        """
+        # Imported here, since the webhook classes are defined in the package itself.
+        from msteams_webhooks import AsyncTeamsWebhook  # noqa: PLC0415
+
+        if concurrency < 1:
+            raise ValueError("`concurrency` must be at least 1.")  # noqa: TRY003
+        self.concurrency = concurrency
+        self.encoder = encoder or default_encoder()
+        self.max_payload_size = max_payload_size
+        self.split_oversized = split_oversized
+        self.pool = pool if pool is not None else AsyncConnectionPool()
+        self._owns_pool = pool is None
+        self.channels: dict[str, AsyncTeamsWebhook] = {
+            url: AsyncTeamsWebhook(
+                url,
+                pool=self.pool,
+                rate_limiter=RateLimiter(rate, burst=burst) if rate is not None else None,
+                retry=retry,
+                encoder=self.encoder,
+                max_payload_size=max_payload_size,
+                observer=observer,
+            )
+            for url in dict.fromkeys(urls)
+        }
+
+    def __len__(self) -> int:
+        """Number of channels broadcast to."""
+        return len(self.channels)
+
+    async def __aenter__(self) -> "Broadcaster":
+        """Use the broadcaster as an async context manager, closing it on exit."""
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Close the broadcaster."""
+        await self.close()
+
+    async def broadcast(self, card: Card) -> dict[str, SendResult]:
+        """Sends a card to every channel.
+
+        Args:
+            card: The ``Card`` to send.
+
+        Returns:
+            A ``SendResult`` for each channel, by URL, in the order the URLs were given.
+
+        Raises:
+            TeamsPayloadTooLargeError: if the encoded card is larger than
+                `max_payload_size` and cannot be split. Nothing is sent.
+        """
+        contents = encode_card(
+            card,
+            encoder=self.encoder,
+            max_size=self.max_payload_size,
+            split=self.split_oversized,
+        )
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = {url: SendResult(card) for url in self.channels}
+
+        async def send(url: str, channel: "AsyncTeamsWebhook") -> None:
+            async with semaphore:
+                try:
+                    # Every channel posts the same encoded messages.
+                    results[url].response = await channel.send_encoded(contents, card)
+                except Exception as exc:
+                    results[url].exception = exc
+
+        await asyncio.gather(*(send(url, channel) for url, channel in self.channels.items()))
+        return results
+
+    async def close(self) -> None:
+        """Release the HTTP clients.
+
+        A pool passed to the broadcaster is left open for other users.
+
+        Returns:
+            None.
+        """
+        if self._owns_pool:
+            await self.pool.close()
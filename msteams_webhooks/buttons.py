@@ -1,16 +1,26 @@
 """Buttons are interactive elements available to use in Hero Cards."""
-from typing import Any, Optional
+from typing import Optional
 
-from msteams_webhooks.base import Entity
+from msteams_webhooks.base import Entity, Field
 
 
 class Button(Entity):
     """Base button class."""
 
+    __slots__ = ()
+
 
 class OpenURLButton(Button):
     """Button that opens a URL when clicked or tapped."""
 
+    __slots__ = ("image", "title", "url")
+    _type = "openUrl"
+    _schema = (
+        Field("title", omit="never"),
+        Field("url", key="value", omit="never"),
+        Field("image"),
+    )
+
     def __init__(self, url: str, title: str, *, image: Optional[str] = None) -> None:
         """Open a URL.
 
@@ -28,10 +38,3 @@ class OpenURLButton(Button):
         self.title = title
         self.url = url
         self.image = image
-
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload: dict[str, Any] = {"type": "openUrl", "title": self.title, "value": self.url}
-        if self.image:
-            payload["image"] = self.image
-        return payload
@@ -2,11 +2,11 @@
 
 The type of card determines their format, and what elements may be included in them.
 """
-from typing import Any, Optional, Union
+from typing import Optional, Union
 
 from msteams_webhooks import types
 from msteams_webhooks.actions import Action
-from msteams_webhooks.base import Entity
+from msteams_webhooks.base import Entity, Field
 from msteams_webhooks.buttons import Button
 from msteams_webhooks.containers import CardContainer, ReceiptFact, ReceiptItem
 from msteams_webhooks.elements import CardElement
@@ -15,6 +15,8 @@ from msteams_webhooks.elements import CardElement
 class Card(Entity):
     """Base card class."""
 
+    __slots__ = ()
+
 
 class AdaptiveCard(Card):
     """Adaptive Cards are the most flexible type of card.
@@ -25,6 +27,34 @@ class AdaptiveCard(Card):
     Schema Explorer: https://adaptivecards.io/explorer/AdaptiveCard.html
     """
 
+    __slots__ = (
+        "actions",
+        "background_image",
+        "body",
+        "lang",
+        "min_height",
+        "rtl",
+        "schema",
+        "speak",
+        "version",
+        "vertical_content_alignment",
+    )
+    _content_type = "application/vnd.microsoft.card.adaptive"
+    _type = "AdaptiveCard"
+    _schema = (
+        Field("schema", key="$schema", omit="never"),
+        Field("_type", key="type", omit="never"),
+        Field("version", omit="never"),
+        Field("body", kind="entities"),
+        Field("actions", kind="entities"),
+        Field("background_image"),
+        Field("min_height"),
+        Field("rtl", omit="none"),
+        Field("speak"),
+        Field("lang"),
+        Field("vertical_content_alignment"),
+    )
+
     def __init__(
         self,
         *,
@@ -79,34 +109,6 @@ class AdaptiveCard(Card):
         self.vertical_content_alignment = vertical_content_alignment
         self.schema = schema or "http://adaptivecards.io/schemas/adaptive-card.json"
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload = {
-            "contentType": "application/vnd.microsoft.card.adaptive",
-            "content": {
-                "$schema": self.schema,
-                "type": "AdaptiveCard",
-                "version": self.version,
-            },
-        }
-        if self.body:
-            payload["content"]["body"] = [x.serialize() for x in self.body]
-        if self.actions:
-            payload["content"]["actions"] = [x.serialize() for x in self.actions]
-        if self.background_image:
-            payload["content"]["backgroundImage"] = self.background_image
-        if self.min_height:
-            payload["content"]["minHeight"] = self.min_height
-        if self.rtl is not None:
-            payload["content"]["rtl"] = self.rtl
-        if self.speak:
-            payload["content"]["speak"] = self.speak
-        if self.lang:
-            payload["content"]["lang"] = self.lang
-        if self.vertical_content_alignment:
-            payload["content"]["verticalContentAlignment"] = self.vertical_content_alignment
-        return payload
-
 
 class HeroCard(Card):
     """Hero Card.
@@ -114,6 +116,16 @@ class HeroCard(Card):
     A card that typically contains a single large image, one or more buttons, and text.
     """
 
+    __slots__ = ("buttons", "images", "subtitle", "text", "title")
+    _content_type = "application/vnd.microsoft.card.hero"
+    _schema = (
+        Field("title", omit="never"),
+        Field("text", omit="never"),
+        Field("subtitle"),
+        Field("images", kind="urls"),
+        Field("buttons", kind="entities"),
+    )
+
     def __init__(
         self,
         title: str,
@@ -144,26 +156,21 @@ class HeroCard(Card):
         self.images = images
         self.buttons = buttons
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload: dict[str, Any] = {
-            "contentType": "application/vnd.microsoft.card.hero",
-            "content": {},
-        }
-        payload["content"]["title"] = self.title
-        payload["content"]["text"] = self.text
-        if self.subtitle:
-            payload["content"]["subtitle"] = self.subtitle
-        if self.images:
-            payload["content"]["images"] = [{"url": img} for img in self.images]
-        if self.buttons:
-            payload["content"]["buttons"] = [x.serialize() for x in self.buttons]
-        return payload
-
 
 class ReceiptCard(Card):
     """Provides a summary of purchased items."""
 
+    __slots__ = ("buttons", "facts", "items", "tax", "title", "total")
+    _content_type = "application/vnd.microsoft.card.receipt"
+    _schema = (
+        Field("title", omit="never"),
+        Field("total", omit="never"),
+        Field("items", omit="never", kind="entities"),
+        Field("facts", kind="entities"),
+        Field("tax"),
+        Field("buttons", kind="entities"),
+    )
+
     def __init__(
         self,
         title: str,
@@ -196,22 +203,3 @@ class ReceiptCard(Card):
         self.tax = tax
         self.facts = facts
         self.buttons = buttons
-
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload: dict[str, Any] = {
-            "contentType": "application/vnd.microsoft.card.receipt",
-        }
-        content = {
-            "title": self.title,
-            "total": self.total,
-            "items": [x.serialize() for x in self.items],
-        }
-        if self.facts:
-            content["facts"] = [x.serialize() for x in self.facts]
-        if self.tax:
-            content["tax"] = self.tax
-        if self.buttons:
-            content["buttons"] = [x.serialize() for x in self.buttons]
-        payload["content"] = content
-        return payload
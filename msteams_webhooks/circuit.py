@@ -0,0 +1,248 @@
+"""Circuit breaking for webhook requests.
+
+When a webhook has been deleted, or Teams is degraded, every request fails, often only
+after waiting out the full timeout. A ``CircuitBreaker`` notices a run of failures and
+"opens", so that further sends fail immediately with ``TeamsCircuitOpenError`` instead of
+holding up the caller. After a while it lets a single probe request through: if that
+succeeds, the circuit closes and sends resume, otherwise it stays open for another
+interval.
+"""
+import threading
+import time
+from collections.abc import Awaitable
+from typing import Callable, Optional, TypeVar
+
+import httpx
+
+from msteams_webhooks import types
+from msteams_webhooks.exceptions import (
+    TeamsCircuitOpenError,
+    TeamsRateLimitError,
+    TeamsResponseError,
+)
+
+T = TypeVar("T")
+
+# Old and new state of a state change.
+_Change = tuple[types.CircuitStates, types.CircuitStates]
+
+DEFAULT_FAILURE_ON: tuple[type[BaseException], ...] = (
+    TeamsResponseError,
+    TeamsRateLimitError,
+    httpx.TransportError,
+)
+"""Errors counted as failures by default: error responses, rate limiting, timeouts and
+network errors. A malformed payload, which Teams rejects with ``400`` in the body of a 200
+response, is not counted, since it says nothing about the health of the webhook."""
+
+
+class CircuitBreaker:
+    """Circuit breaker with closed, open and half-open states.
+
+    * ``"closed"``: requests are sent. After ``failure_threshold`` consecutive failures,
+      the circuit opens.
+    * ``"open"``: requests fail immediately with ``TeamsCircuitOpenError``. After
+      ``reset_timeout`` seconds, the circuit becomes half-open.
+    * ``"half_open"``: up to ``probes`` requests are let through at once. If one
+      succeeds, the circuit closes; if one fails, it opens again for another
+      ``reset_timeout`` seconds.
+
+    A circuit breaker is thread-safe, and may be shared by several ``TeamsWebhook`` and
+    ``AsyncTeamsWebhook`` instances that post to the same URL.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        probes: int = 1,
+        failure_on: tuple[type[BaseException], ...] = DEFAULT_FAILURE_ON,
+        on_state_change: Optional[Callable[[str, str], None]] = None,
+    ) -> None:
+        """Construct a circuit breaker.
+
+        Args:
+            failure_threshold: Number of consecutive failures that opens the circuit.
+                Default: ``5``
+            reset_timeout: Time in seconds the circuit stays open before a probe request
+                is let through. Default: ``30.0``
+            probes: Maximum number of probe requests in flight while the circuit is
+                half-open. Default: ``1``
+            failure_on: Exception types counted as failures. Any other exception is
+                raised without affecting the circuit. Default: ``DEFAULT_FAILURE_ON``
+            on_state_change: Optional function called with the old and new state
+                whenever the circuit changes state, e.g. to log or alert on it.
+
+        Returns:
+            None.
+
+        Raises:
+            ValueError: if `failure_threshold` or `probes` is less than one, or
+                `reset_timeout` is not positive.
+        """
+        if failure_threshold < 1:
+            raise ValueError("`failure_threshold` must be at least 1.")  # noqa: TRY003
+        if reset_timeout <= 0:
+            raise ValueError("`reset_timeout` must be greater than zero.")  # noqa: TRY003
+        if probes < 1:
+            raise ValueError("`probes` must be at least 1.")  # noqa: TRY003
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probes = probes
+        self.failure_on = failure_on
+        self.on_state_change = on_state_change
+        self._state: types.CircuitStates = "closed"
+        self._failures = 0
+        self._opened = 0.0
+        self._probing = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> types.CircuitStates:
+        """Current state: ``"closed"``, ``"open"`` or ``"half_open"``."""
+        with self._lock:
+            changes = self._expire()
+        self._notify(changes)
+        return self._state
+
+    def _expire(self) -> list[_Change]:
+        """Half-open the circuit if it has been open long enough. Must hold the lock."""
+        if self._state == "open" and time.monotonic() - self._opened >= self.reset_timeout:
+            return self._change("half_open")
+        return []
+
+    def _change(self, state: types.CircuitStates) -> list[_Change]:
+        """Change state. Must hold the lock.
+
+        Returns:
+            The change made, to pass to ``_notify`` once the lock is released.
+        """
+        old, self._state = self._state, state
+        if state == "open":
+            self._opened = time.monotonic()
+        self._probing = 0
+        return [(old, state)]
+
+    def _notify(self, changes: list[_Change]) -> None:
+        """Call the state change hook for each change made."""
+        if self.on_state_change is not None:
+            for old, new in changes:
+                self.on_state_change(old, new)
+
+    def before_call(self) -> None:
+        """Check that a request may be sent, and register it as in flight.
+
+        Every call must be followed by ``record_success`` or ``record_failure``.
+
+        Returns:
+            None.
+
+        Raises:
+            TeamsCircuitOpenError: if the circuit is open, or half-open with the maximum
+                number of probes already in flight.
+        """
+        with self._lock:
+            changes = self._expire()
+            allowed = self._state == "closed" or (
+                self._state == "half_open" and self._probing < self.probes
+            )
+            if allowed and self._state == "half_open":
+                self._probing += 1
+            retry_after = max(0.0, self._opened + self.reset_timeout - time.monotonic())
+        self._notify(changes)
+        if not allowed:
+            raise TeamsCircuitOpenError(retry_after)
+
+    def record_success(self) -> None:
+        """Record a successful request, closing the circuit if it was half-open.
+
+        Returns:
+            None.
+        """
+        changes: list[_Change] = []
+        with self._lock:
+            self._failures = 0
+            if self._state == "half_open":
+                changes = self._change("closed")
+        self._notify(changes)
+
+    def record_failure(self, exc: BaseException) -> None:
+        """Record a failed request, opening the circuit if there have been too many.
+
+        Args:
+            exc: The exception raised by the request. Ignored unless it is one of
+                `failure_on`, except that a probe in flight is released.
+
+        Returns:
+            None.
+        """
+        changes: list[_Change] = []
+        with self._lock:
+            if not isinstance(exc, self.failure_on):
+                if self._state == "half_open":
+                    self._probing = max(0, self._probing - 1)
+            elif self._state == "half_open":
+                changes = self._change("open")
+            else:
+                self._failures += 1
+                if self._state == "closed" and self._failures >= self.failure_threshold:
+                    changes = self._change("open")
+        self._notify(changes)
+
+    def reset(self) -> None:
+        """Close the circuit and forget past failures.
+
+        Returns:
+            None.
+        """
+        changes: list[_Change] = []
+        with self._lock:
+            self._failures = 0
+            if self._state != "closed":
+                changes = self._change("closed")
+        self._notify(changes)
+
+    def call(self, func: Callable[[], T]) -> T:
+        """Call `func` through the circuit breaker.
+
+        Args:
+            func: Zero-argument callable that sends a request.
+
+        Returns:
+            The return value of `func`.
+
+        Raises:
+            TeamsCircuitOpenError: if the circuit is open.
+            Exception: any exception raised by `func`.
+        """
+        self.before_call()
+        try:
+            result = func()
+        except BaseException as exc:
+            self.record_failure(exc)
+            raise
+        self.record_success()
+        return result
+
+    async def call_async(self, func: Callable[[], Awaitable[T]]) -> T:
+        """Await `func` through the circuit breaker.
+
+        Args:
+            func: Zero-argument callable returning an awaitable that sends a request.
+
+        Returns:
+            The result of `func`.
+
+        Raises:
+            TeamsCircuitOpenError: if the circuit is open.
+            Exception: any exception raised by `func`.
+        """
+        self.before_call()
+        try:
+            result = await func()
+        except BaseException as exc:
+            self.record_failure(exc)
+            raise
+        self.record_success()
+        return result
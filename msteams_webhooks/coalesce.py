@@ -0,0 +1,348 @@
+"""Coalescing of message bursts into digest cards.
+
+When many alerts fire at once, sending each one as its own message quickly gets a webhook
+throttled. A ``MessageCoalescer`` collects messages for a short window instead, then sends
+them all as a single digest ``AdaptiveCard`` that lists them in a ``FactSet`` or a
+``ColumnarTable``. A digest larger than the webhook's ``max_payload_size`` is split into
+continuation cards, so a burst of hundreds of messages costs only a handful of requests.
+"""
+import asyncio
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from msteams_webhooks import types
+from msteams_webhooks.cards import AdaptiveCard, Card
+from msteams_webhooks.containers import ColumnarTable, Fact, FactSet
+from msteams_webhooks.elements import TextBlock
+from msteams_webhooks.encoders import Encoder
+from msteams_webhooks.sizing import split_card
+
+if TYPE_CHECKING:
+    from msteams_webhooks import AsyncTeamsWebhook, TeamsWebhook
+
+# A collected message: its title, e.g. the time it was collected, and its text.
+_Entry = tuple[str, str]
+
+
+def digest_card(
+    entries: list[tuple[str, str]],
+    *,
+    heading: str = "{count} messages",
+    layout: types.DigestLayouts = "facts",
+) -> AdaptiveCard:
+    """Build a card that lists several messages.
+
+    Args:
+        entries: The ``(title, text)`` of each message, in order.
+        heading: Text shown above the messages. ``{count}`` is replaced with the number of
+            messages. Default: ``"{count} messages"``
+        layout: ``"facts"`` lists the messages in a ``FactSet``, and ``"table"`` in a
+            two-column ``ColumnarTable``. Default: ``"facts"``
+
+    Returns:
+        The digest card.
+
+    Raises:
+        ValueError: if `layout` is not ``"facts"`` or ``"table"``.
+    """
+    title = TextBlock(heading.format(count=len(entries)), weight="bolder", wrap=True)
+    if layout == "facts":
+        summary: Any = FactSet(facts=[Fact(name, text) for name, text in entries])
+    elif layout == "table":
+        summary = ColumnarTable(entries, headers=["Time", "Message"], wrap=True)
+    else:
+        raise ValueError(f"Unknown digest layout: {layout!r}")  # noqa: TRY003
+    return AdaptiveCard(body=[title, summary])
+
+
+class _Collector:
+    """Collects messages and builds the cards to send for them."""
+
+    def __init__(
+        self,
+        *,
+        window: float,
+        max_messages: int,
+        heading: str,
+        layout: types.DigestLayouts,
+    ) -> None:
+        if window <= 0:
+            raise ValueError("`window` must be greater than zero.")  # noqa: TRY003
+        if max_messages < 1:
+            raise ValueError("`max_messages` must be at least 1.")  # noqa: TRY003
+        if layout not in ("facts", "table"):
+            raise ValueError(f"Unknown digest layout: {layout!r}")  # noqa: TRY003
+        self.window = window
+        self.max_messages = max_messages
+        self.heading = heading
+        self.layout: types.DigestLayouts = layout
+        self._entries: list[_Entry] = []
+
+    def __len__(self) -> int:
+        """Number of messages waiting to be sent."""
+        return len(self._entries)
+
+    @staticmethod
+    def _entry(text: str, title: Optional[str]) -> _Entry:
+        return (time.strftime("%H:%M:%S") if title is None else title, text)
+
+    def _cards(
+        self,
+        entries: list[_Entry],
+        max_size: Optional[int],
+        encoder: Encoder,
+    ) -> list[Card]:
+        """Build the cards for a batch of messages, split to fit within `max_size`."""
+        if len(entries) == 1:
+            card = AdaptiveCard(body=[TextBlock(entries[0][1], wrap=True)])
+        else:
+            card = digest_card(entries, heading=self.heading, layout=self.layout)
+        if max_size is None:
+            return [card]
+        return split_card(card, max_size, encoder=encoder)
+
+
+def _counts(cards: list[Card], entries: list[_Entry]) -> list[int]:
+    """Number of the collected messages listed on each of the cards built for them."""
+    if len(entries) == 1:
+        return [1]
+    counts = []
+    for card in cards:
+        count = 0
+        for element in getattr(card, "body", ()):
+            if isinstance(element, FactSet):
+                count += len(element.facts)
+            elif isinstance(element, ColumnarTable):
+                count += len(element.rows)
+        counts.append(count)
+    return counts
+
+
+class MessageCoalescer(_Collector):
+    """Collects messages for a ``TeamsWebhook`` and sends them as digest cards.
+
+    The first message collected opens a window of ``window`` seconds. When the window
+    closes, or as soon as ``max_messages`` messages have been collected, the messages are
+    sent as a single digest card from a background timer thread. A lone message is sent
+    as a plain text card instead. If sending fails, the messages not sent yet are kept,
+    and sent with the next digest. Exceptions raised by sends from the timer thread are
+    reported through ``threading.excepthook``; use the webhook's ``DispatchQueue`` to
+    collect them as futures instead.
+
+    A coalescer is thread-safe.
+    """
+
+    def __init__(
+        self,
+        webhook: "TeamsWebhook",
+        *,
+        window: float = 60.0,
+        max_messages: int = 100,
+        heading: str = "{count} messages",
+        layout: types.DigestLayouts = "facts",
+        priority: types.Priorities = "normal",
+    ) -> None:
+        """Construct a coalescer.
+
+        Args:
+            webhook: The webhook to send digests to.
+            window: Time in seconds to collect messages for, from the first message
+                collected. Default: ``60.0``
+            max_messages: Number of messages that triggers sending a digest before the
+                window closes. Default: ``100``
+            heading: Text shown above the messages. ``{count}`` is replaced with the
+                number of messages. Default: ``"{count} messages"``
+            layout: ``"facts"`` lists the messages in a ``FactSet``, and ``"table"`` in a
+                two-column ``ColumnarTable``. Default: ``"facts"``
+            priority: Priority to send digests with, if the webhook has a
+                ``DispatchQueue``. Use ``"low"`` for routine messages, so that they are
+                the first to be dropped when the queue is full. Default: ``"normal"``
+
+        Returns:
+            None.
+
+        Raises:
+            ValueError: if `window` is not positive, `max_messages` is less than one, or
+                `layout` is unknown.
+        """
+        super().__init__(window=window, max_messages=max_messages, heading=heading, layout=layout)
+        self.webhook = webhook
+        self.priority: types.Priorities = priority
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def send_message(self, text: str, *, title: Optional[str] = None) -> None:
+        """Collect a message to send in the next digest.
+
+        Args:
+            text: Text of the message.
+            title: Title to list the message under. Default: the current local time.
+
+        Returns:
+            None.
+
+        Raises:
+            TeamsPayloadTooLargeError: if this message fills the batch, and the digest
+                cannot be split to fit within the webhook's ``max_payload_size``.
+        """
+        with self._lock:
+            self._entries.append(self._entry(text, title))
+            full = len(self._entries) >= self.max_messages
+            if not full and self._timer is None:
+                self._start_timer()
+        if full:
+            self.flush()
+
+    def _start_timer(self) -> None:
+        """Start the timer that closes the window. Must hold the lock."""
+        self._timer = threading.Timer(self.window, self.flush)
+        self._timer.name = "msteams-webhooks-coalesce"
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self) -> None:
+        """Send the messages collected so far, without waiting for the window to close.
+
+        Returns:
+            None.
+
+        Raises:
+            TeamsPayloadTooLargeError: if the digest cannot be split to fit within the
+                webhook's ``max_payload_size``.
+            TeamsWebhookError: if sending fails. The messages not sent are kept, and sent
+                with the next digest.
+        """
+        with self._lock:
+            entries, self._entries = self._entries, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not entries:
+            return
+        cards = self._cards(entries, self.webhook.max_payload_size, self.webhook.encoder)
+        sent = 0
+        try:
+            for card, count in zip(cards, _counts(cards, entries)):
+                self.webhook.send_card(card, priority=self.priority)
+                sent += count
+        except Exception:
+            with self._lock:
+                self._entries[:0] = entries[sent:]
+                if self._timer is None:
+                    self._start_timer()
+            raise
+
+    def close(self) -> None:
+        """Send any messages collected so far, and stop the timer.
+
+        Returns:
+            None.
+        """
+        self.flush()
+
+
+class AsyncMessageCoalescer(_Collector):
+    """Collects messages for an ``AsyncTeamsWebhook`` and sends them as digest cards.
+
+    Works like ``MessageCoalescer``, with the window timed by a task on the running event
+    loop. Exceptions raised by sends from that task are reported through the loop's
+    exception handler.
+    """
+
+    def __init__(
+        self,
+        webhook: "AsyncTeamsWebhook",
+        *,
+        window: float = 60.0,
+        max_messages: int = 100,
+        heading: str = "{count} messages",
+        layout: types.DigestLayouts = "facts",
+    ) -> None:
+        """Construct a coalescer.
+
+        Args:
+            webhook: The webhook to send digests to.
+            window: Time in seconds to collect messages for, from the first message
+                collected. Default: ``60.0``
+            max_messages: Number of messages that triggers sending a digest before the
+                window closes. Default: ``100``
+            heading: Text shown above the messages. ``{count}`` is replaced with the
+                number of messages. Default: ``"{count} messages"``
+            layout: ``"facts"`` lists the messages in a ``FactSet``, and ``"table"`` in a
+                two-column ``ColumnarTable``. Default: ``"facts"``
+
+        Returns:
+            None.
+
+        Raises:
+            ValueError: if `window` is not positive, `max_messages` is less than one, or
+                `layout` is unknown.
+        """
+        super().__init__(window=window, max_messages=max_messages, heading=heading, layout=layout)
+        self.webhook = webhook
+        self._timer: Optional[asyncio.Task[None]] = None
+
+    async def send_message(self, text: str, *, title: Optional[str] = None) -> None:
+        """Collect a message to send in the next digest.
+
+        Args:
+            text: Text of the message.
+            title: Title to list the message under. Default: the current local time.
+
+        Returns:
+            None.
+
+        Raises:
+            TeamsPayloadTooLargeError: if this message fills the batch, and the digest
+                cannot be split to fit within the webhook's ``max_payload_size``.
+        """
+        self._entries.append(self._entry(text, title))
+        if len(self._entries) >= self.max_messages:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        """Send the messages collected once the window closes."""
+        await asyncio.sleep(self.window)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Send the messages collected so far, without waiting for the window to close.
+
+        Returns:
+            None.
+
+        Raises:
+            TeamsPayloadTooLargeError: if the digest cannot be split to fit within the
+                webhook's ``max_payload_size``.
+            TeamsWebhookError: if sending fails. The messages not sent are kept, and sent
+                with the next digest.
+        """
+        entries, self._entries = self._entries, []
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        if not entries:
+            return
+        cards = self._cards(entries, self.webhook.max_payload_size, self.webhook.encoder)
+        sent = 0
+        try:
+            for card, count in zip(cards, _counts(cards, entries)):
+                await self.webhook.send_card(card)
+                sent += count
+        except Exception:
+            self._entries[:0] = entries[sent:]
+            if self._timer is None:
+                self._timer = asyncio.create_task(self._flush_later())
+            raise
+
+    async def close(self) -> None:
+        """Send any messages collected so far, and stop the timer.
+
+        Returns:
+            None.
+        """
+        await self.flush()
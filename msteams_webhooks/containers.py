@@ -1,15 +1,19 @@
 """Containers provide ways to organize and format elements within cards."""
-from typing import Any, Optional, Union
+import csv
+from collections.abc import Iterable, Mapping, Sequence
+from typing import IO, Any, Optional, Union
 
 from msteams_webhooks import types
 from msteams_webhooks.actions import Action
-from msteams_webhooks.base import Entity
+from msteams_webhooks.base import Entity, Field
 from msteams_webhooks.elements import CardElement, Image
 
 
 class CardContainer(Entity):
     """Base container class."""
 
+    __slots__ = ()
+
 
 class ActionSet(CardContainer):
     """Action sets.
@@ -17,6 +21,10 @@ class ActionSet(CardContainer):
     Schema Explorer: https://adaptivecards.io/explorer/ActionSet.html
     """
 
+    __slots__ = ("actions",)
+    _type = "ActionSet"
+    _schema = (Field("actions", omit="never", kind="entities"),)
+
     def __init__(self, actions: list[Action]) -> None:
         """Displays a set of actions.
 
@@ -31,10 +39,6 @@ class ActionSet(CardContainer):
         """
         self.actions = actions
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        return {"type": "ActionSet", "actions": [x.serialize() for x in self.actions]}
-
 
 class Container(CardContainer):
     """Generic container, which may contain any other container or element.
@@ -42,6 +46,28 @@ class Container(CardContainer):
     Schema Explorer: https://adaptivecards.io/explorer/Container.html
     """
 
+    __slots__ = (
+        "background_image",
+        "bleed",
+        "items",
+        "min_height",
+        "rtl",
+        "select_action",
+        "style",
+        "vertical_content_alignment",
+    )
+    _type = "Container"
+    _schema = (
+        Field("items", omit="never", kind="entities"),
+        Field("select_action", kind="entity"),
+        Field("style"),
+        Field("vertical_content_alignment"),
+        Field("bleed", omit="none"),
+        Field("background_image"),
+        Field("min_height"),
+        Field("rtl", omit="none"),
+    )
+
     def __init__(
         self,
         items: list[Union[CardElement, CardContainer]],
@@ -91,28 +117,6 @@ class Container(CardContainer):
         self.min_height = min_height
         self.rtl = rtl
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload = {
-            "type": "Container",
-            "items": [x.serialize() for x in self.items],
-        }
-        if self.select_action:
-            payload["selectAction"] = self.select_action.serialize()
-        if self.style:
-            payload["style"] = self.style
-        if self.vertical_content_alignment:
-            payload["verticalContentAlignment"] = self.vertical_content_alignment
-        if self.bleed is not None:
-            payload["bleed"] = self.bleed
-        if self.background_image:
-            payload["backgroundImage"] = self.background_image
-        if self.min_height:
-            payload["minHeight"] = self.min_height
-        if self.rtl is not None:
-            payload["rtl"] = self.rtl
-        return payload
-
 
 class Column(CardContainer):
     """A single column, as an lement of a ``ColumnSet``, or a column in a ``Table``.
@@ -120,6 +124,34 @@ class Column(CardContainer):
     Schema explorer: https://adaptivecards.io/explorer/Column.html
     """
 
+    __slots__ = (
+        "background_image",
+        "bleed",
+        "items",
+        "min_height",
+        "rtl",
+        "select_action",
+        "separator",
+        "spacing",
+        "style",
+        "vertical_content_alignment",
+        "width",
+    )
+    _type = "Column"
+    _schema = (
+        Field("items", kind="entities"),
+        Field("background_image"),
+        Field("bleed", omit="none"),
+        Field("min_height"),
+        Field("rtl", omit="none"),
+        Field("separator", omit="none"),
+        Field("spacing"),
+        Field("select_action", kind="entity"),
+        Field("style"),
+        Field("vertical_content_alignment"),
+        Field("width"),
+    )
+
     def __init__(
         self,
         items: Optional[list[CardElement]] = None,
@@ -177,33 +209,6 @@ class Column(CardContainer):
         self.vertical_content_alignment = vertical_content_alignment
         self.width = width
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload: dict[str, Any] = {"type": "Column"}
-        if self.items:
-            payload["items"] = [x.serialize() for x in self.items]
-        if self.background_image:
-            payload["backgroundImage"] = self.background_image
-        if self.bleed is not None:
-            payload["bleed"] = self.bleed
-        if self.min_height:
-            payload["minHeight"] = self.min_height
-        if self.rtl is not None:
-            payload["rtl"] = self.rtl
-        if self.separator is not None:
-            payload["separator"] = self.separator
-        if self.spacing:
-            payload["spacing"] = self.spacing
-        if self.select_action:
-            payload["selectAction"] = self.select_action.serialize()
-        if self.style:
-            payload["style"] = self.style
-        if self.vertical_content_alignment:
-            payload["verticalContentAlignment"] = self.vertical_content_alignment
-        if self.width:
-            payload["width"] = self.width
-        return payload
-
 
 class ColumnSet(CardContainer):
     """Grouping of columns.
@@ -211,6 +216,17 @@ class ColumnSet(CardContainer):
     Schema Explorer: https://adaptivecards.io/explorer/ColumnSet.html
     """
 
+    __slots__ = ("bleed", "columns", "horizontal_alignment", "min_height", "select_action", "style")
+    _type = "ColumnSet"
+    _schema = (
+        Field("columns", kind="entities"),
+        Field("select_action", kind="entity"),
+        Field("style"),
+        Field("bleed", omit="none"),
+        Field("min_height"),
+        Field("horizontal_alignment"),
+    )
+
     def __init__(
         self,
         columns: Optional[list[Column]] = None,
@@ -246,23 +262,6 @@ class ColumnSet(CardContainer):
         self.min_height = min_height
         self.horizontal_alignment = horizontal_alignment
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload: dict[str, Any] = {"type": "ColumnSet"}
-        if self.columns:
-            payload["columns"] = [x.serialize() for x in self.columns]
-        if self.select_action:
-            payload["selectAction"] = self.select_action.serialize()
-        if self.style:
-            payload["style"] = self.style
-        if self.bleed is not None:
-            payload["bleed"] = self.bleed
-        if self.min_height:
-            payload["minHeight"] = self.min_height
-        if self.horizontal_alignment:
-            payload["horizontalAlignment"] = self.horizontal_alignment
-        return payload
-
 
 class Fact(CardContainer):
     """Facts organize key/value pairs into an organized list.
@@ -270,6 +269,9 @@ class Fact(CardContainer):
     Schema Explorer: https://adaptivecards.io/explorer/Fact.html
     """
 
+    __slots__ = ("title", "value")
+    _schema = (Field("title", omit="never"), Field("value", omit="never"))
+
     def __init__(self, title: str, value: str) -> None:
         """Describes a Fact in a FactSet as a key/value pair.
 
@@ -286,10 +288,6 @@ class Fact(CardContainer):
         self.title = title
         self.value = value
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        return {"title": self.title, "value": self.value}
-
 
 class FactSet(CardContainer):
     """A group of ``Fact`` containers.
@@ -297,6 +295,10 @@ class FactSet(CardContainer):
     Schema Explorer: https://adaptivecards.io/explorer/FactSet.html
     """
 
+    __slots__ = ("facts",)
+    _type = "FactSet"
+    _schema = (Field("facts", omit="never", kind="entities"),)
+
     def __init__(self, facts: list[Fact]) -> None:
         """Displays a series of facts (i.e. name/value pairs) in a tabular form.
 
@@ -311,13 +313,6 @@ class FactSet(CardContainer):
         """
         self.facts = facts
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        return {
-            "type": "FactSet",
-            "facts": [x.serialize() for x in self.facts],
-        }
-
 
 class ImageSet(CardContainer):
     """A collection of images.
@@ -325,6 +320,10 @@ class ImageSet(CardContainer):
     Schema Explorer: https://adaptivecards.io/explorer/ImageSet.html
     """
 
+    __slots__ = ("image_size", "images")
+    _type = "ImageSet"
+    _schema = (Field("images", omit="never", kind="entities"), Field("image_size"))
+
     def __init__(
         self,
         images: list[Image],
@@ -350,20 +349,13 @@ class ImageSet(CardContainer):
         self.images = images
         self.image_size = image_size
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload = {
-            "type": "ImageSet",
-            "images": [x.serialize() for x in self.images],
-        }
-        if self.image_size:
-            payload["imageSize"] = self.image_size
-        return payload
-
 
 class ReceiptFact(CardContainer):
     """A key/value pair for use with a Receipt Card."""
 
+    __slots__ = ("key", "value")
+    _schema = (Field("key", omit="never"), Field("value", omit="never"))
+
     def __init__(self, key: str, value: str) -> None:
         """Create a fact to include in a Receipt Card.
 
@@ -380,14 +372,18 @@ class ReceiptFact(CardContainer):
         self.key = key
         self.value = value
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        return {"key": self.key, "value": self.value}
-
 
 class ReceiptItem(CardContainer):
     """Item for a Receipt Card."""
 
+    __slots__ = ("image", "price", "quantity", "title")
+    _schema = (
+        Field("title", omit="never"),
+        Field("price", omit="never"),
+        Field("quantity", omit="never", kind="str"),
+        Field("image", kind="url"),
+    )
+
     def __init__(
         self,
         title: str,
@@ -415,17 +411,6 @@ class ReceiptItem(CardContainer):
         self.quantity = quantity
         self.image = image
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload: dict[str, Any] = {
-            "title": self.title,
-            "price": self.price,
-            "quantity": str(self.quantity),
-        }
-        if self.image:
-            payload["image"] = {"url": self.image}
-        return payload
-
 
 class TableCell(CardContainer):
     """Single cell of a ``Table`` container.
@@ -433,6 +418,28 @@ class TableCell(CardContainer):
     Schema Explorer: https://adaptivecards.io/explorer/TableCell.html
     """
 
+    __slots__ = (
+        "background_image",
+        "bleed",
+        "items",
+        "min_height",
+        "rtl",
+        "select_action",
+        "style",
+        "vertical_content_alignment",
+    )
+    _type = "TableCell"
+    _schema = (
+        Field("items", omit="never", kind="entities"),
+        Field("select_action", kind="entity"),
+        Field("style"),
+        Field("vertical_content_alignment"),
+        Field("bleed", omit="none"),
+        Field("background_image"),
+        Field("min_height"),
+        Field("rtl", omit="none"),
+    )
+
     def __init__(
         self,
         items: list[CardElement],
@@ -480,32 +487,14 @@ class TableCell(CardContainer):
         self.min_height = min_height
         self.rtl = rtl
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload = {
-            "type": "TableCell",
-            "items": [x.serialize() for x in self.items],
-        }
-        if self.select_action:
-            payload["selectAction"] = self.select_action.serialize()
-        if self.style:
-            payload["style"] = self.style
-        if self.vertical_content_alignment:
-            payload["verticalContentAlignment"] = self.vertical_content_alignment
-        if self.bleed is not None:
-            payload["bleed"] = self.bleed
-        if self.background_image:
-            payload["backgroundImage"] = self.background_image
-        if self.min_height:
-            payload["minHeight"] = self.min_height
-        if self.rtl is not None:
-            payload["rtl"] = self.rtl
-        return payload
-
 
 class TableRow(CardContainer):
     """Single row of a ``Table`` container."""
 
+    __slots__ = ("cells", "style")
+    _type = "TableRow"
+    _schema = (Field("cells", omit="never", kind="entities"), Field("style"))
+
     def __init__(
         self,
         cells: list[TableCell],
@@ -526,13 +515,6 @@ class TableRow(CardContainer):
         self.cells = cells
         self.style = style
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload = {"type": "TableRow", "cells": [x.serialize() for x in self.cells]}
-        if self.style:
-            payload["style"] = self.style
-        return payload
-
 
 class Table(CardContainer):
     """Container for displaying tabular data.
@@ -540,6 +522,26 @@ class Table(CardContainer):
     Schema Explorer: https://adaptivecards.io/explorer/Table.html
     """
 
+    __slots__ = (
+        "columns",
+        "first_row_as_headers",
+        "grid_style",
+        "horizontal_cell_content_alignment",
+        "rows",
+        "show_grid_lines",
+        "vertical_cell_content_alignment",
+    )
+    _type = "Table"
+    _schema = (
+        Field("columns", kind="entities"),
+        Field("rows", kind="entities"),
+        Field("first_row_as_headers", omit="none"),
+        Field("show_grid_lines", omit="none"),
+        Field("grid_style"),
+        Field("horizontal_cell_content_alignment"),
+        Field("vertical_cell_content_alignment"),
+    )
+
     def __init__(
         self,
         columns: Optional[list[Column]] = None,
@@ -575,15 +577,182 @@ class Table(CardContainer):
         self.horizontal_cell_content_alignment = horizontal_cell_content_alignment
         self.vertical_cell_content_alignment = vertical_cell_content_alignment
 
-    def serialize(self) -> dict[str, Any]:
+
+class ColumnarTable(CardContainer):
+    """Lightweight ``Table`` for large amounts of plain text data.
+
+    Serializes to the same JSON as a ``Table`` whose cells each hold a single
+    ``TextBlock``, but stores each row as a tuple of strings instead of building
+    ``TableRow``, ``TableCell`` and ``TextBlock`` objects for every cell. Oversized tables
+    are paginated by row like a ``Table``; see ``msteams_webhooks.sizing``.
+
+    Schema Explorer: https://adaptivecards.io/explorer/Table.html
+    """
+
+    __slots__ = (
+        "columns",
+        "grid_style",
+        "headers",
+        "horizontal_cell_content_alignment",
+        "rows",
+        "show_grid_lines",
+        "vertical_cell_content_alignment",
+        "wrap",
+    )
+
+    def __init__(
+        self,
+        rows: Iterable[Sequence[Any]],
+        *,
+        headers: Optional[Sequence[Any]] = None,
+        columns: Optional[list[Column]] = None,
+        wrap: Optional[bool] = None,
+        show_grid_lines: Optional[bool] = None,
+        grid_style: Optional[types.ContainerStyleTypes] = None,
+        horizontal_cell_content_alignment: Optional[types.HorizontalAlignmentTypes] = None,
+        vertical_cell_content_alignment: Optional[types.VerticalAlignmentTypes] = None,
+    ) -> None:
+        """Builds a table from rows of values.
+
+        Args:
+            rows: Iterable of rows, each a sequence of cell values, e.g. a list of tuples,
+                a ``csv.reader`` or a two-dimensional NumPy array. Values are converted
+                with ``str()``, and ``None`` becomes an empty cell.
+            headers: Optional header values, shown as the first row of the table and
+                announced as headers by accessibility software.
+            columns: List of ``Column`` elements to include. Defaults to one
+                equal-width column for each cell of the first row.
+            wrap: If true, allow cell text to wrap. Otherwise, text is clipped.
+            show_grid_lines: Specifies whether grid lines should be displayed.
+            grid_style: Defines the style of the grid. This property currently only controls the
+                grid's color.
+            horizontal_cell_content_alignment: Controls how the content of all cells is horizontally
+                aligned by default.
+            vertical_cell_content_alignment: Controls how the content of all cells is vertically
+                aligned by default.
+
+        Returns:
+            None.
+
+        Raises:
+            None.
+        """
+        tolist = getattr(rows, "tolist", None)
+        if tolist is not None:
+            # NumPy arrays convert to nested lists of Python scalars much faster than
+            # they can be iterated element by element.
+            rows = tolist()
+        self.rows = [_cells(row) for row in rows]
+        self.headers = None if headers is None else _cells(headers)
+        self.columns = columns
+        self.wrap = wrap
+        self.show_grid_lines = show_grid_lines
+        self.grid_style = grid_style
+        self.horizontal_cell_content_alignment = horizontal_cell_content_alignment
+        self.vertical_cell_content_alignment = vertical_cell_content_alignment
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Union[Mapping[Any, Sequence[Any]], Sequence[Sequence[Any]]],
+        **kwargs: Any,  # noqa: ANN401
+    ) -> "ColumnarTable":
+        """Builds a table from column arrays.
+
+        Args:
+            columns: Sequence of columns, each a sequence of cell values. If a mapping is
+                given, its keys are used as the table's headers.
+            **kwargs: Other arguments, as for ``ColumnarTable``.
+
+        Returns:
+            The new table.
+        """
+        if isinstance(columns, Mapping):
+            kwargs.setdefault("headers", list(columns))
+            columns = list(columns.values())
+        return cls(zip(*columns), **kwargs)
+
+    @classmethod
+    def from_csv(
+        cls,
+        file: Union[IO[str], Iterable[str]],
+        *,
+        header: bool = True,
+        dialect: Union[str, type[csv.Dialect]] = "excel",
+        **kwargs: Any,  # noqa: ANN401
+    ) -> "ColumnarTable":
+        """Builds a table from CSV data.
+
+        Args:
+            file: Open text file, or any other iterable of CSV lines.
+            header: If true, the first line holds the table's headers. Default: ``True``
+            dialect: ``csv`` dialect of the data. Default: ``"excel"``
+            **kwargs: Other arguments, as for ``ColumnarTable``.
+
+        Returns:
+            The new table.
+        """
+        reader = csv.reader(file, dialect)
+        if header:
+            kwargs.setdefault("headers", next(reader, None))
+        return cls(reader, **kwargs)
+
+    @classmethod
+    def from_dataframe(
+        cls,
+        frame: Any,  # noqa: ANN401
+        *,
+        index: bool = False,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> "ColumnarTable":
+        """Builds a table from a pandas ``DataFrame``.
+
+        Args:
+            frame: The data frame. Its column labels are used as the table's headers.
+            index: If true, include the frame's index as the first column. Default: ``False``
+            **kwargs: Other arguments, as for ``ColumnarTable``.
+
+        Returns:
+            The new table.
+        """
+        headers = list(frame.columns)
+        if index:
+            headers.insert(0, frame.index.name or "")
+        kwargs.setdefault("headers", headers)
+        return cls(frame.itertuples(index=index, name=None), **kwargs)
+
+    def serialize_row(self, row: Sequence[str]) -> dict[str, Any]:
+        """Serialize a single row of cell text into a ``TableRow`` data structure.
+
+        Args:
+            row: Text of each cell in the row.
+
+        Returns:
+            The row's data structure.
+        """
+        if self.wrap:
+            cells = [
+                {"type": "TableCell", "items": [{"type": "TextBlock", "text": x, "wrap": True}]}
+                for x in row
+            ]
+        else:
+            cells = [
+                {"type": "TableCell", "items": [{"type": "TextBlock", "text": x}]} for x in row
+            ]
+        return {"type": "TableRow", "cells": cells}
+
+    def _serialize(self) -> dict[str, Any]:
         """Serialize object into data structure."""
         payload: dict[str, Any] = {"type": "Table"}
+        rows = self.rows if self.headers is None else [self.headers, *self.rows]
         if self.columns:
             payload["columns"] = [x.serialize() for x in self.columns]
-        if self.rows:
-            payload["rows"] = [x.serialize() for x in self.rows]
-        if self.first_row_as_headers is not None:
-            payload["firstRowAsHeaders"] = self.first_row_as_headers
+        elif rows:
+            payload["columns"] = [{"type": "Column"} for _ in rows[0]]
+        if rows:
+            payload["rows"] = [self.serialize_row(row) for row in rows]
+        if self.headers is not None:
+            payload["firstRowAsHeaders"] = True
         if self.show_grid_lines is not None:
             payload["showGridLines"] = self.show_grid_lines
         if self.grid_style:
@@ -593,3 +762,8 @@ class Table(CardContainer):
         if self.vertical_cell_content_alignment:
             payload["verticalCellContentAlignment"] = self.vertical_cell_content_alignment
         return payload
+
+
+def _cells(row: Iterable[Any]) -> tuple[str, ...]:
+    """Convert a row of values into cell text."""
+    return tuple("" if value is None else str(value) for value in row)
@@ -0,0 +1,151 @@
+"""Suppression of repeated messages.
+
+A flapping monitor can post the same card dozens of times in a few minutes. A
+``Deduplicator`` remembers a hash of each message a webhook sends, and suppresses sends
+that repeat one within a time-to-live. The hash is taken over the encoded bytes that are
+about to be posted, which a card caches, so checking for a duplicate never encodes a card
+a second time.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+from typing import Callable, Optional, Union
+
+from msteams_webhooks.cards import Card
+
+
+class Deduplicator:
+    """Time-to-live cache of recently sent messages.
+
+    A message is a duplicate if an identical message (or, with ``key``, a card with the
+    same key) was sent less than ``ttl`` seconds earlier. The time-to-live runs from the
+    first send, and is not extended by suppressed repeats, so a message that keeps
+    repeating is sent again once every ``ttl`` seconds. At most ``maxsize`` messages are
+    remembered; beyond that, the least recently repeated are forgotten first.
+
+    A deduplicator is thread-safe, and may be shared by several webhooks to suppress
+    messages repeated across all of them.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        *,
+        maxsize: int = 1024,
+        key: Optional[Callable[[Card], Hashable]] = None,
+    ) -> None:
+        """Construct a deduplicator.
+
+        Args:
+            ttl: Time in seconds for which repeats of a message are suppressed.
+                Default: ``300.0``
+            maxsize: Maximum number of messages to remember. Default: ``1024``
+            key: Optional function returning the key that identifies a card, e.g. the
+                name of the alert it reports, for cards that differ in unimportant
+                details such as a timestamp. By default, a card is identified by a hash
+                of its encoded JSON. Messages sent without a card are always identified
+                by their hash.
+
+        Returns:
+            None.
+
+        Raises:
+            ValueError: if `ttl` is not positive or `maxsize` is less than one.
+        """
+        if ttl <= 0:
+            raise ValueError("`ttl` must be greater than zero.")  # noqa: TRY003
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be at least 1.")  # noqa: TRY003
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.key = key
+        self.suppressed = 0
+        # Expiry time and number of suppressed repeats of each message, least recently
+        # repeated first.
+        self._entries: OrderedDict[Hashable, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of messages remembered, including any that have expired."""
+        return len(self._entries)
+
+    def key_for(
+        self,
+        contents: Sequence[Union[bytes, memoryview]],
+        card: Optional[Card] = None,
+    ) -> Hashable:
+        """Return the key identifying a message.
+
+        Args:
+            contents: The encoded message, or the pages of a split card, in order.
+            card: The card being sent, if any.
+
+        Returns:
+            The result of ``key(card)`` if both are given, otherwise a hash of `contents`.
+        """
+        if self.key is not None and card is not None:
+            return self.key(card)
+        digest = hashlib.blake2b(digest_size=16)
+        for content in contents:
+            digest.update(content)
+        return digest.digest()
+
+    def check(self, key: Hashable) -> bool:
+        """Record a send, and return whether it repeats a recent one.
+
+        Args:
+            key: The key identifying the message, from ``key_for``.
+
+        Returns:
+            ``True`` if the message was sent less than `ttl` seconds ago and should be
+            suppressed, ``False`` if it should be sent.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                entry[1] += 1
+                self.suppressed += 1
+                self._entries.move_to_end(key)
+                return True
+            self._entries[key] = [now + self.ttl, 0]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return False
+
+    def repeats(self, key: Hashable) -> int:
+        """Return the number of repeats of a message suppressed within its time-to-live.
+
+        Args:
+            key: The key identifying the message, from ``key_for``.
+
+        Returns:
+            The number of repeats suppressed, or ``0`` if the message is not remembered.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return int(entry[1]) if entry is not None else 0
+
+    def discard(self, key: Hashable) -> None:
+        """Forget a message, so that it is sent again the next time, e.g. after a failure.
+
+        Args:
+            key: The key identifying the message, from ``key_for``.
+
+        Returns:
+            None.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget all messages.
+
+        Returns:
+            None.
+        """
+        with self._lock:
+            self._entries.clear()
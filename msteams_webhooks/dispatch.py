@@ -0,0 +1,282 @@
+"""Background dispatch of webhook requests.
+
+A ``DispatchQueue`` lets ``TeamsWebhook.send_card`` return immediately: the serialized
+payload is placed on a bounded in-memory queue, and one or more worker threads post it
+to Teams in the background.
+
+Jobs are queued in one of three priority lanes. Workers always take the oldest job from
+the highest non-empty lane, so urgent messages skip ahead of routine ones, and when the
+queue is full, jobs are shed from the lowest lane first.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+import httpx
+
+from msteams_webhooks import types
+from msteams_webhooks.cards import Card
+from msteams_webhooks.exceptions import TeamsQueueClosedError, TeamsQueueFullError
+
+_Job = tuple[Callable[..., Any], tuple[Any, ...], "Future[Any]"]
+
+# Lanes from highest to lowest priority.
+_PRIORITIES: tuple[types.Priorities, ...] = ("high", "normal", "low")
+
+
+class DispatchQueue:
+    """Bounded queue of pending sends, drained by worker threads.
+
+    Each submitted job returns a ``concurrent.futures.Future``, which resolves to the
+    ``httpx.Response`` once the job is sent, or to the exception that caused it to fail.
+    Worker threads are started on the first submission.
+
+    Jobs are sent in order of priority, then in the order they were submitted. When the
+    queue is full, a job waiting with a lower priority than the one being submitted is
+    always dropped to make room, whatever the overflow policy, so that a flood of
+    low-priority jobs can't hold up high-priority ones.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 1000,
+        workers: int = 1,
+        overflow: types.OverflowPolicies = "block",
+        block_timeout: Optional[float] = None,
+    ) -> None:
+        """Construct a dispatch queue.
+
+        Args:
+            maxsize: Maximum number of jobs waiting to be sent. Default: ``1000``
+            workers: Number of worker threads draining the queue. Default: ``1``
+            overflow: What to do when the queue is full, and no job with a lower priority
+                is waiting. ``"block"`` waits for space, ``"drop_oldest"`` discards the
+                oldest waiting job with the lowest priority to make room, unless all are
+                of higher priority than the job being submitted, and ``"drop_newest"``
+                discards the job being submitted. The future of a dropped job fails with
+                ``TeamsQueueFullError``. Default: ``"block"``
+            block_timeout: With ``overflow="block"``, the maximum time in seconds to
+                wait for space before dropping the new job. Waits forever if ``None``.
+
+        Returns:
+            None.
+
+        Raises:
+            ValueError: if `maxsize` or `workers` is less than one.
+        """
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be at least 1.")  # noqa: TRY003
+        if workers < 1:
+            raise ValueError("`workers` must be at least 1.")  # noqa: TRY003
+        self.maxsize = maxsize
+        self.workers = workers
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self._lanes: dict[types.Priorities, deque[_Job]] = {p: deque() for p in _PRIORITIES}
+        self._size = 0
+        self._unfinished = 0
+        self._closed = False
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._all_done = threading.Condition(self._lock)
+
+    def __len__(self) -> int:
+        """Number of jobs waiting to be sent."""
+        return self._size
+
+    def pending(self, priority: types.Priorities) -> int:
+        """Number of jobs of the given priority waiting to be sent.
+
+        Args:
+            priority: ``"high"``, ``"normal"`` or ``"low"``.
+
+        Returns:
+            The number of jobs waiting in that lane.
+        """
+        return len(self._lanes[priority])
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args: Any,  # noqa: ANN401
+        priority: types.Priorities = "normal",
+    ) -> "Future[Any]":
+        """Queue ``func(*args)`` to be called by a worker thread.
+
+        Args:
+            func: Callable that performs the send.
+            *args: Arguments to pass to `func`.
+            priority: ``"high"``, ``"normal"`` or ``"low"``. Jobs with a higher priority
+                are sent first. Default: ``"normal"``
+
+        Returns:
+            A future that resolves to the return value of `func`.
+
+        Raises:
+            TeamsQueueClosedError: if the queue has been closed.
+            ValueError: if `priority` is unknown.
+        """
+        if priority not in self._lanes:
+            raise ValueError(f"Unknown priority: {priority!r}")  # noqa: TRY003
+        future: Future[Any] = Future()
+        with self._lock:
+            if self._closed:
+                raise TeamsQueueClosedError()
+            if self._size >= self.maxsize and not self._make_room(priority):
+                future.set_exception(TeamsQueueFullError())
+                return future
+            self._lanes[priority].append((func, args, future))
+            self._size += 1
+            self._unfinished += 1
+            self._start_workers()
+            self._not_empty.notify()
+        return future
+
+    def _pop(self, lane: deque[_Job]) -> _Job:
+        """Take the oldest job from a lane. Must be called with the lock held."""
+        self._size -= 1
+        return lane.popleft()
+
+    def _make_room(self, priority: types.Priorities) -> bool:
+        """Shed a job or apply the overflow policy. Must be called with the lock held.
+
+        Args:
+            priority: Priority of the job being submitted.
+
+        Returns:
+            ``True`` if there is now room for another job.
+        """
+        rank = _PRIORITIES.index(priority)
+        lowest = max(i for i, p in enumerate(_PRIORITIES) if self._lanes[p])
+        if lowest > rank or (self.overflow == "drop_oldest" and lowest == rank):
+            _, _, dropped = self._pop(self._lanes[_PRIORITIES[lowest]])
+            self._task_done()
+            dropped.set_exception(TeamsQueueFullError())
+            return True
+        if self.overflow == "block":
+            return (
+                self._not_full.wait_for(
+                    lambda: self._size < self.maxsize or self._closed,
+                    timeout=self.block_timeout,
+                )
+                and not self._closed
+            )
+        return False
+
+    def _start_workers(self) -> None:
+        """Start worker threads, if not already running. Must be called with the lock held."""
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name="msteams-webhooks-dispatch")
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def _task_done(self) -> None:
+        """Record that a job has left the queue. Must be called with the lock held."""
+        self._unfinished -= 1
+        if not self._unfinished:
+            self._all_done.notify_all()
+
+    def _work(self) -> None:
+        """Worker thread main loop."""
+        while True:
+            with self._lock:
+                self._not_empty.wait_for(lambda: self._size or self._closed)
+                if not self._size:
+                    return
+                lane = next(lane for lane in self._lanes.values() if lane)
+                func, args, future = self._pop(lane)
+                self._not_full.notify()
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(func(*args))
+                    except Exception as exc:
+                        future.set_exception(exc)
+            finally:
+                with self._lock:
+                    self._task_done()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued job has been sent.
+
+        Args:
+            timeout: Maximum time in seconds to wait. Waits forever if ``None``.
+
+        Returns:
+            ``True`` if the queue was drained, ``False`` if `timeout` expired first.
+        """
+        with self._lock:
+            return self._all_done.wait_for(lambda: not self._unfinished, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting jobs, send those already queued, and stop the worker threads.
+
+        Jobs still waiting when `timeout` expires are cancelled.
+
+        Args:
+            timeout: Maximum time in seconds to spend draining the queue. Waits
+                forever if ``None``.
+
+        Returns:
+            ``True`` if the queue was drained, ``False`` if `timeout` expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        with self._lock:
+            drained = not self._unfinished
+            for lane in self._lanes.values():
+                while lane:
+                    _, _, future = self._pop(lane)
+                    future.cancel()
+                    self._task_done()
+        return drained
+
+
+class SendResult:
+    """Outcome of sending a single card as part of a batch."""
+
+    def __init__(
+        self,
+        card: Card,
+        *,
+        response: Optional[httpx.Response] = None,
+        exception: Optional[BaseException] = None,
+    ) -> None:
+        """Record the outcome of a send.
+
+        Args:
+            card: The card that was sent.
+            response: Response to the successful request, if any.
+            exception: Exception that caused the send to fail, if any.
+
+        Returns:
+            None.
+
+        Raises:
+            None.
+        """
+        self.card = card
+        self.response = response
+        self.exception = exception
+
+    @property
+    def ok(self) -> bool:
+        """Whether the card was sent successfully."""
+        return self.exception is None
+
+    def __repr__(self) -> str:
+        """Summarize the outcome."""
+        if self.exception is not None:
+            return f"<SendResult failed: {self.exception!r}>"
+        return "<SendResult ok>"
@@ -1,14 +1,16 @@
 """Cards are built using various elements."""
-from typing import Any, Literal, Optional, Union
+from typing import Literal, Optional, Union
 
 from msteams_webhooks import types
 from msteams_webhooks.actions import Action
-from msteams_webhooks.base import Entity
+from msteams_webhooks.base import Entity, Field
 
 
 class CardElement(Entity):
     """Base element class."""
 
+    __slots__ = ()
+
 
 class Image(CardElement):
     """Displays an image. Acceptable formats are PNG, JPEG, and GIF.
@@ -16,6 +18,30 @@ class Image(CardElement):
     Schema Explorer: https://adaptivecards.io/explorer/Image.html.
     """
 
+    __slots__ = (
+        "alt_text",
+        "background_color",
+        "height",
+        "horizontal_alignment",
+        "select_action",
+        "size",
+        "style",
+        "url",
+        "width",
+    )
+    _type = "Image"
+    _schema = (
+        Field("url", omit="never"),
+        Field("alt_text"),
+        Field("background_color"),
+        Field("height"),
+        Field("horizontal_alignment"),
+        Field("select_action", kind="entity"),
+        Field("size"),
+        Field("style"),
+        Field("width"),
+    )
+
     def __init__(
         self,
         url: str,
@@ -67,30 +93,6 @@ class Image(CardElement):
         self.style = style
         self.width = width
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload: dict[str, Any] = {
-            "type": "Image",
-            "url": self.url,
-        }
-        if self.alt_text:
-            payload["altText"] = self.alt_text
-        if self.background_color:
-            payload["backgroundColor"] = self.background_color
-        if self.height:
-            payload["height"] = self.height
-        if self.horizontal_alignment:
-            payload["horizontalAlignment"] = self.horizontal_alignment
-        if self.select_action:
-            payload["selectAction"] = self.select_action.serialize()
-        if self.size:
-            payload["size"] = self.size
-        if self.style:
-            payload["style"] = self.style
-        if self.width:
-            payload["width"] = self.width
-        return payload
-
 
 class MediaSource(CardElement):
     """Defines a source for a Media element.
@@ -98,6 +100,9 @@ class MediaSource(CardElement):
     Schema Explorer: https://adaptivecards.io/explorer/MediaSource.html
     """
 
+    __slots__ = ("mime_type", "url")
+    _schema = (Field("url", omit="never"), Field("mime_type"))
+
     def __init__(self, url: str, *, mime_type: Optional[str] = None) -> None:
         """Defines a source for a Media element.
 
@@ -115,13 +120,6 @@ class MediaSource(CardElement):
         self.url = url
         self.mime_type = mime_type
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload: dict[str, Any] = {"url": self.url}
-        if self.mime_type:
-            payload["mimeType"] = self.mime_type
-        return payload
-
 
 class Media(CardElement):
     """Displays a media player for audio or video content.
@@ -129,6 +127,10 @@ class Media(CardElement):
     Schema Explorer: https://adaptivecards.io/explorer/Media.html
     """
 
+    __slots__ = ("alt_text", "poster", "sources")
+    _type = "Media"
+    _schema = (Field("sources", omit="never", kind="entities"), Field("poster"), Field("alt_text"))
+
     def __init__(
         self,
         sources: list[MediaSource],
@@ -157,18 +159,6 @@ class Media(CardElement):
         self.poster = poster
         self.alt_text = alt_text
 
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload: dict[str, Any] = {
-            "type": "Media",
-            "sources": [x.serialize() for x in self.sources],
-        }
-        if self.poster:
-            payload["poster"] = self.poster
-        if self.alt_text:
-            payload["altText"] = self.alt_text
-        return payload
-
 
 class TextBlock(CardElement):
     """Displays text, allowing control over font sizes, weight, and color.
@@ -176,6 +166,32 @@ class TextBlock(CardElement):
     Schema Explorer: https://adaptivecards.io/explorer/TextBlock.html
     """
 
+    __slots__ = (
+        "color",
+        "font_type",
+        "horizontal_alignment",
+        "is_subtle",
+        "max_lines",
+        "size",
+        "style",
+        "text",
+        "weight",
+        "wrap",
+    )
+    _type = "TextBlock"
+    _schema = (
+        Field("text", omit="never"),
+        Field("color"),
+        Field("font_type"),
+        Field("horizontal_alignment"),
+        Field("is_subtle"),
+        Field("max_lines"),
+        Field("size"),
+        Field("weight"),
+        Field("wrap"),
+        Field("style"),
+    )
+
     def __init__(
         self,
         text: str,
@@ -224,29 +240,3 @@ class TextBlock(CardElement):
         self.weight = weight
         self.wrap = wrap
         self.style = style
-
-    def serialize(self) -> dict[str, Any]:
-        """Serialize object into data structure."""
-        payload: dict[str, Any] = {
-            "type": "TextBlock",
-            "text": self.text,
-        }
-        if self.color:
-            payload["color"] = self.color
-        if self.font_type:
-            payload["fontType"] = self.font_type
-        if self.horizontal_alignment:
-            payload["horizontalAlignment"] = self.horizontal_alignment
-        if self.is_subtle:
-            payload["isSubtle"] = self.is_subtle
-        if self.max_lines:
-            payload["maxLines"] = self.max_lines
-        if self.size:
-            payload["size"] = self.size
-        if self.weight:
-            payload["weight"] = self.weight
-        if self.wrap:
-            payload["wrap"] = self.wrap
-        if self.style:
-            payload["style"] = self.style
-        return payload
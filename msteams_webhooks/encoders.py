@@ -0,0 +1,95 @@
+"""JSON encoders for webhook payloads.
+
+An encoder is any callable that takes a JSON-compatible data structure and returns UTF-8
+encoded JSON bytes. The standard library encoder is always available. Faster encoders are
+used automatically when their packages are installed:
+
+* ``orjson``: ``pip install msteams_webhooks[orjson]``
+* ``msgspec``: ``pip install msteams_webhooks[msgspec]``
+"""
+import json
+from typing import Any, Callable
+
+try:
+    import orjson  # type: ignore[import]
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec  # type: ignore[import]
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+Encoder = Callable[[Any], bytes]
+
+
+def json_encoder(data: Any) -> bytes:  # noqa: ANN401
+    """Encode `data` with the standard library ``json`` module.
+
+    Args:
+        data: JSON-compatible data structure.
+
+    Returns:
+        Compact UTF-8 encoded JSON.
+    """
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode()
+
+
+def orjson_encoder(data: Any) -> bytes:  # noqa: ANN401
+    """Encode `data` with ``orjson``.
+
+    Args:
+        data: JSON-compatible data structure.
+
+    Returns:
+        Compact UTF-8 encoded JSON.
+
+    Raises:
+        ModuleNotFoundError: if ``orjson`` is not installed.
+    """
+    if orjson is None:
+        raise ModuleNotFoundError("orjson is not installed.")  # noqa: TRY003
+    return orjson.dumps(data)
+
+
+def msgspec_encoder(data: Any) -> bytes:  # noqa: ANN401
+    """Encode `data` with ``msgspec``.
+
+    Args:
+        data: JSON-compatible data structure.
+
+    Returns:
+        Compact UTF-8 encoded JSON.
+
+    Raises:
+        ModuleNotFoundError: if ``msgspec`` is not installed.
+    """
+    if msgspec is None:
+        raise ModuleNotFoundError("msgspec is not installed.")  # noqa: TRY003
+    return msgspec.json.encode(data)
+
+
+def default_encoder() -> Encoder:
+    """Return the fastest encoder available.
+
+    Returns:
+        ``orjson_encoder`` or ``msgspec_encoder`` if the package is installed (in that
+        order of preference), otherwise ``json_encoder``.
+    """
+    if orjson is not None:
+        return orjson_encoder
+    if msgspec is not None:
+        return msgspec_encoder
+    return json_encoder
+
+
+def encode_message(attachment: bytes) -> bytes:
+    """Wrap an encoded card in an encoded webhook message.
+
+    Args:
+        attachment: The card, as encoded JSON.
+
+    Returns:
+        The complete webhook message, as encoded JSON, ready to be posted.
+    """
+    return b'{"type":"message","attachments":[' + attachment + b"]}"
@@ -11,3 +11,50 @@ class TeamsRateLimitError(TeamsWebhookError):
     def __init__(self, *args: object) -> None:
         """Raised when rate limiting is encountered."""
         super().__init__("Rate limit exceeded. Slow messaging rate and try again.", *args)
+
+
+class TeamsResponseError(TeamsWebhookError):
+    """Raised when Teams answers a request with an HTTP status other than 200/OK."""
+
+    def __init__(self, status_code: int, text: str, *args: object) -> None:
+        """Raised when Teams answers a request with an HTTP status other than 200/OK."""
+        super().__init__(text, *args)
+        self.status_code = status_code
+
+
+class TeamsQueueFullError(TeamsWebhookError):
+    """Raised when a message is dropped because the dispatch queue is full."""
+
+    def __init__(self, *args: object) -> None:
+        """Raised when a message is dropped because the dispatch queue is full."""
+        super().__init__("Dispatch queue is full. Message was dropped.", *args)
+
+
+class TeamsQueueClosedError(TeamsWebhookError):
+    """Raised when a message is submitted to a closed dispatch queue."""
+
+    def __init__(self, *args: object) -> None:
+        """Raised when a message is submitted to a closed dispatch queue."""
+        super().__init__("Dispatch queue is closed.", *args)
+
+
+class TeamsPayloadTooLargeError(TeamsWebhookError):
+    """Raised when a payload exceeds the maximum size accepted by Teams."""
+
+    def __init__(self, size: int, max_size: int, *args: object) -> None:
+        """Raised when a payload exceeds the maximum size accepted by Teams."""
+        super().__init__(f"Payload is {size} bytes, exceeding the {max_size} byte limit.", *args)
+        self.size = size
+        self.max_size = max_size
+
+
+class TeamsCircuitOpenError(TeamsWebhookError):
+    """Raised when a send fails fast because the webhook's circuit breaker is open."""
+
+    def __init__(self, retry_after: float, *args: object) -> None:
+        """Raised when a send fails fast because the webhook's circuit breaker is open."""
+        super().__init__(
+            f"Circuit breaker is open. Sends will be retried in {retry_after:.1f} seconds.",
+            *args,
+        )
+        self.retry_after = retry_after
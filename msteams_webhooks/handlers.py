@@ -0,0 +1,225 @@
+"""Logging handler that posts log records to Teams.
+
+Posting a message from ``logging.Handler.emit`` would hold up the thread that logged it
+until Teams responds. A ``TeamsLogHandler`` instead puts each record on a bounded queue,
+which ``emit`` never waits on, and a background listener thread collects the records into
+digest cards, paced by a ``RateLimiter``. If Teams is slow or unreachable and the queue
+fills up, further records are dropped and counted, rather than slowing the application.
+"""
+import contextlib
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from msteams_webhooks import types
+from msteams_webhooks.cards import AdaptiveCard, Card
+from msteams_webhooks.coalesce import digest_card
+from msteams_webhooks.elements import TextBlock
+from msteams_webhooks.ratelimit import RateLimiter
+from msteams_webhooks.sizing import split_card
+
+if TYPE_CHECKING:
+    from msteams_webhooks import TeamsWebhook
+
+# Queued by ``flush`` and ``close`` to wake the listener thread.
+_FLUSH = object()
+_STOP = object()
+# Loggers used while sending, whose records would otherwise be sent in turn.
+_IGNORED = ("httpx", "httpcore")
+
+
+class TeamsLogHandler(logging.handlers.QueueHandler):
+    """Sends log records to a Teams channel as digest cards, without blocking.
+
+    The first record collected opens a window of ``window`` seconds. When the window
+    closes, or as soon as ``max_records`` records have been collected, they are sent as
+    a single card that lists each record's time, level and message. Records are formatted
+    by the handler's formatter in the thread that logged them; set one with
+    ``setFormatter`` as usual.
+
+    Records logged while the queue is full are dropped, counted in ``dropped``, and
+    reported in the next card sent. Errors sending a card are reported with
+    ``handleError``, like any other logging error.
+    """
+
+    def __init__(
+        self,
+        webhook: "TeamsWebhook",
+        *,
+        level: int = logging.ERROR,
+        window: float = 10.0,
+        max_records: int = 50,
+        capacity: int = 1000,
+        max_length: int = 2000,
+        rate: Optional[float] = 0.5,
+        burst: int = 4,
+        heading: str = "{count} log records",
+        layout: types.DigestLayouts = "facts",
+        timeout: float = 10.0,
+    ) -> None:
+        """Construct a handler, and start its listener thread.
+
+        Args:
+            webhook: The webhook to send cards to. Cards are split to fit within its
+                ``max_payload_size``.
+            level: Minimum level of the records to send. Default: ``logging.ERROR``
+            window: Time in seconds to collect records for, from the first record
+                collected. Default: ``10.0``
+            max_records: Number of records that triggers sending a card before the
+                window closes. Default: ``50``
+            capacity: Maximum number of records waiting to be sent. Default: ``1000``
+            max_length: Maximum length of each formatted record, including any
+                traceback. Longer records are truncated. Default: ``2000``
+            rate: Maximum sustained number of cards sent per second, or ``None`` for no
+                limit. Default: ``0.5``
+            burst: Maximum number of cards sent back-to-back with `rate`. Default: ``4``
+            heading: Text shown above the records. ``{count}`` is replaced with the
+                number of records. Default: ``"{count} log records"``
+            layout: ``"facts"`` lists the records in a ``FactSet``, and ``"table"`` in a
+                two-column ``ColumnarTable``. Default: ``"facts"``
+            timeout: Maximum time in seconds ``close`` waits for the records collected
+                so far to be sent. Default: ``10.0``
+
+        Returns:
+            None.
+
+        Raises:
+            ValueError: if `window` is not positive, `max_records`, `capacity` or
+                `max_length` is less than one, `layout` is unknown, or `rate` or `burst`
+                is invalid.
+        """
+        if window <= 0:
+            raise ValueError("`window` must be greater than zero.")  # noqa: TRY003
+        if max_records < 1:
+            raise ValueError("`max_records` must be at least 1.")  # noqa: TRY003
+        if capacity < 1:
+            raise ValueError("`capacity` must be at least 1.")  # noqa: TRY003
+        if max_length < 1:
+            raise ValueError("`max_length` must be at least 1.")  # noqa: TRY003
+        if layout not in ("facts", "table"):
+            raise ValueError(f"Unknown digest layout: {layout!r}")  # noqa: TRY003
+        self.rate_limiter = RateLimiter(rate, burst=burst) if rate is not None else None
+        # Kept with its concrete type, since QueueHandler.queue is only typed as queue-like.
+        self._queue: queue.Queue[Any] = queue.Queue(capacity)
+        super().__init__(self._queue)
+        self.setLevel(level)
+        self.addFilter(lambda record: not record.name.startswith(_IGNORED))
+        self.webhook = webhook
+        self.window = window
+        self.max_records = max_records
+        self.max_length = max_length
+        self.heading = heading
+        self.layout: types.DigestLayouts = layout
+        self.timeout = timeout
+        self.dropped = 0
+        self._reported = 0
+        self._dropped_lock = threading.Lock()
+        self._listener = threading.Thread(target=self._listen, name="msteams-webhooks-logging")
+        self._listener.daemon = True
+        self._listener.start()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue a record without waiting, dropping it if the queue is full.
+
+        Args:
+            record: The prepared record.
+
+        Returns:
+            None.
+        """
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def _listen(self) -> None:
+        """Listener thread main loop."""
+        records: list[logging.LogRecord] = []
+        deadline: Optional[float] = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item: Any = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = _FLUSH
+            if isinstance(item, logging.LogRecord):
+                records.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.window
+                if len(records) < self.max_records:
+                    continue
+            if records:
+                self._send(records)
+                records = []
+            deadline = None
+            if item is _STOP:
+                return
+
+    def _cards(self, records: list[logging.LogRecord]) -> list[Card]:
+        """Build the cards for a batch of records, split to fit the webhook."""
+        entries = []
+        for record in records:
+            text = record.getMessage()
+            if len(text) > self.max_length:
+                text = text[: self.max_length - 1] + "…"
+            created = time.strftime("%H:%M:%S", time.localtime(record.created))
+            entries.append((f"{created} {record.levelname}", text))
+        if len(entries) == 1:
+            title, text = entries[0]
+            body: list[Any] = [TextBlock(title, weight="bolder"), TextBlock(text, wrap=True)]
+        else:
+            body = digest_card(entries, heading=self.heading, layout=self.layout).body
+        with self._dropped_lock:
+            total = self.dropped
+        dropped, self._reported = total - self._reported, total
+        if dropped:
+            note = f"{dropped} more records were dropped while the queue was full."
+            body.append(TextBlock(note, is_subtle=True, wrap=True))
+        card = AdaptiveCard(body=body)
+        if self.webhook.max_payload_size is None:
+            return [card]
+        return split_card(card, self.webhook.max_payload_size, encoder=self.webhook.encoder)
+
+    def _send(self, records: list[logging.LogRecord]) -> None:
+        """Send a batch of records, reporting any error with ``handleError``."""
+        try:
+            for card in self._cards(records):
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
+                self.webhook.send_card(card)
+        except Exception:
+            self.handleError(records[0])
+
+    def flush(self) -> None:
+        """Send the records collected so far, without waiting for the window to close.
+
+        Returns immediately, without waiting for them to be sent.
+
+        Returns:
+            None.
+        """
+        # If the queue is full, the listener has records to send already.
+        with contextlib.suppress(queue.Full):
+            self._queue.put_nowait(_FLUSH)
+
+    def close(self) -> None:
+        """Send the records collected so far, and stop the listener thread.
+
+        Waits up to `timeout` seconds in all for the records to be sent.
+
+        Returns:
+            None.
+        """
+        if self._listener.is_alive():
+            deadline = time.monotonic() + self.timeout
+            try:
+                self._queue.put(_STOP, timeout=self.timeout)
+            except queue.Full:
+                pass
+            else:
+                self._listener.join(max(0.0, deadline - time.monotonic()))
+        super().close()
@@ -0,0 +1,309 @@
+"""Instrumentation of webhook sends.
+
+A webhook given an ``observer`` reports what it does: how long each card took to
+serialize and encode, the size, latency and outcome of each request, retries, and the
+depth of its ``DispatchQueue``. ``Observer`` does nothing with these events; subclass it
+to forward them to a metrics library. ``MetricsCollector`` records them in process, as
+counters and histograms that can be summarized with percentiles or exported in the
+Prometheus text format.
+"""
+import bisect
+import math
+import threading
+from collections.abc import Sequence
+
+from msteams_webhooks import types
+
+DURATION_BUCKETS: tuple[float, ...] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+"""Upper bounds in seconds of the buckets of duration histograms."""
+
+SIZE_BUCKETS: tuple[float, ...] = tuple(float(2**n) for n in range(8, 21))
+"""Upper bounds in bytes of the buckets of payload size histograms: 256 B to 1 MiB."""
+
+
+class Observer:
+    """Receives events from webhooks. Every method does nothing by default.
+
+    Methods are called on the thread (or event loop) that sends, so they should return
+    quickly. One observer may be shared by several webhooks.
+    """
+
+    def on_serialize(self, seconds: float) -> None:
+        """Called when a card has been converted to a data structure.
+
+        Args:
+            seconds: Time taken.
+        """
+
+    def on_encode(self, seconds: float) -> None:
+        """Called when a card has been encoded as JSON, including splitting it if needed.
+
+        Args:
+            seconds: Time taken.
+        """
+
+    def on_request(self, seconds: float, size: int, outcome: types.RequestOutcomes) -> None:
+        """Called when a request to Teams has finished, successfully or not.
+
+        Args:
+            seconds: Time taken, from sending the request to checking the response. Time
+                spent waiting for a ``RateLimiter`` is not included.
+            size: Size of the payload in bytes.
+            outcome: ``"ok"``, ``"rate_limited"`` if Teams throttled the request, or
+                ``"error"`` for any other failure, including network errors.
+        """
+
+    def on_retry(self, attempt: int) -> None:
+        """Called before a request is retried.
+
+        Args:
+            attempt: Number of the attempt about to be made, starting at 2.
+        """
+
+    def on_queue(self, depth: int) -> None:
+        """Called when a message is submitted to, or taken from, a ``DispatchQueue``.
+
+        Args:
+            depth: Number of messages waiting in the queue.
+        """
+
+
+class Histogram:
+    """Distribution of observed values, counted in fixed buckets.
+
+    Percentiles are estimated by interpolating within the bucket they fall in, like
+    Prometheus's ``histogram_quantile``, so they are only as precise as the buckets.
+    """
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        """Construct an empty histogram.
+
+        Args:
+            buckets: Upper bounds of the buckets, in increasing order. A final bucket
+                for larger values is added.
+
+        Returns:
+            None.
+
+        Raises:
+            ValueError: if `buckets` is empty or not in increasing order.
+        """
+        if not buckets or any(a >= b for a, b in zip(buckets, buckets[1:])):
+            raise ValueError("`buckets` must be in increasing order.")  # noqa: TRY003
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a value.
+
+        Args:
+            value: The value observed.
+
+        Returns:
+            None.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile of the values observed.
+
+        Args:
+            q: The quantile, from ``0.0`` to ``1.0``; e.g. ``0.99`` for the 99th
+                percentile.
+
+        Returns:
+            The estimated value, or ``nan`` if nothing has been observed.
+        """
+        if not self.count:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        """Summarize the values observed.
+
+        Returns:
+            The ``count``, ``mean``, ``p50``, ``p90``, ``p99`` and ``max``.
+        """
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else math.nan,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+class MetricsCollector(Observer):
+    """Observer that records events in process.
+
+    Durations and payload sizes are recorded in ``Histogram`` objects, and requests are
+    counted by outcome. A collector is thread-safe.
+    """
+
+    def __init__(
+        self,
+        *,
+        duration_buckets: Sequence[float] = DURATION_BUCKETS,
+        size_buckets: Sequence[float] = SIZE_BUCKETS,
+    ) -> None:
+        """Construct an empty collector.
+
+        Args:
+            duration_buckets: Upper bounds in seconds of the buckets of the duration
+                histograms. Default: ``DURATION_BUCKETS``
+            size_buckets: Upper bounds in bytes of the buckets of the payload size
+                histogram. Default: ``SIZE_BUCKETS``
+
+        Returns:
+            None.
+        """
+        self.serialize_seconds = Histogram(duration_buckets)
+        self.encode_seconds = Histogram(duration_buckets)
+        self.request_seconds = Histogram(duration_buckets)
+        self.payload_bytes = Histogram(size_buckets)
+        self.requests: dict[types.RequestOutcomes, int] = {
+            "ok": 0,
+            "rate_limited": 0,
+            "error": 0,
+        }
+        self.retries = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self._lock = threading.Lock()
+
+    def on_serialize(self, seconds: float) -> None:
+        """Record the time taken to serialize a card."""
+        with self._lock:
+            self.serialize_seconds.observe(seconds)
+
+    def on_encode(self, seconds: float) -> None:
+        """Record the time taken to encode a card."""
+        with self._lock:
+            self.encode_seconds.observe(seconds)
+
+    def on_request(self, seconds: float, size: int, outcome: types.RequestOutcomes) -> None:
+        """Record the latency, payload size and outcome of a request."""
+        with self._lock:
+            self.request_seconds.observe(seconds)
+            self.payload_bytes.observe(size)
+            self.requests[outcome] += 1
+
+    def on_retry(self, attempt: int) -> None:
+        """Count a retry."""
+        with self._lock:
+            self.retries += 1
+
+    def on_queue(self, depth: int) -> None:
+        """Record the depth of the dispatch queue."""
+        with self._lock:
+            self.queue_depth = depth
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Summarize everything recorded so far.
+
+        Returns:
+            A summary of each histogram, by name, as returned by
+            ``Histogram.summary``, and the counters under ``"requests"`` and
+            ``"queue"``.
+        """
+        with self._lock:
+            return {
+                "serialize_seconds": self.serialize_seconds.summary(),
+                "encode_seconds": self.encode_seconds.summary(),
+                "request_seconds": self.request_seconds.summary(),
+                "payload_bytes": self.payload_bytes.summary(),
+                "requests": {**self.requests, "retries": self.retries},
+                "queue": {"depth": self.queue_depth, "max_depth": self.max_queue_depth},
+            }
+
+    def to_prometheus(self, prefix: str = "msteams_webhooks") -> str:
+        """Export everything recorded so far in the Prometheus text format.
+
+        Serve the result from a ``/metrics`` endpoint for Prometheus to scrape, or write
+        it to a file for the node exporter's textfile collector.
+
+        Args:
+            prefix: Prefix of every metric name. Default: ``"msteams_webhooks"``
+
+        Returns:
+            The metrics, one per line.
+        """
+        histograms = (
+            ("serialize_seconds", "Time taken to serialize a card.", self.serialize_seconds),
+            ("encode_seconds", "Time taken to encode a card as JSON.", self.encode_seconds),
+            ("request_seconds", "Latency of requests to Teams.", self.request_seconds),
+            ("payload_bytes", "Size of request payloads.", self.payload_bytes),
+        )
+        lines: list[str] = []
+        with self._lock:
+            for name, description, histogram in histograms:
+                lines.extend(_histogram_lines(f"{prefix}_{name}", description, histogram))
+            name = f"{prefix}_requests_total"
+            lines.append(f"# HELP {name} Requests to Teams, by outcome.")
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f'{name}{{outcome="{k}"}} {v}' for k, v in self.requests.items())
+            name = f"{prefix}_retries_total"
+            lines.append(f"# HELP {name} Requests retried.")
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {self.retries}")
+            name = f"{prefix}_queue_depth"
+            lines.append(f"# HELP {name} Messages waiting in the dispatch queue.")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {self.queue_depth}")
+            name = f"{prefix}_queue_max_depth"
+            lines.append(f"# HELP {name} Most messages waiting in the dispatch queue at once.")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {self.max_queue_depth}")
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(name: str, description: str, histogram: Histogram) -> list[str]:
+    """Format a histogram in the Prometheus text format."""
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+    cumulative = 0
+    for bound, count in zip((*histogram.buckets, math.inf), histogram.counts):
+        cumulative += count
+        le = "+Inf" if bound == math.inf else _format(bound)
+        lines.append(f'{name}_bucket{{le="{le}"}} {cumulative}')
+    lines.append(f"{name}_sum {_format(histogram.sum)}")
+    lines.append(f"{name}_count {histogram.count}")
+    return lines
+
+
+def _format(value: float) -> str:
+    """Format a number as Prometheus does, without a trailing ``.0`` on integers."""
+    return str(int(value)) if value == int(value) else repr(value)
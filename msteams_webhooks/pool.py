@@ -0,0 +1,169 @@
+"""Connection pools shared between webhooks.
+
+By default, every webhook object creates its own HTTP client, and with it its own
+connections and TLS sessions. When posting to many channels, most of which are served by
+the same few hosts, share a ``ConnectionPool`` (or ``AsyncConnectionPool``) between the
+webhook objects instead, so that connections to each host are reused by every channel.
+"""
+import abc
+import ssl
+import threading
+from typing import Generic, Optional, TypeVar, Union
+
+import httpx
+
+ClientT = TypeVar("ClientT", httpx.Client, httpx.AsyncClient)
+TransportT = TypeVar("TransportT", httpx.BaseTransport, httpx.AsyncBaseTransport)
+
+DEFAULT_TIMEOUT = 15.0
+"""Timeout in seconds used when none is given."""
+
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=5.0,
+)
+"""Connection limits used when none are given; the same as the ``httpx`` defaults."""
+
+
+class _BasePool(abc.ABC, Generic[ClientT, TransportT]):
+    """Registry of HTTP clients, keyed by host."""
+
+    def __init__(
+        self,
+        *,
+        verify: Union[str, bool, ssl.SSLContext] = True,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        http2: bool = False,
+        transport: Optional[TransportT] = None,
+    ) -> None:
+        """Construct a connection pool.
+
+        Args:
+            verify: How to handle HTTPS certificate verification.
+            timeout: Global timeout in seconds for all HTTP operations.
+            max_connections: Maximum number of open connections to each host, or
+                ``None`` for no limit.
+            max_keepalive_connections: Maximum number of idle connections kept open to
+                each host, or ``None`` for no limit.
+            keepalive_expiry: Seconds after which an idle connection is closed, or
+                ``None`` to keep idle connections open indefinitely.
+            http2: If true, negotiate HTTP/2 with each host where supported, so that
+                concurrent requests share a single multiplexed connection. Requires the
+                ``http2`` extra: ``pip install msteams_webhooks[http2]``. Default: ``False``
+            transport: Optional ``httpx`` transport that every client sends requests
+                through instead of the network. Useful for testing.
+
+        Returns:
+            None.
+
+        Raises:
+            None.
+        """
+        self.verify = verify
+        self.timeout = timeout
+        self.http2 = http2
+        self.transport = transport
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._clients: dict[tuple[str, str, Optional[int]], ClientT] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of hosts with a client in the pool."""
+        return len(self._clients)
+
+    @abc.abstractmethod
+    def _create_client(self) -> ClientT:
+        """Create a client for a new host."""
+
+    def client_for(self, url: str) -> ClientT:
+        """Return the shared client for the host serving `url`, creating it if needed.
+
+        Args:
+            url: Webhook URL that will be posted to.
+
+        Returns:
+            An HTTP client shared by every URL on the same scheme, host, and port.
+        """
+        parsed = httpx.URL(url)
+        key = (parsed.scheme, parsed.host, parsed.port)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = self._create_client()
+            return client
+
+
+class ConnectionPool(_BasePool[httpx.Client, httpx.BaseTransport]):
+    """Shares ``httpx.Client`` connections between ``TeamsWebhook`` objects.
+
+    One keep-alive pool is maintained per host. Webhook objects created with
+    ``pool=`` borrow the pool's clients; closing the webhook leaves them open. Close the
+    pool itself once every webhook using it is finished.
+    """
+
+    def _create_client(self) -> httpx.Client:
+        return httpx.Client(
+            verify=self.verify,
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2,
+            transport=self.transport,
+        )
+
+    def close(self) -> None:
+        """Close every client in the pool."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+    def __enter__(self) -> "ConnectionPool":
+        """Use the pool as a context manager, closing it on exit."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Close the pool."""
+        self.close()
+
+
+class AsyncConnectionPool(_BasePool[httpx.AsyncClient, httpx.AsyncBaseTransport]):
+    """Shares ``httpx.AsyncClient`` connections between ``AsyncTeamsWebhook`` objects.
+
+    One keep-alive pool is maintained per host. Webhook objects created with
+    ``pool=`` borrow the pool's clients; closing the webhook leaves them open. Close the
+    pool itself once every webhook using it is finished.
+    """
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            verify=self.verify,
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2,
+            transport=self.transport,
+        )
+
+    async def close(self) -> None:
+        """Close every client in the pool."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    async def __aenter__(self) -> "AsyncConnectionPool":
+        """Use the pool as an async context manager, closing it on exit."""
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Close the pool."""
+        await self.close()
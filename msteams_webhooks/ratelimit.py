@@ -0,0 +1,73 @@
+"""Client-side rate limiting for webhook requests.
+
+Teams throttles webhooks that post too quickly, but only reports it after the fact. A
+``RateLimiter`` paces requests on the client side so throughput stays at a steady rate
+instead of alternating between bursts and lockouts.
+"""
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket that paces requests to a configured rate.
+
+    Tokens are replenished continuously at ``rate`` tokens per second, up to a maximum of
+    ``burst`` tokens. Each request consumes one token. When no token is available, callers
+    wait (or await) until one is, rather than failing.
+
+    Waiting callers are served in the order they arrived. A single limiter is thread-safe
+    and may be shared by several ``TeamsWebhook`` and ``AsyncTeamsWebhook`` instances that
+    post to the same URL.
+    """
+
+    def __init__(self, rate: float, *, burst: int = 1) -> None:
+        """Construct a rate limiter.
+
+        Args:
+            rate: Sustained number of requests allowed per second.
+            burst: Maximum number of requests that may be sent back-to-back after a
+                period of inactivity. Default: ``1``
+
+        Returns:
+            None.
+
+        Raises:
+            ValueError: if `rate` is not positive or `burst` is less than one.
+        """
+        if rate <= 0:
+            raise ValueError("`rate` must be greater than zero.")  # noqa: TRY003
+        if burst < 1:
+            raise ValueError("`burst` must be at least 1.")  # noqa: TRY003
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token, returning how long to wait before it may be used.
+
+        The token count is allowed to go negative, which reserves a future token for
+        the caller. This keeps waiting callers in arrival order without a wait queue.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block the calling thread until a token is available."""
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a token is available."""
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
@@ -0,0 +1,154 @@
+"""Retrying failed webhook requests.
+
+A ``RetryPolicy`` retries requests that fail with rate limiting or transient network
+errors, waiting an exponentially increasing, randomized delay between attempts so that
+many clients retrying at once do not do so in lockstep.
+"""
+import asyncio
+import random
+import time
+from collections.abc import Awaitable
+from typing import Callable, Optional, TypeVar
+
+import httpx
+
+from msteams_webhooks.exceptions import TeamsRateLimitError
+
+T = TypeVar("T")
+
+DEFAULT_RETRY_ON: tuple[type[BaseException], ...] = (
+    TeamsRateLimitError,
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+)
+"""Errors retried by default: rate limiting, timeouts, and dropped or reset connections."""
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter.
+
+    The delay before retry ``n`` is ``base_delay * 2 ** (n - 1)``, capped at ``max_delay``.
+    A fraction of that delay, controlled by ``jitter``, is then randomized. With the
+    default ``jitter=1.0`` ("full jitter") the actual delay is chosen uniformly between
+    zero and the capped delay.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        jitter: float = 1.0,
+        retry_on: tuple[type[BaseException], ...] = DEFAULT_RETRY_ON,
+        deadline: Optional[float] = None,
+    ) -> None:
+        """Construct a retry policy.
+
+        Args:
+            max_attempts: Total number of attempts, including the first. Default: ``3``
+            base_delay: Delay in seconds before the first retry, before jitter is applied.
+            max_delay: Upper bound in seconds for any single delay.
+            jitter: Fraction of each delay, from ``0.0`` to ``1.0``, that is randomized.
+                ``0.0`` disables jitter. Default: ``1.0``
+            retry_on: Exception types that are retried. Any other exception is raised
+                immediately. Default: ``DEFAULT_RETRY_ON``
+            deadline: Optional overall time budget in seconds, measured from the first
+                attempt. No retry is started if its delay would exceed the deadline.
+
+        Returns:
+            None.
+
+        Raises:
+            ValueError: if `max_attempts` is less than one or `jitter` is out of range.
+        """
+        if max_attempts < 1:
+            raise ValueError("`max_attempts` must be at least 1.")  # noqa: TRY003
+        if not 0.0 <= jitter <= 1.0:
+            raise ValueError("`jitter` must be between 0.0 and 1.0.")  # noqa: TRY003
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_on = retry_on
+        self.deadline = deadline
+
+    def backoff(self, attempt: int) -> float:
+        """Compute the delay in seconds to wait after the given failed attempt.
+
+        Args:
+            attempt: Number of the attempt that just failed, starting at 1.
+
+        Returns:
+            Delay in seconds, with jitter applied.
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay - delay * self.jitter * random.random()  # noqa: S311
+
+    def next_delay(self, attempt: int, exc: BaseException, elapsed: float) -> Optional[float]:
+        """Decide whether to retry after a failed attempt.
+
+        Args:
+            attempt: Number of the attempt that just failed, starting at 1.
+            exc: The exception raised by the failed attempt.
+            elapsed: Seconds elapsed since the first attempt started.
+
+        Returns:
+            Delay in seconds before the next attempt, or ``None`` if the request should
+            not be retried.
+        """
+        if attempt >= self.max_attempts or not isinstance(exc, self.retry_on):
+            return None
+        delay = self.backoff(attempt)
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+        return delay
+
+    def call(self, func: Callable[[], T]) -> T:
+        """Call `func`, retrying it according to this policy.
+
+        Args:
+            func: Zero-argument callable to attempt.
+
+        Returns:
+            The return value of the first successful attempt.
+
+        Raises:
+            Exception: the last exception raised by `func`, once retries are exhausted.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return func()
+            except Exception as exc:
+                delay = self.next_delay(attempt, exc, time.monotonic() - started)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+
+    async def call_async(self, func: Callable[[], Awaitable[T]]) -> T:
+        """Await `func`, retrying it according to this policy.
+
+        Args:
+            func: Zero-argument callable returning an awaitable to attempt.
+
+        Returns:
+            The result of the first successful attempt.
+
+        Raises:
+            Exception: the last exception raised by `func`, once retries are exhausted.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await func()
+            except Exception as exc:
+                delay = self.next_delay(attempt, exc, time.monotonic() - started)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
@@ -0,0 +1,213 @@
+"""Payload size limits.
+
+Teams rejects webhook messages larger than about 28 KB, and reports it only in the
+response. The functions here check the size of a message before it is sent, and can split
+an oversized ``AdaptiveCard`` into several continuation cards that each fit: the card's
+``body`` is spread over several cards, and any ``Table``, ``ColumnarTable`` or ``FactSet``
+that is too large on its own is paginated by its ``rows`` or ``facts``.
+"""
+import weakref
+from typing import Any, Optional, Union
+
+from msteams_webhooks.base import Entity
+from msteams_webhooks.cards import AdaptiveCard, Card
+from msteams_webhooks.containers import ColumnarTable, FactSet, Table
+from msteams_webhooks.encoders import Encoder, default_encoder, encode_message
+from msteams_webhooks.exceptions import TeamsPayloadTooLargeError
+
+MAX_PAYLOAD_SIZE = 28 * 1024
+"""Maximum size in bytes of an encoded webhook message accepted by Teams."""
+
+# Attribute of each splittable container that may be paginated, with its JSON key.
+_PAGINATED: dict[type[Entity], tuple[str, str]] = {
+    Table: ("rows", "rows"),
+    ColumnarTable: ("rows", "rows"),
+    FactSet: ("facts", "facts"),
+}
+# Messages of each card last split by ``encode_card``, with the card's encoded JSON,
+# maximum size and encoder they were split with, so that an unchanged card is not split
+# again each time it is sent.
+_splits: "weakref.WeakKeyDictionary[Card, tuple[bytes, int, Encoder, list[bytes]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def check_size(
+    content: Union[bytes, memoryview],
+    max_size: Optional[int] = MAX_PAYLOAD_SIZE,
+) -> None:
+    """Check the size of an encoded webhook message.
+
+    Args:
+        content: The encoded message, or a view of it.
+        max_size: Maximum size in bytes, or ``None`` for no limit.
+
+    Returns:
+        None.
+
+    Raises:
+        TeamsPayloadTooLargeError: if `content` is larger than `max_size`.
+    """
+    if max_size is not None and len(content) > max_size:
+        raise TeamsPayloadTooLargeError(len(content), max_size)
+
+
+def encode_card(
+    card: Card,
+    *,
+    encoder: Optional[Encoder] = None,
+    max_size: Optional[int] = MAX_PAYLOAD_SIZE,
+    split: bool = False,
+) -> list[bytes]:
+    """Encode a card as one or more webhook messages.
+
+    The card is encoded once. It is only encoded again, page by page, if it is too large
+    and `split` is true. The messages are then kept until the card changes, and reused if
+    it is encoded again with the same `encoder` and `max_size`.
+
+    Args:
+        card: The card to encode.
+        encoder: Encoder to use. Defaults to the fastest encoder installed.
+        max_size: Maximum size in bytes of each message, or ``None`` for no limit.
+        split: If true, split an oversized card into several messages with
+            ``split_card`` instead of raising an error. Default: ``False``
+
+    Returns:
+        The encoded messages, to be sent in order.
+
+    Raises:
+        TeamsPayloadTooLargeError: if the card is too large and cannot be split.
+    """
+    encoder = encoder or default_encoder()
+    encoded = card.to_json(encoder)
+    content = encode_message(encoded)
+    if max_size is None or len(content) <= max_size:
+        return [content]
+    if not split:
+        raise TeamsPayloadTooLargeError(len(content), max_size)
+    # The card's cached JSON is only replaced when the card or its contents change.
+    cached = _splits.get(card)
+    if cached is not None and cached[0] is encoded and cached[1:3] == (max_size, encoder):
+        return list(cached[3])
+    messages = [
+        encode_message(page.to_json(encoder))
+        for page in split_card(card, max_size, encoder=encoder)
+    ]
+    _splits[card] = (encoded, max_size, encoder, messages)
+    return list(messages)
+
+
+def split_card(
+    card: Card,
+    max_size: int = MAX_PAYLOAD_SIZE,
+    *,
+    encoder: Optional[Encoder] = None,
+) -> list[Card]:
+    """Split a card into continuation cards that each fit within `max_size`.
+
+    Only an ``AdaptiveCard`` can be split. Its body elements are spread over as few cards
+    as possible, in order, and each card repeats the original card's other properties.
+    Elements that are too large to fit on a card of their own are paginated if they are
+    a ``Table`` (by rows, repeating the header row if ``first_row_as_headers`` is set), a
+    ``ColumnarTable`` (by rows, repeating its headers) or a ``FactSet`` (by facts).
+
+    The continuation cards share the original card's elements, and are snapshots: they
+    are not updated when those elements change.
+
+    Args:
+        card: The card to split.
+        max_size: Maximum size in bytes of each encoded webhook message.
+        encoder: Encoder used to measure sizes. Defaults to the fastest encoder installed.
+
+    Returns:
+        The continuation cards, or a list containing only `card` if it already fits.
+
+    Raises:
+        TeamsPayloadTooLargeError: if the card cannot be split to fit.
+    """
+    encoder = encoder or default_encoder()
+    size = len(encode_message(card.to_json(encoder)))
+    if size <= max_size:
+        return [card]
+    if not isinstance(card, AdaptiveCard) or not card.body:
+        raise TeamsPayloadTooLargeError(size, max_size)
+    shell = _replace(card, "body", [])
+    budget = max_size - len(encode_message(shell.to_json(encoder))) - len(',"body":[]')
+    elements: list[Any] = []
+    for element in card.body:
+        if len(element.to_json(encoder)) + 1 > budget:
+            elements.extend(_paginate(element, budget, encoder, size, max_size))
+        else:
+            elements.append(element)
+    sizes = [len(element.to_json(encoder)) for element in elements]
+    return [
+        _replace(card, "body", elements[start:end])
+        for start, end in _pack(sizes, budget, size, max_size)
+    ]
+
+
+def _replace(entity: Entity, name: str, value: Any) -> Any:  # noqa: ANN401
+    """Return a shallow copy of `entity` with attribute `name` set to `value`.
+
+    Attributes are set without linking the entities they hold to the copy, so that the
+    original's children don't keep a link to every page built from them.
+    """
+    clone = type(entity).__new__(type(entity))
+    for key, item in entity.__getstate__().items():
+        object.__setattr__(clone, key, item)
+    object.__setattr__(clone, name, value)
+    return clone
+
+
+def _paginate(
+    element: Entity,
+    budget: int,
+    encoder: Encoder,
+    size: int,
+    max_size: int,
+) -> list[Entity]:
+    """Split a body element into copies that each fit within `budget` bytes."""
+    paginated = next((_PAGINATED[cls] for cls in _PAGINATED if isinstance(element, cls)), None)
+    if paginated is None:
+        raise TeamsPayloadTooLargeError(size, max_size)
+    name, key = paginated
+    items = list(getattr(element, name) or [])
+    fixed: list[Any] = []
+    if isinstance(element, Table) and element.first_row_as_headers and items:
+        fixed, items = items[:1], items[1:]
+    shell = _replace(element, name, fixed)
+    overhead = len(shell.to_json(encoder)) + (0 if fixed else len(f',"{key}":[]'))
+    if isinstance(element, ColumnarTable):
+        sizes = [len(encoder(element.serialize_row(item))) for item in items]
+        if items:
+            # Without explicit columns, a page derives them from its first row, so measure
+            # a page of one row rather than an empty one.
+            sample = _replace(element, name, items[:1])
+            overhead = len(sample.to_json(encoder)) - sizes[0]
+    else:
+        sizes = [len(item.to_json(encoder)) for item in items]
+    return [
+        _replace(element, name, fixed + items[start:end])
+        for start, end in _pack(sizes, budget - overhead, size, max_size)
+    ]
+
+
+def _pack(sizes: list[int], budget: int, size: int, max_size: int) -> list[tuple[int, int]]:
+    """Group consecutive items into as few ranges as possible that fit within `budget`.
+
+    Each item is counted with one extra byte for the comma separating it from the next.
+    """
+    ranges: list[tuple[int, int]] = []
+    start = 0
+    total = 0
+    for index, item_size in enumerate(sizes):
+        cost = item_size + 1
+        if cost > budget:
+            raise TeamsPayloadTooLargeError(size, max_size)
+        if total + cost > budget:
+            ranges.append((start, index))
+            start = index
+            total = 0
+        total += cost
+    ranges.append((start, len(sizes)))
+    return ranges
@@ -0,0 +1,280 @@
+"""Durable on-disk spool of messages waiting to be sent.
+
+If Teams is unreachable, messages held in memory by retries or a ``DispatchQueue`` are
+lost when the process exits. A webhook given a ``Spool`` instead writes a message that
+fails with a transient error to disk, and replays it in the background once Teams is
+reachable again, including after a restart.
+
+The spool is an append-only log of encoded messages, split into segment files of about
+``segment_size`` bytes. Each record is prefixed with its length and CRC-32, so a record
+torn by a crash is detected and discarded when the spool is opened. A small cursor file
+records the position of the oldest message not yet sent, and is overwritten in place
+as messages are sent. Segments are deleted as soon as
+every message in them has been sent, so the spool never needs to rewrite or scan data
+that has already been replayed. Messages are delivered at least once: one sent just
+before a crash may be sent again after a restart.
+"""
+import os
+import pathlib
+import struct
+import threading
+import time
+import zlib
+from typing import BinaryIO, Optional, Union
+
+from msteams_webhooks import types
+
+# Length and CRC-32 of the message that follows.
+_HEADER = struct.Struct("<II")
+_SUFFIX = ".seg"
+_CURSOR = "cursor"
+# Segment number and offset of the oldest message not yet sent, at a fixed width so that
+# the cursor is always overwritten in a single small write.
+_CURSOR_FORMAT = "{:020d} {:020d}\n"
+
+
+class Spool:
+    """Append-only, segmented on-disk queue of encoded messages.
+
+    Messages are read back in the order they were appended, with ``peek``, and removed
+    with ``ack`` once sent. A spool is thread-safe, but its directory must only be used by
+    one ``Spool`` at a time, and a spool by one webhook.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, "os.PathLike[str]"],
+        *,
+        fsync: types.FsyncPolicies = "interval",
+        fsync_interval: float = 1.0,
+        segment_size: int = 4 * 1024 * 1024,
+    ) -> None:
+        """Open a spool, creating its directory if needed.
+
+        Messages left in the directory by a previous process are kept, and replayed
+        first.
+
+        Args:
+            directory: Directory to store the spool in.
+            fsync: When to flush appended messages to stable storage. ``"always"``
+                syncs every message before ``append`` returns. ``"interval"`` syncs at
+                most once every `fsync_interval` seconds, so a power failure may lose the
+                messages appended since the last sync. ``"never"`` leaves it to the
+                operating system, which survives a crash of the process but not of the
+                machine. Default: ``"interval"``
+            fsync_interval: Minimum time in seconds between syncs with
+                ``fsync="interval"``. Default: ``1.0``
+            segment_size: Size in bytes at which a new segment file is started.
+                Default: 4 MiB
+
+        Returns:
+            None.
+
+        Raises:
+            ValueError: if `fsync` is unknown, or `fsync_interval` or `segment_size` is
+                not positive.
+        """
+        if fsync not in ("always", "interval", "never"):
+            raise ValueError(f"Unknown fsync policy: {fsync!r}")  # noqa: TRY003
+        if fsync_interval <= 0:
+            raise ValueError("`fsync_interval` must be greater than zero.")  # noqa: TRY003
+        if segment_size < 1:
+            raise ValueError("`segment_size` must be at least 1.")  # noqa: TRY003
+        self.directory = pathlib.Path(directory)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.segment_size = segment_size
+        self.discarded = 0
+        self._lock = threading.Lock()
+        self._synced = time.monotonic()
+        self._reader: Optional[BinaryIO] = None
+        self._peeked: Optional[int] = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._head, self._offset = self._load_cursor()
+        (self.directory / _CURSOR).touch()
+        self._cursor = (self.directory / _CURSOR).open("r+b")
+        self._segments = sorted(
+            int(path.stem) for path in self.directory.glob(f"*{_SUFFIX}") if path.stem.isdigit()
+        )
+        for segment in [s for s in self._segments if s < self._head]:
+            self._path(segment).unlink()
+        self._segments = [s for s in self._segments if s >= self._head]
+        if not self._segments or self._segments[0] != self._head:
+            self._segments.insert(0, self._head)
+            self._offset = 0
+        self._pending = sum(self._recover(segment) for segment in self._segments)
+        self._writer = self._path(self._segments[-1]).open("ab")
+
+    def __len__(self) -> int:
+        """Number of messages waiting to be sent."""
+        return self._pending
+
+    def __enter__(self) -> "Spool":
+        """Use the spool as a context manager, closing it on exit."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Close the spool."""
+        self.close()
+
+    def _path(self, segment: int) -> pathlib.Path:
+        return self.directory / f"{segment:020d}{_SUFFIX}"
+
+    def _load_cursor(self) -> tuple[int, int]:
+        """Read the position of the oldest message not yet sent."""
+        try:
+            segment, offset = (self.directory / _CURSOR).read_text().split()
+            return int(segment), int(offset)
+        except (FileNotFoundError, ValueError):
+            return 0, 0
+
+    def _save_cursor(self) -> None:
+        """Record the position of the oldest message not yet sent."""
+        self._cursor.seek(0)
+        self._cursor.write(_CURSOR_FORMAT.format(self._head, self._offset).encode())
+        self._cursor.flush()
+        if self.fsync == "always":
+            os.fsync(self._cursor.fileno())
+
+    def _recover(self, segment: int) -> int:
+        """Count the messages waiting in a segment, truncating any torn or corrupt tail.
+
+        Returns:
+            The number of valid messages after the cursor.
+        """
+        path = self._path(segment)
+        path.touch()
+        count = 0
+        with path.open("r+b") as file:
+            position = self._offset if segment == self._head else 0
+            file.seek(position)
+            while True:
+                header = file.read(_HEADER.size)
+                if not header:
+                    break
+                if len(header) == _HEADER.size:
+                    length, checksum = _HEADER.unpack(header)
+                    payload = file.read(length)
+                    if len(payload) == length and zlib.crc32(payload) == checksum:
+                        position += _HEADER.size + length
+                        count += 1
+                        continue
+                file.truncate(position)
+                break
+        return count
+
+    def _sync(self, *, force: bool = False) -> None:
+        """Flush appended messages to stable storage, as the fsync policy requires."""
+        self._writer.flush()
+        if self.fsync == "never":
+            return
+        now = time.monotonic()
+        if force or self.fsync == "always" or now - self._synced >= self.fsync_interval:
+            os.fsync(self._writer.fileno())
+            self._synced = now
+
+    def _roll(self) -> None:
+        """Start a new segment for appended messages."""
+        self._sync(force=True)
+        self._writer.close()
+        self._segments.append(self._segments[-1] + 1)
+        self._writer = self._path(self._segments[-1]).open("ab")
+
+    def _retire_head(self) -> None:
+        """Delete the oldest segment, once every message in it has been sent."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        self._path(self._segments.pop(0)).unlink()
+        self._head = self._segments[0]
+        self._offset = 0
+        self._save_cursor()
+
+    def append(self, content: Union[bytes, memoryview]) -> None:
+        """Add an encoded message to the end of the spool.
+
+        Args:
+            content: The encoded message.
+
+        Returns:
+            None.
+        """
+        header = _HEADER.pack(len(content), zlib.crc32(content))
+        with self._lock:
+            if self._writer.tell() >= self.segment_size:
+                self._roll()
+            self._writer.write(header)
+            self._writer.write(content)
+            self._pending += 1
+            self._sync()
+
+    def peek(self) -> Optional[bytes]:
+        """Return the oldest message not yet sent, without removing it.
+
+        Returns:
+            The encoded message, or ``None`` if the spool is empty.
+        """
+        with self._lock:
+            while self._pending:
+                if self._reader is None:
+                    self._writer.flush()
+                    self._reader = self._path(self._head).open("rb")
+                self._reader.seek(self._offset)
+                header = self._reader.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    if len(self._segments) == 1:
+                        # The segment was truncated behind the spool's back.
+                        self._pending = 0
+                        break
+                    # The rest of the spool is in later segments.
+                    self._retire_head()
+                    continue
+                length, _ = _HEADER.unpack(header)
+                self._peeked = length
+                return self._reader.read(length)
+            return None
+
+    def ack(self) -> None:
+        """Remove the message last returned by ``peek``, once it has been sent.
+
+        Returns:
+            None.
+        """
+        with self._lock:
+            if self._peeked is None:
+                return
+            self._offset += _HEADER.size + self._peeked
+            self._peeked = None
+            self._pending -= 1
+            if not self._pending and self._writer.tell() >= self.segment_size:
+                # Fully replayed: start afresh rather than letting the segment grow.
+                self._roll()
+                while len(self._segments) > 1:
+                    self._retire_head()
+            else:
+                self._save_cursor()
+
+    def discard(self) -> None:
+        """Remove the message last returned by ``peek``, because it cannot be sent.
+
+        Counted in ``discarded``.
+
+        Returns:
+            None.
+        """
+        self.discarded += 1
+        self.ack()
+
+    def close(self) -> None:
+        """Flush appended messages to stable storage, and close the spool's files.
+
+        Returns:
+            None.
+        """
+        with self._lock:
+            self._sync(force=True)
+            self._writer.close()
+            self._cursor.close()
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
@@ -0,0 +1,229 @@
+"""Streaming JSON encoding.
+
+Encoding a card normally builds its complete data structure with ``serialize()``, and
+then encodes that into a separate JSON string, so both copies are held in memory at
+once. A ``MessageWriter`` instead walks the card's entities and writes their JSON
+directly to a buffer, which is taken from a small pool and reused for later messages,
+keeping the memory it has grown to. The webhook posts the buffer through a
+``memoryview``, without copying it:
+
+    >>> channel = TeamsWebhook("<your-webhook-url>", writer=MessageWriter())
+
+Entities whose JSON or data structure is already cached are written from the cache.
+Entities that override ``_serialize()`` or ``serialize()`` are written by encoding their
+data structure.
+"""
+import io
+import json
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Optional
+
+from msteams_webhooks.base import Entity, Field, _camel_case, _type_first
+from msteams_webhooks.encoders import Encoder, json_encoder
+
+# How to write instances of an entity class: the fragments that open and close the
+# object, whether its first field needs a leading comma, and the attribute name, omit
+# rule, kind and encoded key of each field. ``None`` for classes that override
+# ``_serialize()`` or ``serialize()``, which are written by encoding their data structure.
+_Plan = Optional[tuple[bytes, bytes, bool, list[tuple[str, str, str, bytes]]]]
+
+_MESSAGE_START = b'{"type":"message","attachments":['
+_MESSAGE_END = b"]}"
+
+_encode_string = json.encoder.encode_basestring  # type: ignore[attr-defined]
+
+
+def _encode_value(value: Any, encoder: Encoder) -> bytes:  # noqa: ANN401
+    """Encode a single attribute value."""
+    if value.__class__ is str:
+        return _encode_string(value).encode()
+    if value is None:
+        return b"null"
+    if value is True:
+        return b"true"
+    if value is False:
+        return b"false"
+    if value.__class__ is int:
+        return str(value).encode()
+    return encoder(value)
+
+
+class MessageWriter:
+    """Encodes cards as webhook messages into reusable buffers.
+
+    A writer may be shared by several webhooks, and used from several threads.
+    """
+
+    def __init__(self, *, max_buffers: int = 4, encoder: Optional[Encoder] = None) -> None:
+        """Create a writer.
+
+        Args:
+            max_buffers: Maximum number of idle buffers to keep for reuse. Default: ``4``
+            encoder: Encoder used for cached data structures, and for attribute values
+                other than strings, booleans and ``None``. Default: ``json_encoder``
+
+        Returns:
+            None.
+
+        Raises:
+            None.
+        """
+        self.max_buffers = max_buffers
+        self.encoder = encoder or json_encoder
+        self._buffers: list[io.BytesIO] = []
+        self._lock = threading.Lock()
+        self._plans: dict[type[Entity], _Plan] = {}
+
+    def _acquire(self) -> io.BytesIO:
+        """Take a buffer from the pool, or create one."""
+        with self._lock:
+            if self._buffers:
+                return self._buffers.pop()
+        return io.BytesIO()
+
+    def _release(self, buffer: io.BytesIO) -> None:
+        """Return a buffer to the pool, to be overwritten from the start."""
+        try:
+            # Truncating fails if a view of the buffer is still held, in which case it
+            # must not be reused.
+            buffer.truncate()
+        except BufferError:
+            return
+        buffer.seek(0)
+        with self._lock:
+            if len(self._buffers) < self.max_buffers:
+                self._buffers.append(buffer)
+
+    @contextmanager
+    def message(self, card: Entity) -> Iterator[memoryview]:
+        """Encode a card as a complete webhook message.
+
+        The buffer is returned to the pool when the ``with`` block exits, so the view
+        must not be used after that.
+
+        Args:
+            card: The card to encode.
+
+        Yields:
+            A read-only view of the encoded message.
+        """
+        buffer = self._acquire()
+        try:
+            buffer.write(_MESSAGE_START)
+            self.write(card, buffer)
+            buffer.write(_MESSAGE_END)
+            size = buffer.tell()
+            with buffer.getbuffer() as view, view[:size] as data, data.toreadonly() as content:
+                yield content
+        finally:
+            self._release(buffer)
+
+    def write(self, entity: Entity, out: BinaryIO) -> None:
+        """Write the JSON encoding of an entity to a binary stream.
+
+        Walks the entity and the entities it contains with an explicit stack, so the
+        depth of nesting is not limited by the interpreter's recursion limit.
+
+        Args:
+            entity: The entity to encode.
+            out: The stream to write to, e.g. an ``io.BytesIO`` or a file.
+
+        Returns:
+            None.
+        """
+        encoder = self.encoder
+        plans = self._plans
+        emit = out.write
+        # Each item is an encoded fragment, an entity, or a list of entities.
+        stack: list[Any] = [entity]
+        pop = stack.pop
+        while stack:
+            item = pop()
+            if item.__class__ is bytes:
+                emit(item)
+            elif isinstance(item, Entity):
+                if item._json is not None:
+                    emit(item._json)
+                elif item._payload is not None:
+                    emit(encoder(item._payload))
+                else:
+                    cls = item.__class__
+                    plan = plans[cls] if cls in plans else self._plan(cls)
+                    if plan is None:
+                        build = item.serialize if item._overrides_serialize else item._serialize
+                        emit(encoder(build()))
+                    else:
+                        self._write_fields(item, plan, emit, stack)
+            elif not item:
+                emit(b"[]")
+            else:
+                # Push "[", item, ",", item, ..., "]" in reverse order.
+                stack.append(b"]")
+                for index in range(len(item) - 1, 0, -1):
+                    stack.append(item[index])
+                    stack.append(b",")
+                stack.append(item[0])
+                emit(b"[")
+
+    def _write_fields(
+        self,
+        entity: Entity,
+        plan: tuple[bytes, bytes, bool, list[tuple[str, str, str, bytes]]],
+        emit: Callable[[bytes], Any],
+        stack: list[Any],
+    ) -> None:
+        """Write an entity's fields up to its first child entity, and push the rest."""
+        start, end, comma, fields = plan
+        encoder = self.encoder
+        emit(start)
+        parts: list[Any] = []
+        separator = b"," if comma else b""
+        for name, omit, kind, key in fields:
+            value = getattr(entity, name)
+            if (omit == "falsy" and not value) or (omit == "none" and value is None):
+                continue
+            if kind in {"entity", "entities"}:
+                parts.extend((separator + key, value))
+            else:
+                if kind == "str":
+                    encoded = _encode_string(str(value)).encode()
+                elif kind == "url":
+                    encoded = b'{"url":' + _encode_value(value, encoder) + b"}"
+                elif kind == "urls":
+                    urls = (b'{"url":' + _encode_value(x, encoder) + b"}" for x in value)
+                    encoded = b"[" + b",".join(urls) + b"]"
+                else:
+                    encoded = _encode_value(value, encoder)
+                if parts:
+                    parts.append(separator + key + encoded)
+                else:
+                    emit(separator + key + encoded)
+            separator = b","
+        parts.append(end)
+        stack.extend(reversed(parts))
+
+    def _plan(self, cls: type[Entity]) -> _Plan:
+        """Prepare the fragments needed to write instances of `cls`."""
+        plan: _Plan = None
+        if cls._serialize_node is not Entity._serialize_node and not cls._overrides_serialize:
+            start = b"{"
+            end = b"}"
+            if cls._content_type:
+                start = b'{"contentType":' + json_encoder(cls._content_type) + b',"content":{'
+                end = b"}}"
+            type_first = _type_first(cls)
+            if type_first:
+                start += b'"type":' + json_encoder(cls._type)
+            fields = [
+                (field.name, field.omit, field.kind, _encode_key(field)) for field in cls._schema
+            ]
+            plan = (start, end, type_first, fields)
+        self._plans[cls] = plan
+        return plan
+
+
+def _encode_key(field: Field) -> bytes:
+    """Encode the JSON key of a field, followed by a colon."""
+    return json_encoder(field.key or _camel_case(field.name)) + b":"
@@ -0,0 +1,130 @@
+"""Card templates.
+
+Most messages sent by a given application share one layout and differ only in a few
+values. A ``CardTemplate`` is built once from a card containing ``Placeholder`` values
+and compiles it into pre-encoded JSON fragments. Rendering the template then only encodes
+the values that change, without building or walking any card objects:
+
+    >>> facts = [Fact("Host", Placeholder("host")), Fact("Severity", Placeholder("severity"))]
+    >>> card = AdaptiveCard(body=[TextBlock(Placeholder("title")), FactSet(facts=facts)])
+    >>> template = CardTemplate(card)
+    >>> channel.send_template(template, title="Disk full", host="web01", severity="critical")
+"""
+import json
+import re
+from typing import Any
+
+from msteams_webhooks.cards import Card
+
+_TOKEN = re.compile(r'"\\u0000\\u0001([A-Za-z_]\w*)\\u0000"|\\u0000([A-Za-z_]\w*)\\u0000')
+
+
+class Placeholder(str):
+    """A named slot in a ``CardTemplate``, filled in when the template is rendered.
+
+    Use a placeholder anywhere a card accepts a value. When a placeholder is the entire
+    value, it may be rendered as any JSON value (string, number, boolean, etc.). A
+    placeholder may also be embedded in a longer string, e.g.
+    ``f"Host {Placeholder('host')} is down"``, in which case it is rendered as text.
+    """
+
+    name: str
+
+    def __new__(cls, name: str) -> "Placeholder":
+        """Create a placeholder.
+
+        Args:
+            name: Name of the slot. Must be a valid Python identifier, since values are
+                passed to ``CardTemplate.render`` as keyword arguments.
+
+        Returns:
+            The new placeholder.
+
+        Raises:
+            ValueError: if `name` is not a valid identifier.
+        """
+        if not name.isidentifier():
+            msg = f"Placeholder name {name!r} is not a valid identifier."
+            raise ValueError(msg)
+        placeholder = super().__new__(cls, f"\x00{name}\x00")
+        placeholder.name = name
+        return placeholder
+
+    def __repr__(self) -> str:
+        """Show the placeholder's name."""
+        return f"Placeholder({self.name!r})"
+
+
+def _mark(value: Any) -> Any:  # noqa: ANN401
+    """Copy a serialized card, marking placeholders that make up an entire value."""
+    if isinstance(value, dict):
+        return {key: _mark(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_mark(item) for item in value]
+    if isinstance(value, Placeholder):
+        return f"\x00\x01{value.name}\x00"
+    return value
+
+
+class CardTemplate:
+    """A card compiled into pre-encoded JSON fragments and named slots.
+
+    The card is serialized and encoded once, when the template is created. Later changes
+    to the card do not affect the template.
+    """
+
+    def __init__(self, card: Card) -> None:
+        """Compile a card containing ``Placeholder`` values.
+
+        Args:
+            card: The card to compile.
+
+        Returns:
+            None.
+
+        Raises:
+            None.
+        """
+        message = {"type": "message", "attachments": [_mark(card.serialize())]}
+        text = json.dumps(message, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+        chunks: list[bytes] = []
+        slots: list[tuple[int, str, bool]] = []
+        position = 0
+        for match in _TOKEN.finditer(text):
+            chunks.append(text[position : match.start()].encode())
+            full, embedded = match.groups()
+            slots.append((len(chunks), full or embedded, full is not None))
+            chunks.append(b"")
+            position = match.end()
+        chunks.append(text[position:].encode())
+        self._chunks = chunks
+        self._slots = slots
+
+    @property
+    def placeholders(self) -> frozenset[str]:
+        """Names of the placeholders in the template."""
+        return frozenset(name for _, name, _ in self._slots)
+
+    def render(self, **values: Any) -> bytes:  # noqa: ANN401
+        """Fill in the template's placeholders.
+
+        Args:
+            **values: Value for each placeholder, by name. Values for placeholders that
+                make up an entire card value may be any JSON-serializable object. Values
+                for placeholders embedded in text are converted with ``str()``.
+
+        Returns:
+            The complete webhook message, as UTF-8 encoded JSON, ready to be posted.
+
+        Raises:
+            KeyError: if no value was given for a placeholder.
+        """
+        chunks = self._chunks.copy()
+        for index, name, full in self._slots:
+            value = values[name]
+            if full:
+                encoded = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+            else:
+                encoded = json.dumps(str(value), ensure_ascii=False)[1:-1]
+            chunks[index] = encoded.encode()
+        return b"".join(chunks)
@@ -0,0 +1,272 @@
+"""Local stand-in for a Teams webhook, for offline tests and load tests.
+
+Teams can't be reached from CI, and shouldn't be flooded by load tests. A
+``MockTeamsServer`` answers like a Teams webhook instead: ``"1"`` for a message it
+accepts, a 200 response with ``400`` in the body for a malformed one, a 200 response
+with ``429`` in the body when its rate limit is exceeded, and a 413 response for a
+payload over the size limit. It can also wait before answering, to stand in for network
+and server latency.
+
+Plug it into a webhook through the ``transport`` parameter::
+
+    server = MockTeamsServer(rate=4, burst=4, latency=0.05)
+    channel = TeamsWebhook(url, transport=server.transport())
+
+The server is also an ASGI application, which can be served over the network by an ASGI
+server such as ``uvicorn``, to load test a separate process.
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+from collections.abc import Awaitable, MutableMapping
+from typing import Any, Callable, Optional
+
+import httpx
+
+from msteams_webhooks.sizing import MAX_PAYLOAD_SIZE
+
+_ADAPTIVE = "application/vnd.microsoft.card.adaptive"
+# Teams reports errors as text naming the HTTP status of the failed delivery.
+_FAILED = (
+    "Webhook message delivery failed with error: Microsoft Teams endpoint returned HTTP error {}"
+)
+_Scope = MutableMapping[str, Any]
+_Receive = Callable[[], Awaitable[MutableMapping[str, Any]]]
+_Send = Callable[[MutableMapping[str, Any]], Awaitable[None]]
+
+
+class MockTeamsServer:
+    """Fake Teams webhook that answers requests in process, like Teams does.
+
+    Each request is checked in turn against the rate limit, the size limit and the
+    webhook message schema, and answered accordingly. Rate limits are applied to each
+    webhook URL separately, as Teams does, so several webhooks may share one server.
+    Messages accepted are decoded and kept in ``messages``, in the order received, and
+    every response is counted.
+
+    A server is thread-safe, and may serve ``TeamsWebhook`` and ``AsyncTeamsWebhook``
+    instances at the same time.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: Optional[float] = None,
+        burst: int = 1,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        max_payload_size: Optional[int] = MAX_PAYLOAD_SIZE,
+        keep_messages: bool = True,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Construct a server.
+
+        Args:
+            rate: Optional sustained number of requests accepted per second by each URL.
+                Further requests are answered with ``429``. No limit if ``None``.
+            burst: Maximum number of requests accepted back-to-back by a URL after a
+                period of inactivity, with `rate`. Default: ``1``
+            latency: Time in seconds to wait before answering each request.
+                Default: ``0.0``
+            jitter: Maximum time in seconds, chosen at random for each request, to wait
+                in addition to `latency`. Default: ``0.0``
+            max_payload_size: Maximum size in bytes of a message accepted. ``None``
+                disables the check. Default: ``MAX_PAYLOAD_SIZE`` (28 KB)
+            keep_messages: If false, accepted messages are only counted, not kept, so
+                that long load tests don't use ever more memory. Default: ``True``
+            seed: Optional seed for the random jitter, to make runs reproducible.
+
+        Returns:
+            None.
+
+        Raises:
+            ValueError: if `rate` is not positive, `burst` is less than one, or
+                `latency` or `jitter` is negative.
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("`rate` must be greater than zero.")  # noqa: TRY003
+        if burst < 1:
+            raise ValueError("`burst` must be at least 1.")  # noqa: TRY003
+        if latency < 0 or jitter < 0:
+            raise ValueError("`latency` and `jitter` must not be negative.")  # noqa: TRY003
+        self.rate = rate
+        self.burst = burst
+        self.latency = latency
+        self.jitter = jitter
+        self.max_payload_size = max_payload_size
+        self.keep_messages = keep_messages
+        self.messages: list[dict[str, Any]] = []
+        self.accepted = 0
+        self.malformed = 0
+        self.rate_limited = 0
+        self.too_large = 0
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._random = random.Random(seed)  # noqa: S311
+        self._lock = threading.Lock()
+
+    @property
+    def requests(self) -> int:
+        """Number of requests answered."""
+        return self.accepted + self.malformed + self.rate_limited + self.too_large
+
+    def reset(self) -> None:
+        """Forget the messages received, the counts, and the state of the rate limits.
+
+        Returns:
+            None.
+        """
+        with self._lock:
+            self.messages = []
+            self.accepted = self.malformed = self.rate_limited = self.too_large = 0
+            self._buckets = {}
+
+    def _allow(self, url: str) -> bool:
+        """Take a token from the URL's bucket, if there is one. Must hold the lock."""
+        if self.rate is None:
+            return True
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(url, (float(self.burst), now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        allowed = tokens >= 1
+        self._buckets[url] = (tokens - 1 if allowed else tokens, now)
+        return allowed
+
+    def respond(self, url: str, content: bytes) -> tuple[int, str, float]:
+        """Decide how to answer a request, without waiting.
+
+        Args:
+            url: The URL posted to. Rate limits are applied to each URL separately.
+            content: The body of the request.
+
+        Returns:
+            The status code and text of the response, and the time in seconds to wait
+            before sending it.
+        """
+        message = _parse(content)
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            if not self._allow(url):
+                self.rate_limited += 1
+                return 200, _FAILED.format(429), delay
+            if self.max_payload_size is not None and len(content) > self.max_payload_size:
+                self.too_large += 1
+                return 413, _FAILED.format(413), delay
+            if message is None:
+                self.malformed += 1
+                return 200, _FAILED.format(400), delay
+            self.accepted += 1
+            if self.keep_messages:
+                self.messages.append(message)
+            return 200, "1", delay
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        status, text, delay = self.respond(str(request.url), request.read())
+        if delay:
+            time.sleep(delay)
+        return httpx.Response(status, text=text)
+
+    async def _handle_async(self, request: httpx.Request) -> httpx.Response:
+        status, text, delay = self.respond(str(request.url), await request.aread())
+        if delay:
+            await asyncio.sleep(delay)
+        return httpx.Response(status, text=text)
+
+    def transport(self) -> httpx.MockTransport:
+        """Return a transport that sends a ``TeamsWebhook``'s requests to the server.
+
+        Latency is waited out with ``time.sleep``, blocking the sending thread as a real
+        request would.
+
+        Returns:
+            A transport to pass as the webhook's `transport`.
+        """
+        return httpx.MockTransport(self._handle)
+
+    def async_transport(self) -> httpx.MockTransport:
+        """Return a transport that sends an ``AsyncTeamsWebhook``'s requests to the server.
+
+        Latency is waited out with ``asyncio.sleep``, so concurrent requests wait
+        concurrently.
+
+        Returns:
+            A transport to pass as the webhook's `transport`.
+        """
+        return httpx.MockTransport(self._handle_async)
+
+    async def __call__(self, scope: _Scope, receive: _Receive, send: _Send) -> None:
+        """Serve the server as an ASGI application.
+
+        Only ``POST`` requests are answered; anything else gets a 405 response. Latency
+        is waited out with ``asyncio.sleep``, so the application must be run on an
+        ``asyncio`` event loop.
+        """
+        if scope["type"] == "lifespan":
+            while True:
+                event = await receive()
+                if event["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif event["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            event = await receive()
+            body += event.get("body", b"")
+            if not event.get("more_body"):
+                break
+        if scope["method"] == "POST":
+            url = f"{scope.get('scheme', 'http')}://{_host(scope)}{scope['path']}"
+            status, text, delay = self.respond(url, body)
+            if delay:
+                await asyncio.sleep(delay)
+        else:
+            status, text = 405, "Method Not Allowed"
+        headers = [(b"content-type", b"text/plain; charset=utf-8")]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": text.encode()})
+
+
+def _host(scope: _Scope) -> str:
+    """Return the host a request was sent to, from its headers or the server address."""
+    for name, value in scope.get("headers", []):
+        if name == b"host":
+            return value.decode("latin-1")
+    server = scope.get("server")
+    return f"{server[0]}:{server[1]}" if server else "localhost"
+
+
+def _parse(content: bytes) -> Optional[dict[str, Any]]:
+    """Decode a webhook message, returning ``None`` if it doesn't fit the schema.
+
+    A message is either ``{"text": "..."}``, or ``{"type": "message", "attachments":
+    [...]}`` with at least one attachment.
+    """
+    try:
+        message = json.loads(content)
+    except ValueError:
+        return None
+    if not isinstance(message, dict):
+        return None
+    if "attachments" not in message:
+        return message if isinstance(message.get("text"), str) else None
+    attachments = message["attachments"]
+    if message.get("type") != "message" or not isinstance(attachments, list) or not attachments:
+        return None
+    return message if all(_valid_attachment(a) for a in attachments) else None
+
+
+def _valid_attachment(attachment: object) -> bool:
+    """Check that an attachment has a ``contentType`` and a ``content`` object.
+
+    Adaptive card attachments must hold an ``AdaptiveCard``.
+    """
+    if not isinstance(attachment, dict) or not isinstance(attachment.get("content"), dict):
+        return False
+    content_type = attachment.get("contentType")
+    if content_type == _ADAPTIVE:
+        return attachment["content"].get("type") == "AdaptiveCard"
+    return isinstance(content_type, str)
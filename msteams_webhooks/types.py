@@ -1,15 +1,21 @@
 """msteams_webhooks.types."""
 from typing import Literal, Union
 
+CircuitStates = Literal["closed", "open", "half_open"]
 Colors = Literal["default", "accent", "good", "warning", "attention", "light", "dark"]
 ColumnWidthTypes = Union[Literal["auto", "stretch"], str]
 ContainerStyleTypes = Literal["default", "emphasis", "good", "attention", "warning", "accent"]
+DigestLayouts = Literal["facts", "table"]
 FontSizes = Literal["default", "small", "medium", "large", "extraLarge"]
 FontTypes = Literal["default", "monospace"]
 FontWeights = Literal["default", "lighter", "bolder"]
+FsyncPolicies = Literal["always", "interval", "never"]
 HorizontalAlignmentTypes = Literal["left", "center", "right"]
 ImageSizeTypes = Literal["auto", "stretch", "small", "medium", "large"]
 ImageStyleTypes = Literal["default", "person"]
+OverflowPolicies = Literal["block", "drop_oldest", "drop_newest"]
+Priorities = Literal["high", "normal", "low"]
+RequestOutcomes = Literal["ok", "rate_limited", "error"]
 SpacingTypes = Literal["default", "none", "small", "medium", "large", "extraLarge", "padding"]
 TextBlockStyles = Literal["default", "heading"]
 VerticalAlignmentTypes = Literal["top", "center", "bottom"]
@@ -3,6 +3,8 @@ import nox
 nox.options.error_on_missing_interpreters = False
 nox.options.stop_on_first_error = False
 nox.options.default_venv_backend = "venv"
+# Benchmarks are run on request only: nox -s benchmarks
+nox.options.sessions = ["unit_tests", "linting"]
 
 
 @nox.session(python=["3.9", "3.10", "3.11"])
@@ -17,3 +19,15 @@ def linting(session) -> None:
     session.run("ruff", "check", "msteams_webhooks/")
     session.run("black", "--check", "msteams_webhooks/")
     session.run("pyright", "msteams_webhooks/")
+
+
+@nox.session(python="3.11")
+def benchmarks(session) -> None:
+    session.install(".")
+    session.run(
+        "python",
+        "benchmarks/bench_suite.py",
+        "--json",
+        "benchmark-results.json",
+        *session.posargs,
+    )
@@ -0,0 +1,238 @@
+"""Entity base class unit tests."""
+import copy
+import gc
+import json
+import pickle
+
+import pytest
+
+from msteams_webhooks import (
+    AdaptiveCard,
+    Column,
+    ColumnSet,
+    Container,
+    Fact,
+    FactSet,
+    Image,
+    Table,
+    TableCell,
+    TableRow,
+    TextBlock,
+)
+from msteams_webhooks.actions import OpenURLAction
+from msteams_webhooks.base import Entity, Field, _serialize_tree
+from msteams_webhooks.encoders import json_encoder
+
+
+def build_card() -> tuple[AdaptiveCard, TextBlock]:
+    text_block = TextBlock("Original")
+    card = AdaptiveCard(
+        body=[ColumnSet(columns=[Column(items=[Container(items=[text_block])])])],
+    )
+    return card, text_block
+
+
+def test_serialize_is_cached() -> None:
+    card, _ = build_card()
+    assert card.serialize() is card.serialize()
+    assert card.to_json() is card.to_json()
+
+
+def test_attribute_change_invalidates_ancestors() -> None:
+    card, text_block = build_card()
+    first = card.serialize()
+    text_block.text = "Changed"
+    second = card.serialize()
+    assert second is not first
+    assert second["content"]["body"][0]["columns"][0]["items"][0]["items"][0]["text"] == "Changed"
+    assert json.loads(card.to_json()) == second
+
+
+def test_list_change_invalidates() -> None:
+    card, _ = build_card()
+    first = card.serialize()
+    card.body.append(TextBlock("Appended"))
+    assert card.serialize()["content"]["body"][-1]["text"] == "Appended"
+    card.body[-1].text = "Replaced"
+    assert card.serialize()["content"]["body"][-1]["text"] == "Replaced"
+    del card.body[-1]
+    assert card.serialize() == first
+
+
+def test_shared_entity_invalidates_every_parent() -> None:
+    text_block = TextBlock("Shared")
+    card1 = AdaptiveCard(body=[text_block])
+    card2 = AdaptiveCard(body=[Container(items=[text_block])])
+    card1.serialize()
+    card2.serialize()
+    text_block.text = "Changed"
+    assert card1.serialize()["content"]["body"][0]["text"] == "Changed"
+    assert card2.serialize()["content"]["body"][0]["items"][0]["text"] == "Changed"
+
+
+def test_dead_parents_are_dropped() -> None:
+    text_block = TextBlock("Shared")
+    card = AdaptiveCard(body=[text_block])
+    for _ in range(50):
+        Container(items=[text_block])
+    gc.collect()
+    # Links to containers that no longer exist are dropped on the next change.
+    text_block.text = "Changed"
+    assert text_block._parents is not None
+    assert [ref() for ref in text_block._parents] == [card]
+    Container(items=[text_block])
+    gc.collect()
+    Container(items=[text_block])
+    assert len(text_block._parents) == 2  # noqa: PLR2004
+
+
+def test_deepcopy_is_independent() -> None:
+    card, text_block = build_card()
+    card.serialize()
+    clone = copy.deepcopy(card)
+    clone.body.append(TextBlock("Only in clone"))
+    assert len(clone.serialize()["content"]["body"]) == 2  # noqa: PLR2004
+    text_block.text = "Only in original"
+    assert len(card.serialize()["content"]["body"]) == 1
+    assert "Only in original" not in clone.to_json().decode()
+
+
+def test_entities_have_no_instance_dict() -> None:
+    card, text_block = build_card()
+    assert not hasattr(card, "__dict__")
+    assert not hasattr(text_block, "__dict__")
+    assert TextBlock._fields == TextBlock.__slots__
+    with pytest.raises(AttributeError):
+        text_block.colour = "good"  # type: ignore[attr-defined]
+
+
+def test_pickle_round_trip() -> None:
+    card, _ = build_card()
+    restored = pickle.loads(pickle.dumps(card))  # noqa: S301
+    assert restored.serialize() == card.serialize()
+    restored.body[0].columns[0].items[0].items[0].text = "Changed"
+    assert "Changed" in json.dumps(restored.serialize())
+
+
+def test_subclass_without_slots() -> None:
+    class Note(TextBlock):
+        def __init__(self, text: str, author: str) -> None:
+            super().__init__(text)
+            self.author = author
+
+    note = copy.copy(Note("Hello", "me"))
+    assert note.author == "me"
+    assert note.text == "Hello"
+
+
+def test_matches_hand_written_serializers() -> None:
+    card = AdaptiveCard(
+        body=[
+            TextBlock("Title", weight="bolder", wrap=True),
+            Image("https://example.com/a.png", alt_text="A"),
+            ColumnSet(columns=[Column(items=[Container(items=[TextBlock("Nested")])])]),
+            FactSet(facts=[Fact("Host", "web01")]),
+            Table(rows=[TableRow(cells=[TableCell(items=[TextBlock("Cell")])])]),
+        ],
+        actions=[OpenURLAction("https://example.com/", title="Open")],
+    )
+    # Output of the hand-written serialize() methods that the schemas replaced.
+    expected = (
+        b'{"contentType":"application/vnd.microsoft.card.adaptive","content":{'
+        b'"$schema":"http://adaptivecards.io/schemas/adaptive-card.json",'
+        b'"type":"AdaptiveCard","version":"1.6","body":['
+        b'{"type":"TextBlock","text":"Title","weight":"bolder","wrap":true},'
+        b'{"type":"Image","url":"https://example.com/a.png","altText":"A"},'
+        b'{"type":"ColumnSet","columns":[{"type":"Column","items":['
+        b'{"type":"Container","items":[{"type":"TextBlock","text":"Nested"}]}]}]},'
+        b'{"type":"FactSet","facts":[{"title":"Host","value":"web01"}]},'
+        b'{"type":"Table","rows":[{"type":"TableRow","cells":['
+        b'{"type":"TableCell","items":[{"type":"TextBlock","text":"Cell"}]}]}]}],'
+        b'"actions":[{"type":"Action.OpenUrl","url":"https://example.com/","title":"Open"}]}}'
+    )
+    assert card.to_json(json_encoder) == expected
+    assert json_encoder(_serialize_tree(copy.deepcopy(card))) == expected
+
+
+def test_schema() -> None:
+    class Badge(Entity):
+        __slots__ = ("count", "icon_url", "label", "links", "visible")
+        _type = "Badge"
+        _schema = (
+            Field("label", omit="never"),
+            Field("icon_url", key="icon"),
+            Field("visible", omit="none"),
+            Field("count", kind="str"),
+            Field("links", kind="entities"),
+        )
+
+        def __init__(self, label: str, **kwargs: object) -> None:
+            self.label = label
+            self.icon_url = kwargs.get("icon_url")
+            self.visible = kwargs.get("visible")
+            self.count = kwargs.get("count")
+            self.links = kwargs.get("links", [])
+
+    assert Badge(None).serialize() == {"type": "Badge", "label": None}  # type: ignore[arg-type]
+    badge = Badge("New", icon_url="x.png", visible=False, count=3, links=[TextBlock("a")])
+    assert badge.serialize() == {
+        "type": "Badge",
+        "label": "New",
+        "icon": "x.png",
+        "visible": False,
+        "count": "3",
+        "links": [{"type": "TextBlock", "text": "a"}],
+    }
+    assert badge.serialize() is badge.serialize()
+    assert badge._serialize() == badge.serialize()
+
+
+def test_override_serialize() -> None:
+    class Shout(TextBlock):
+        __slots__ = ()
+
+        def _serialize(self) -> dict[str, object]:
+            return {**super()._serialize(), "text": self.text.upper()}
+
+    assert Shout("hi").serialize() == {"type": "TextBlock", "text": "HI"}
+
+
+def test_override_public_serialize() -> None:
+    class Upper(TextBlock):
+        __slots__ = ()
+
+        def serialize(self) -> dict[str, object]:
+            payload = super().serialize()
+            return {**payload, "text": payload["text"].upper()}
+
+    card = AdaptiveCard(body=[Upper("hi"), Container(items=[Upper("nested")])])
+    body = card.serialize()["content"]["body"]
+    assert body[0]["text"] == "HI"
+    assert body[1]["items"][0]["text"] == "NESTED"
+    assert json.loads(card.to_json()) == card.serialize()
+    assert _serialize_tree(AdaptiveCard(body=[Upper("deep")])) == AdaptiveCard(
+        body=[TextBlock("DEEP")],
+    ).serialize()
+
+
+def test_explicit_stack_matches_recursion() -> None:
+    card, text_block = build_card()
+    shared = TextBlock("Shared")
+    card.body.extend([Container(items=[shared]), Container(items=[shared])])
+    expected = copy.deepcopy(card.serialize())
+    card, text_block = copy.deepcopy((card, text_block))
+    assert _serialize_tree(card) == expected
+    assert text_block.serialize() is card.serialize()["content"]["body"][0]["columns"][0][
+        "items"
+    ][0]["items"][0]
+
+
+def test_deeply_nested_card() -> None:
+    depth = 5000
+    element: Entity = TextBlock("Deep")
+    for _ in range(depth):
+        element = Container(items=[element])
+    payload = AdaptiveCard(body=[element]).serialize()["content"]["body"][0]
+    for _ in range(depth):
+        payload = payload["items"][0]
+    assert payload == {"type": "TextBlock", "text": "Deep"}
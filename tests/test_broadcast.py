@@ -0,0 +1,98 @@
+"""Broadcaster unit tests."""
+import asyncio
+import time
+from typing import Any
+
+import httpx
+import pytest
+
+from msteams_webhooks import AdaptiveCard, AsyncConnectionPool, Broadcaster, TextBlock, encoders
+from msteams_webhooks.exceptions import TeamsPayloadTooLargeError, TeamsWebhookError
+
+URLS = [f"https://example.webhook.office.com/webhookb2/channel-{n}" for n in range(30)]
+
+
+def card(text: str) -> AdaptiveCard:
+    return AdaptiveCard(body=[TextBlock(text)])
+
+
+def test_broadcast_encodes_once() -> None:
+    received: dict[str, bytes] = {}
+    encoded = 0
+
+    def encoder(data: Any) -> bytes:  # noqa: ANN401
+        nonlocal encoded
+        encoded += 1
+        return encoders.json_encoder(data)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received[str(request.url)] = request.content
+        if request.url.path.endswith("channel-7"):
+            return httpx.Response(200, text="Webhook message delivery failed with error: 400")
+        return httpx.Response(200, text="1")
+
+    async def run() -> None:
+        pool = AsyncConnectionPool(transport=httpx.MockTransport(handler))
+        async with Broadcaster(URLS + URLS[:5], pool=pool, encoder=encoder) as broadcaster:
+            assert len(broadcaster) == 30  # noqa: PLR2004
+            results = await broadcaster.broadcast(card("Database down"))
+        assert list(results) == URLS
+        failed = [url for url, result in results.items() if not result.ok]
+        assert failed == [URLS[7]]
+        assert isinstance(results[URLS[7]].exception, TeamsWebhookError)
+        assert results[URLS[0]].response is not None
+        assert results[URLS[0]].card.body[0].text == "Database down"
+        # The pool was passed in, so it is left open, with one client for the host.
+        assert len(pool) == 1
+        await pool.close()
+
+    asyncio.run(run())
+    assert encoded == 1
+    assert len(received) == 30  # noqa: PLR2004
+    assert len(set(received.values())) == 1
+
+
+def test_broadcast_paced_per_url() -> None:
+    sent: list[tuple[str, float]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append((str(request.url), time.monotonic()))
+        return httpx.Response(200, text="1")
+
+    async def run() -> None:
+        pool = AsyncConnectionPool(transport=httpx.MockTransport(handler))
+        broadcaster = Broadcaster(URLS[:3], pool=pool, rate=20)
+        started = time.monotonic()
+        await broadcaster.broadcast(card("first"))
+        await broadcaster.broadcast(card("second"))
+        # Each URL waits for its own limiter, so the second round costs one interval.
+        assert time.monotonic() - started < 0.2  # noqa: PLR2004
+        await broadcaster.close()
+        await pool.close()
+
+    asyncio.run(run())
+    for url in URLS[:3]:
+        first, second = [at for sent_to, at in sent if sent_to == url]
+        assert second - first >= 0.04  # noqa: PLR2004
+
+
+def test_broadcast_too_large() -> None:
+    requests: list[httpx.Request] = []
+
+    async def run() -> None:
+        pool = AsyncConnectionPool(
+            transport=httpx.MockTransport(lambda r: requests.append(r) or httpx.Response(200)),
+        )
+        broadcaster = Broadcaster(URLS, pool=pool, max_payload_size=100)
+        with pytest.raises(TeamsPayloadTooLargeError):
+            await broadcaster.broadcast(card("x" * 200))
+        await broadcaster.close()
+        await pool.close()
+
+    asyncio.run(run())
+    assert not requests
+
+
+def test_invalid_concurrency() -> None:
+    with pytest.raises(ValueError, match="concurrency"):
+        Broadcaster(URLS, concurrency=0)
@@ -0,0 +1,196 @@
+"""Circuit breaker unit tests."""
+import asyncio
+import pathlib
+import time
+
+import httpx
+import pytest
+from conftest import FakeClock
+
+from msteams_webhooks import AsyncTeamsWebhook, CircuitBreaker, Spool, TeamsWebhook
+from msteams_webhooks.exceptions import (
+    TeamsCircuitOpenError,
+    TeamsResponseError,
+    TeamsWebhookError,
+)
+
+
+def fail() -> None:
+    raise TeamsResponseError(500, "Internal Server Error")
+
+
+def test_opens_after_threshold(clock: FakeClock) -> None:
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    for _ in range(2):
+        with pytest.raises(TeamsWebhookError):
+            breaker.call(fail)
+    assert breaker.call(lambda: "ok") == "ok"
+    # Only consecutive failures count.
+    for _ in range(2):
+        with pytest.raises(TeamsWebhookError):
+            breaker.call(fail)
+    assert breaker.state == "closed"
+    with pytest.raises(TeamsWebhookError):
+        breaker.call(fail)
+    assert breaker.state == "open"
+    clock.now = 4
+    with pytest.raises(TeamsCircuitOpenError) as excinfo:
+        breaker.call(lambda: "ok")
+    assert excinfo.value.retry_after == 6
+
+
+def test_half_open_probe(clock: FakeClock) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    with pytest.raises(TeamsWebhookError):
+        breaker.call(fail)
+    clock.now = 10
+    assert breaker.state == "half_open"
+    # A failed probe opens the circuit for another interval.
+    with pytest.raises(TeamsWebhookError):
+        breaker.call(fail)
+    assert breaker.state == "open"
+    clock.now = 19
+    with pytest.raises(TeamsCircuitOpenError):
+        breaker.call(lambda: "ok")
+    clock.now = 20
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == "closed"
+
+
+def test_probes_limited(clock: FakeClock) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    with pytest.raises(TeamsWebhookError):
+        breaker.call(fail)
+    clock.now = 10
+    breaker.before_call()
+    with pytest.raises(TeamsCircuitOpenError):
+        breaker.before_call()
+    # Errors that aren't failures release the probe without affecting the circuit.
+    breaker.record_failure(KeyError("bug"))
+    assert breaker.state == "half_open"
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_state_change_hook(clock: FakeClock) -> None:
+    changes: list[tuple[str, str]] = []
+    breaker = CircuitBreaker(
+        failure_threshold=1,
+        reset_timeout=10,
+        on_state_change=lambda old, new: changes.append((old, new)),
+    )
+    with pytest.raises(TeamsWebhookError):
+        breaker.call(fail)
+    clock.now = 10
+    breaker.call(lambda: "ok")
+    with pytest.raises(TeamsWebhookError):
+        breaker.call(fail)
+    breaker.reset()
+    assert changes == [
+        ("closed", "open"),
+        ("open", "half_open"),
+        ("half_open", "closed"),
+        ("closed", "open"),
+        ("open", "closed"),
+    ]
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match="failure_threshold"):
+        CircuitBreaker(failure_threshold=0)
+    with pytest.raises(ValueError, match="reset_timeout"):
+        CircuitBreaker(reset_timeout=0)
+    with pytest.raises(ValueError, match="probes"):
+        CircuitBreaker(probes=0)
+
+
+def test_webhook_fails_fast() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        raise httpx.ConnectTimeout("timed out", request=request)
+
+    channel = TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        circuit=CircuitBreaker(failure_threshold=2),
+    )
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectTimeout):
+            channel.send_message("Disk full")
+    for _ in range(5):
+        with pytest.raises(TeamsCircuitOpenError):
+            channel.send_message("Disk full")
+    assert len(requests) == 2
+
+
+def test_webhook_spools_while_open(tmp_path: pathlib.Path) -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="1")
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    with pytest.raises(TeamsWebhookError):
+        breaker.call(fail)
+    with Spool(tmp_path) as spool:
+        channel = TeamsWebhook(
+            "https://example.com/",
+            transport=httpx.MockTransport(handler),
+            spool=spool,
+            circuit=breaker,
+        )
+        assert channel.send_message("Disk full") is None
+        deadline = time.monotonic() + 5
+        while len(spool) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        channel.close()
+        assert len(spool) == 0
+    assert len(requests) == 1
+    assert breaker.state == "closed"
+
+
+def test_async_webhook_fails_fast() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(500, text="Internal Server Error")
+
+    async def run() -> None:
+        channel = AsyncTeamsWebhook(
+            "https://example.com/",
+            transport=httpx.MockTransport(handler),
+            circuit=CircuitBreaker(failure_threshold=1),
+        )
+        with pytest.raises(TeamsWebhookError):
+            await channel.send_message("Disk full")
+        with pytest.raises(TeamsCircuitOpenError):
+            await channel.send_message("Disk full")
+        await channel.close()
+
+    asyncio.run(run())
+    assert len(requests) == 1
+
+
+def test_malformed_payloads_not_counted() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="Microsoft Teams endpoint returned HTTP error 400")
+
+    breaker = CircuitBreaker(failure_threshold=1)
+    channel = TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        circuit=breaker,
+    )
+    for _ in range(3):
+        with pytest.raises(TeamsWebhookError, match="Bad request"):
+            channel.send_message("Disk full")
+    assert breaker.state == "closed"
+    assert len(requests) == 3  # noqa: PLR2004
@@ -0,0 +1,210 @@
+"""Message coalescing unit tests."""
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from msteams_webhooks import (
+    AsyncMessageCoalescer,
+    AsyncTeamsWebhook,
+    MessageCoalescer,
+    TeamsWebhook,
+)
+from msteams_webhooks.coalesce import digest_card
+from msteams_webhooks.exceptions import TeamsWebhookError
+
+
+def webhook(requests: list[dict], **kwargs: object) -> TeamsWebhook:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content)["attachments"][0]["content"])
+        return httpx.Response(200, text="1")
+
+    return TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+def test_digest_card() -> None:
+    entries = [("10:00:00", "Disk full"), ("10:00:01", "CPU high")]
+    body = digest_card(entries).serialize()["content"]["body"]
+    assert body[0]["text"] == "2 messages"
+    assert body[1]["facts"] == [{"title": t, "value": v} for t, v in entries]
+    body = digest_card(entries, heading="{count} alerts", layout="table").serialize()
+    table = body["content"]["body"][1]
+    assert body["content"]["body"][0]["text"] == "2 alerts"
+    assert table["type"] == "Table"
+    assert len(table["rows"]) == 3
+    with pytest.raises(ValueError, match="layout"):
+        digest_card(entries, layout="list")  # type: ignore[arg-type]
+
+
+def test_max_messages() -> None:
+    requests: list[dict] = []
+    coalescer = MessageCoalescer(webhook(requests), window=60, max_messages=10)
+    for i in range(25):
+        coalescer.send_message(f"Alert {i}", title=str(i))
+    assert len(requests) == 2
+    assert len(coalescer) == 5
+    assert requests[0]["body"][0]["text"] == "10 messages"
+    assert requests[1]["body"][1]["facts"][0] == {"title": "10", "value": "Alert 10"}
+    coalescer.close()
+    assert len(requests) == 3
+    assert len(coalescer) == 0
+
+
+def test_window() -> None:
+    requests: list[dict] = []
+    coalescer = MessageCoalescer(webhook(requests), window=0.05)
+    coalescer.send_message("First")
+    coalescer.send_message("Second")
+    assert not requests
+    deadline = time.monotonic() + 5
+    while not requests and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(requests) == 1
+    assert requests[0]["body"][0]["text"] == "2 messages"
+    assert coalescer._timer is None
+
+
+def test_single_message_sent_plain() -> None:
+    requests: list[dict] = []
+    coalescer = MessageCoalescer(webhook(requests))
+    coalescer.send_message("Only one")
+    coalescer.flush()
+    assert requests[0]["body"] == [{"type": "TextBlock", "text": "Only one", "wrap": True}]
+    coalescer.flush()
+    assert len(requests) == 1
+
+
+def test_digest_split_to_fit() -> None:
+    requests: list[dict] = []
+    coalescer = MessageCoalescer(
+        webhook(requests, max_payload_size=2048),
+        max_messages=200,
+        layout="table",
+    )
+    for i in range(200):
+        coalescer.send_message(f"Alert {i} " + "x" * 20, title=str(i))
+    assert 1 < len(requests) < 200
+    rows = [row for card in requests for row in card["body"][-1]["rows"][1:]]
+    assert len(rows) == 200
+
+
+def test_failed_send_keeps_messages() -> None:
+    requests: list[dict] = []
+    failures = [True]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if failures and failures.pop():
+            return httpx.Response(500, text="Internal Server Error")
+        requests.append(json.loads(request.content)["attachments"][0]["content"])
+        return httpx.Response(200, text="1")
+
+    channel = TeamsWebhook("https://example.com/", transport=httpx.MockTransport(handler))
+    coalescer = MessageCoalescer(channel, window=60, max_messages=3)
+    coalescer.send_message("Alert 0", title="0")
+    coalescer.send_message("Alert 1", title="1")
+    with pytest.raises(TeamsWebhookError):
+        coalescer.send_message("Alert 2", title="2")
+    assert len(coalescer) == 3
+    coalescer.send_message("Alert 3", title="3")
+    assert len(coalescer) == 0
+    assert [fact["value"] for fact in requests[0]["body"][1]["facts"]] == [
+        "Alert 0",
+        "Alert 1",
+        "Alert 2",
+        "Alert 3",
+    ]
+
+
+def test_failed_page_keeps_only_unsent_messages() -> None:
+    requests: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if len(requests) == 2:  # noqa: PLR2004
+            requests.append({})
+            return httpx.Response(500, text="Internal Server Error")
+        requests.append(json.loads(request.content)["attachments"][0]["content"])
+        return httpx.Response(200, text="1")
+
+    channel = TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        max_payload_size=2048,
+    )
+    coalescer = MessageCoalescer(channel, max_messages=100)
+    for i in range(60):
+        coalescer.send_message(f"Alert {i} " + "x" * 20, title=str(i))
+    with pytest.raises(TeamsWebhookError):
+        coalescer.flush()
+    sent = len(requests[1]["body"][-1]["facts"])
+    assert 0 < sent < 60  # noqa: PLR2004
+    assert len(coalescer) == 60 - sent
+    coalescer.close()
+    facts = [fact for card in requests if card for fact in card["body"][-1].get("facts", [])]
+    assert [fact["title"] for fact in facts] == [str(i) for i in range(60)]
+
+
+def test_invalid_arguments() -> None:
+    channel = webhook([])
+    with pytest.raises(ValueError, match="window"):
+        MessageCoalescer(channel, window=0)
+    with pytest.raises(ValueError, match="max_messages"):
+        MessageCoalescer(channel, max_messages=0)
+    with pytest.raises(ValueError, match="layout"):
+        MessageCoalescer(channel, layout="list")  # type: ignore[arg-type]
+
+
+def test_async_coalescer() -> None:
+    requests: list[dict] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(await request.aread())["attachments"][0]["content"])
+        return httpx.Response(200, text="1")
+
+    async def run() -> None:
+        channel = AsyncTeamsWebhook("https://example.com/", transport=httpx.MockTransport(handler))
+        coalescer = AsyncMessageCoalescer(channel, window=0.05, max_messages=3)
+        for i in range(4):
+            await coalescer.send_message(f"Alert {i}")
+        assert len(requests) == 1
+        await asyncio.sleep(0.2)
+        assert len(requests) == 2
+        await coalescer.send_message("Last")
+        await coalescer.close()
+        assert len(requests) == 3
+        await channel.close()
+
+    asyncio.run(run())
+    assert requests[0]["body"][0]["text"] == "3 messages"
+    assert requests[1]["body"][0]["text"] == "Alert 3"
+
+
+def test_async_failed_send_keeps_messages() -> None:
+    requests: list[dict] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if not requests:
+            requests.append({})
+            return httpx.Response(500, text="Internal Server Error")
+        requests.append(json.loads(await request.aread())["attachments"][0]["content"])
+        return httpx.Response(200, text="1")
+
+    async def run() -> None:
+        channel = AsyncTeamsWebhook("https://example.com/", transport=httpx.MockTransport(handler))
+        coalescer = AsyncMessageCoalescer(channel, window=0.05, max_messages=2)
+        await coalescer.send_message("Alert 0")
+        with pytest.raises(TeamsWebhookError):
+            await coalescer.send_message("Alert 1")
+        assert len(coalescer) == 2  # noqa: PLR2004
+        # The window is opened again, to retry without waiting for another message.
+        await asyncio.sleep(0.2)
+        assert len(coalescer) == 0
+        await channel.close()
+
+    asyncio.run(run())
+    assert len(requests[1]["body"][1]["facts"]) == 2  # noqa: PLR2004
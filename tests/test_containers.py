@@ -1,7 +1,12 @@
+import io
+
+import pytest
+
 from msteams_webhooks.actions import OpenURLAction
 from msteams_webhooks.containers import (
     ActionSet,
     Column,
+    ColumnarTable,
     ColumnSet,
     Container,
     Fact,
@@ -329,3 +334,35 @@ def test_table() -> None:
         ],
     )
     assert table.serialize() == payload
+
+
+def test_columnar_table() -> None:
+    rows = [("web01", 42, None), ("web02", 7.5, "ok")]
+    table = Table(
+        columns=[Column(), Column(), Column()],
+        rows=[
+            TableRow(cells=[TableCell(items=[TextBlock(text)]) for text in row])
+            for row in [("Host", "Load", "Status"), ("web01", "42", ""), ("web02", "7.5", "ok")]
+        ],
+        first_row_as_headers=True,
+        show_grid_lines=False,
+    )
+    columnar = ColumnarTable(rows, headers=["Host", "Load", "Status"], show_grid_lines=False)
+    assert columnar.serialize() == table.serialize()
+    assert ColumnarTable([]).serialize() == {"type": "Table"}
+
+
+def test_columnar_table_sources() -> None:
+    expected = ColumnarTable([("a", "1"), ("b", "2")], headers=["name", "value"]).serialize()
+    columns = ColumnarTable.from_columns({"name": ["a", "b"], "value": [1, 2]})
+    assert columns.serialize() == expected
+    csv = ColumnarTable.from_csv(io.StringIO("name,value\na,1\nb,2\n"))
+    assert csv.serialize() == expected
+
+
+def test_columnar_table_dataframe() -> None:
+    pandas = pytest.importorskip("pandas")
+    frame = pandas.DataFrame({"name": ["a", "b"], "value": [1, 2]})
+    expected = ColumnarTable([("a", "1"), ("b", "2")], headers=["name", "value"]).serialize()
+    assert ColumnarTable.from_dataframe(frame).serialize() == expected
+    assert ColumnarTable(frame.to_numpy()).rows == [("a", "1"), ("b", "2")]
@@ -0,0 +1,176 @@
+"""Deduplicator unit tests."""
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+from conftest import FakeClock
+
+from msteams_webhooks import (
+    AdaptiveCard,
+    AsyncTeamsWebhook,
+    Deduplicator,
+    DispatchQueue,
+    MessageWriter,
+    TeamsWebhook,
+    TextBlock,
+)
+from msteams_webhooks.exceptions import TeamsQueueFullError, TeamsWebhookError
+
+
+def card(text: str) -> AdaptiveCard:
+    return AdaptiveCard(body=[TextBlock(text)])
+
+
+def test_ttl(clock: FakeClock) -> None:
+    deduplicator = Deduplicator(ttl=60)
+    key = deduplicator.key_for([b"message"])
+    assert not deduplicator.check(key)
+    clock.now = 30
+    assert deduplicator.check(key)
+    assert deduplicator.check(deduplicator.key_for([memoryview(b"message")]))
+    assert deduplicator.repeats(key) == 2
+    assert not deduplicator.check(deduplicator.key_for([b"other"]))
+    # Repeats don't extend the time-to-live.
+    clock.now = 60
+    assert not deduplicator.check(key)
+    assert deduplicator.repeats(key) == 0
+    assert deduplicator.suppressed == 2
+
+
+def test_lru_eviction() -> None:
+    deduplicator = Deduplicator(maxsize=2)
+    assert not deduplicator.check("a")
+    assert not deduplicator.check("b")
+    assert deduplicator.check("a")
+    assert not deduplicator.check("c")
+    assert len(deduplicator) == 2
+    assert deduplicator.check("a")
+    assert not deduplicator.check("b")
+
+
+def test_key_function() -> None:
+    deduplicator = Deduplicator(key=lambda card: card.body[0].text.split(" at ")[0])
+    assert deduplicator.key_for([b"x"], card("Disk full at 10:00")) == "Disk full"
+    assert deduplicator.key_for([b"x"]) == deduplicator.key_for([b"x"], None)
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match="ttl"):
+        Deduplicator(ttl=0)
+    with pytest.raises(ValueError, match="maxsize"):
+        Deduplicator(maxsize=0)
+
+
+def test_webhook_suppresses_repeats() -> None:
+    requests: list[httpx.Request] = []
+    status = [200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(status[0], text="1")
+
+    deduplicator = Deduplicator()
+    channel = TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        dedup=deduplicator,
+    )
+    for _ in range(5):
+        channel.send_card(card("Disk full"))
+    # Differs from the card above, since send_message wraps its text.
+    channel.send_message("Disk full")
+    channel.send_raw_bytes(b'{"type":"message","attachments":[]}')
+    channel.send_raw_bytes(b'{"type":"message","attachments":[]}')
+    assert len(requests) == 3
+    assert deduplicator.suppressed == 5
+    # A failed send is forgotten, so that it is not suppressed when sent again.
+    status[0] = 500
+    with pytest.raises(TeamsWebhookError):
+        channel.send_card(card("CPU high"))
+    status[0] = 200
+    channel.send_card(card("CPU high"))
+    assert len(requests) == 5
+
+
+def test_webhook_with_queue_and_writer() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="1")
+
+    channel = TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        queue=DispatchQueue(),
+        dedup=Deduplicator(),
+    )
+    assert channel.send_card(card("Disk full")) is not None
+    assert channel.send_card(card("Disk full")) is None
+    channel.close()
+    channel = TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        writer=MessageWriter(),
+        dedup=Deduplicator(),
+    )
+    channel.send_card(card("Disk full"))
+    channel.send_card(card("Disk full"))
+    assert len(requests) == 2
+
+
+def test_dropped_message_not_suppressed() -> None:
+    started = threading.Event()
+    release = threading.Event()
+    sent: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        started.set()
+        release.wait(5)
+        sent.append(json.loads(request.content)["attachments"][0]["content"]["body"][0]["text"])
+        return httpx.Response(200, text="1")
+
+    channel = TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        queue=DispatchQueue(maxsize=1, overflow="drop_newest"),
+        dedup=Deduplicator(),
+    )
+    channel.send_card(card("first"))
+    started.wait(5)
+    second = channel.send_card(card("second"))
+    dropped = channel.send_card(card("third"))
+    assert second is not None
+    assert dropped is not None
+    with pytest.raises(TeamsQueueFullError):
+        dropped.result(5)
+    release.set()
+    second.result(5)
+    assert channel.send_card(card("third")) is not None
+    assert channel.close(timeout=5)
+    assert sent == ["first", "second", "third"]
+
+
+def test_async_webhook_suppresses_repeats() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="1")
+
+    async def run() -> None:
+        channel = AsyncTeamsWebhook(
+            "https://example.com/",
+            transport=httpx.MockTransport(handler),
+            dedup=Deduplicator(),
+        )
+        await channel.send_card(card("Disk full"))
+        results = await channel.send_many([card("Disk full"), card("CPU high")])
+        assert results[0].ok
+        assert results[0].response is None
+        await channel.close()
+
+    asyncio.run(run())
+    assert len(requests) == 2
@@ -0,0 +1,239 @@
+"""Dispatch queue and batch sending unit tests."""
+import asyncio
+import json
+import threading
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+
+from msteams_webhooks import (
+    AdaptiveCard,
+    AsyncTeamsWebhook,
+    DispatchQueue,
+    TeamsWebhook,
+    TextBlock,
+)
+from msteams_webhooks.exceptions import (
+    TeamsQueueClosedError,
+    TeamsQueueFullError,
+    TeamsWebhookError,
+)
+
+
+def test_submit_returns_result() -> None:
+    queue = DispatchQueue()
+    future = queue.submit(sum, [1, 2, 3])
+    assert future.result(timeout=5) == 6  # noqa: PLR2004
+    assert queue.close(timeout=5)
+
+
+def test_drop_policies() -> None:
+    release = threading.Event()
+    started = threading.Event()
+
+    def block() -> None:
+        started.set()
+        release.wait(5)
+
+    for overflow, dropped in (("drop_newest", 2), ("drop_oldest", 0)):
+        release.clear()
+        started.clear()
+        queue = DispatchQueue(maxsize=2, overflow=overflow)
+        queue.submit(block)
+        started.wait(5)
+        futures = [queue.submit(str, n) for n in range(3)]
+        assert isinstance(futures[dropped].exception(timeout=0), TeamsQueueFullError)
+        release.set()
+        assert queue.close(timeout=5)
+        kept = [f.result() for n, f in enumerate(futures) if n != dropped]
+        assert kept == [str(n) for n in range(3) if n != dropped]
+
+
+def test_block_timeout() -> None:
+    release = threading.Event()
+    queue = DispatchQueue(maxsize=1, overflow="block", block_timeout=0.01)
+    queue.submit(release.wait, 5)
+    queue.submit(str)
+    queue.submit(str)
+    assert isinstance(queue.submit(str).exception(timeout=0), TeamsQueueFullError)
+    release.set()
+    queue.close(timeout=5)
+
+
+def test_priority_lanes() -> None:
+    release = threading.Event()
+    started = threading.Event()
+    sent: list[str] = []
+
+    def block() -> None:
+        started.set()
+        release.wait(5)
+
+    queue = DispatchQueue()
+    queue.submit(block)
+    started.wait(5)
+    for name, priority in (("low", "low"), ("normal", "normal"), ("high 1", "high")):
+        queue.submit(sent.append, name, priority=priority)
+    queue.submit(sent.append, "high 2", priority="high")
+    assert queue.pending("high") == 2  # noqa: PLR2004
+    assert len(queue) == 4  # noqa: PLR2004
+    release.set()
+    assert queue.close(timeout=5)
+    assert sent == ["high 1", "high 2", "normal", "low"]
+    with pytest.raises(ValueError, match="priority"):
+        queue.submit(str, priority="urgent")  # type: ignore[arg-type]
+
+
+def test_full_queue_sheds_lowest_priority() -> None:
+    release = threading.Event()
+    started = threading.Event()
+
+    def block() -> None:
+        started.set()
+        release.wait(5)
+
+    for overflow in ("block", "drop_newest", "drop_oldest"):
+        release.clear()
+        started.clear()
+        queue = DispatchQueue(maxsize=2, overflow=overflow, block_timeout=0.01)
+        queue.submit(block)
+        started.wait(5)
+        low = [queue.submit(str, n, priority="low") for n in range(2)]
+        normal = queue.submit(str, "normal")
+        high = queue.submit(str, "high", priority="high")
+        assert all(isinstance(f.exception(timeout=0), TeamsQueueFullError) for f in low)
+        # Jobs of lower priority never displace those of higher priority.
+        assert isinstance(queue.submit(str, priority="low").exception(0), TeamsQueueFullError)
+        release.set()
+        assert queue.close(timeout=5)
+        assert normal.result() == "normal"
+        assert high.result() == "high"
+
+
+def test_queued_webhook_priority() -> None:
+    sent: list[str] = []
+    release = threading.Event()
+    started = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        started.set()
+        release.wait(5)
+        sent.append(json.loads(request.content)["attachments"][0]["content"]["body"][0]["text"])
+        return httpx.Response(200, text="1")
+
+    channel = TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        queue=DispatchQueue(),
+    )
+    channel.send_message("first")
+    started.wait(5)
+    channel.send_message("routine", priority="low")
+    channel.send_card(AdaptiveCard(body=[TextBlock("page")]), priority="high")
+    release.set()
+    assert channel.close(timeout=5)
+    assert sent == ["first", "page", "routine"]
+
+
+def test_flush_and_close() -> None:
+    queue = DispatchQueue(workers=2)
+    results: list[int] = []
+    for n in range(10):
+        queue.submit(results.append, n)
+    assert queue.flush(timeout=5)
+    assert sorted(results) == list(range(10))
+    assert queue.close(timeout=5)
+    with pytest.raises(TeamsQueueClosedError):
+        queue.submit(str)
+
+
+def test_close_cancels_undrained_jobs() -> None:
+    release = threading.Event()
+    queue = DispatchQueue()
+    queue.submit(release.wait, 5)
+    pending = queue.submit(str)
+    assert not queue.close(timeout=0.01)
+    assert pending.cancelled()
+    release.set()
+
+
+def test_queued_webhook() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if b"bad" in request.content:
+            return httpx.Response(200, text="400")
+        return httpx.Response(200, text="1")
+
+    channel = TeamsWebhook("https://example.com/", queue=DispatchQueue())
+    channel.client = httpx.Client(transport=httpx.MockTransport(handler))
+    good = channel.send_message("good")
+    bad = channel.send_message("bad")
+    assert good is not None
+    assert bad is not None
+    assert channel.flush(timeout=5)
+    assert good.result().text == "1"
+    assert isinstance(bad.exception(), TeamsWebhookError)
+    assert channel.close(timeout=5)
+
+
+def test_unqueued_webhook_returns_none() -> None:
+    channel = TeamsWebhook("https://example.com/")
+    channel.client = httpx.Client(transport=httpx.MockTransport(lambda _: httpx.Response(200)))
+    assert channel.send_message("Hello, World!") is None
+
+
+def test_send_many() -> None:
+    in_flight = 0
+    peak = 0
+    sent: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        text = json.loads(request.content)["attachments"][0]["content"]["body"][0]["text"]
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        sent.append(text)
+        return httpx.Response(200, text="400" if text == "3" else "1")
+
+    async def cards() -> AsyncIterator[AdaptiveCard]:
+        for n in range(10):
+            yield AdaptiveCard(body=[TextBlock(str(n))])
+
+    channel = AsyncTeamsWebhook("https://example.com/")
+    channel.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    results = asyncio.run(channel.send_many(cards(), concurrency=3))
+    assert peak == 3  # noqa: PLR2004
+    assert [r.card.body[0].text for r in results] == [str(n) for n in range(10)]
+    assert [r.ok for r in results] == [n != 3 for n in range(10)]  # noqa: PLR2004
+    assert isinstance(results[3].exception, TeamsWebhookError)
+    assert results[0].response is not None
+    assert sorted(sent) == [str(n) for n in range(10)]
+
+
+def test_send_many_orders_by_key() -> None:
+    sent: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        text = json.loads(request.content)["attachments"][0]["content"]["body"][0]["text"]
+        # Earlier cards take longer, so without ordering they would finish last.
+        await asyncio.sleep(0.01 * (10 - int(text[1:])))
+        sent.append(text)
+        return httpx.Response(200, text="1")
+
+    cards = [AdaptiveCard(body=[TextBlock(f"{lane}{n}")]) for n in range(5) for lane in "ab"]
+    channel = AsyncTeamsWebhook("https://example.com/")
+    channel.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    results = asyncio.run(
+        channel.send_many(cards, concurrency=10, key=lambda card: card.body[0].text[0]),
+    )
+    assert all(r.ok for r in results)
+    for lane in "ab":
+        assert [t for t in sent if t[0] == lane] == [f"{lane}{n}" for n in range(5)]
+
+
+def test_send_many_invalid_concurrency() -> None:
+    channel = AsyncTeamsWebhook("https://example.com/")
+    with pytest.raises(ValueError, match="concurrency"):
+        asyncio.run(channel.send_many([], concurrency=0))
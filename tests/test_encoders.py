@@ -0,0 +1,56 @@
+"""Encoder unit tests."""
+import json
+
+import httpx
+import pytest
+
+from msteams_webhooks import AdaptiveCard, TeamsWebhook, TextBlock, encoders
+
+PAYLOAD = {"type": "message", "text": "Grüße, “World” \\ 🌍", "count": 3, "ok": True, "none": None}
+
+
+@pytest.mark.parametrize(
+    ("encoder", "module"),
+    [
+        (encoders.json_encoder, None),
+        (encoders.orjson_encoder, "orjson"),
+        (encoders.msgspec_encoder, "msgspec"),
+    ],
+)
+def test_encoders_are_equivalent(encoder: encoders.Encoder, module: str) -> None:
+    if module:
+        pytest.importorskip(module)
+    encoded = encoder(PAYLOAD)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == PAYLOAD
+    assert encoded == encoders.json_encoder(PAYLOAD)
+
+
+def test_encode_message() -> None:
+    card = AdaptiveCard(body=[TextBlock("Hello, World!")])
+    message = encoders.encode_message(card.to_json())
+    assert json.loads(message) == {"type": "message", "attachments": [card.serialize()]}
+
+
+def test_webhook_uses_encoder() -> None:
+    requests: list[httpx.Request] = []
+    encoded: list[object] = []
+
+    def encoder(data: object) -> bytes:
+        encoded.append(data)
+        return encoders.json_encoder(data)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="1")
+
+    channel = TeamsWebhook(
+        "https://example.com/",
+        encoder=encoder,
+        transport=httpx.MockTransport(handler),
+    )
+    channel.send_card(data={"contentType": "test"})
+    assert encoded == [{"type": "message", "attachments": [{"contentType": "test"}]}]
+    channel.send_raw_bytes(b'{"type":"message","attachments":[]}')
+    assert len(encoded) == 1
+    assert requests[1].content == b'{"type":"message","attachments":[]}'
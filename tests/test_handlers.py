@@ -0,0 +1,210 @@
+"""Teams logging handler unit tests."""
+import json
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import httpx
+import pytest
+
+from msteams_webhooks import TeamsLogHandler, TeamsWebhook
+
+
+@pytest.fixture()
+def logger() -> Iterator[logging.Logger]:
+    logger = logging.getLogger("msteams_webhooks.tests")
+    logger.propagate = False
+    yield logger
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+
+def channel(handler: Any) -> TeamsWebhook:  # noqa: ANN401
+    return TeamsWebhook("https://example.com/", transport=httpx.MockTransport(handler))
+
+
+def bodies(requests: list[httpx.Request]) -> list[list[dict[str, Any]]]:
+    return [json.loads(r.content)["attachments"][0]["content"]["body"] for r in requests]
+
+
+def test_records_sent_as_digest(logger: logging.Logger) -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="1")
+
+    teams = TeamsLogHandler(channel(handler), window=60, rate=None)
+    teams.setFormatter(logging.Formatter("%(name)s: %(message)s"))
+    logger.addHandler(teams)
+    logger.info("Not sent")
+    logger.error("Disk %s full", "/var")
+    try:
+        1 / 0  # noqa: B018
+    except ZeroDivisionError:
+        logger.exception("Division failed")
+    teams.close()
+    (body,) = bodies(requests)
+    assert body[0]["text"] == "2 log records"
+    facts = body[1]["facts"]
+    assert facts[0]["title"].endswith(" ERROR")
+    assert facts[0]["value"] == "msteams_webhooks.tests: Disk /var full"
+    assert "ZeroDivisionError" in facts[1]["value"]
+
+
+def test_window_and_max_records(logger: logging.Logger) -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="1")
+
+    teams = TeamsLogHandler(channel(handler), window=0.05, max_records=3, rate=None)
+    logger.addHandler(teams)
+    for n in range(4):
+        logger.error("Error %d", n)
+    deadline = time.monotonic() + 5
+    while len(requests) < 2 and time.monotonic() < deadline:  # noqa: PLR2004
+        time.sleep(0.01)
+    teams.close()
+    first, second = bodies(requests)
+    assert first[0]["text"] == "3 log records"
+    # A lone record is sent as plain text.
+    assert second[1]["text"] == "Error 3"
+
+
+def test_emit_never_blocks(logger: logging.Logger) -> None:
+    requests: list[httpx.Request] = []
+    sending, release = threading.Event(), threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sending.set()
+        release.wait(5)
+        requests.append(request)
+        return httpx.Response(200, text="1")
+
+    teams = TeamsLogHandler(channel(handler), max_records=1, capacity=5, rate=None)
+    logger.addHandler(teams)
+    # Hold the worker in its first send, so that every record dropped is reported together.
+    logger.error("Error %d", 0)
+    assert sending.wait(5)
+    started = time.monotonic()
+    for n in range(1, 100):
+        logger.error("Error %d", n)
+    assert time.monotonic() - started < 1
+    assert teams.dropped >= 90  # noqa: PLR2004
+    release.set()
+    teams.close()
+    assert len(requests) < 10  # noqa: PLR2004
+    # Dropped records are reported in the next card sent.
+    notes = [body[-1]["text"] for body in bodies(requests) if "dropped" in body[-1]["text"]]
+    assert notes == [f"{teams.dropped} more records were dropped while the queue was full."]
+
+
+def test_dropped_count_across_threads(logger: logging.Logger) -> None:
+    sending, release = threading.Event(), threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sending.set()
+        release.wait(5)
+        return httpx.Response(200, text="1")
+
+    teams = TeamsLogHandler(channel(handler), max_records=1, capacity=1, rate=None)
+    logger.addHandler(teams)
+    logger.error("First")
+    assert sending.wait(5)
+
+    def flood() -> None:
+        for n in range(200):
+            logger.error("Error %d", n)
+
+    threads = [threading.Thread(target=flood) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # One record fits in the queue; every other record is counted.
+    assert teams.dropped == 8 * 200 - 1
+    release.set()
+    teams.close()
+
+
+def test_close_waits_for_timeout_in_all(logger: logging.Logger) -> None:
+    sending, release = threading.Event(), threading.Event()
+    calls: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+        calls.append(1)
+        sending.set()
+        if len(calls) == 1:
+            time.sleep(0.3)
+        else:
+            release.wait(5)
+        return httpx.Response(200, text="1")
+
+    teams = TeamsLogHandler(channel(handler), max_records=1, capacity=1, rate=None, timeout=0.4)
+    logger.addHandler(teams)
+    logger.error("First")
+    assert sending.wait(5)
+    logger.error("Second")
+    started = time.monotonic()
+    # Queuing the stop waits for the first send, and joining only for the time left.
+    teams.close()
+    assert time.monotonic() - started < 0.55  # noqa: PLR2004
+    release.set()
+
+
+def test_truncation_and_size_cap(logger: logging.Logger) -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="1")
+
+    webhook = TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        max_payload_size=2000,
+    )
+    teams = TeamsLogHandler(webhook, max_length=100, rate=None)
+    logger.addHandler(teams)
+    for n in range(40):
+        logger.error("Error %d %s", n, "x" * 500)
+    teams.close()
+    assert len(requests) > 1
+    assert all(len(r.content) <= 2000 for r in requests)  # noqa: PLR2004
+    values = [
+        fact["value"]
+        for body in bodies(requests)
+        for element in body
+        if element["type"] == "FactSet"
+        for fact in element["facts"]
+    ]
+    assert len(values) == 40  # noqa: PLR2004
+    assert all(len(v) == 100 and v.endswith("…") for v in values)  # noqa: PLR2004
+
+
+def test_send_errors_handled(logger: logging.Logger, monkeypatch: pytest.MonkeyPatch) -> None:
+    errors: list[logging.LogRecord] = []
+    teams = TeamsLogHandler(channel(lambda _: httpx.Response(500)), rate=None)
+    monkeypatch.setattr(teams, "handleError", errors.append)
+    logger.addHandler(teams)
+    logger.error("Lost")
+    teams.close()
+    assert [r.getMessage() for r in errors] == ["Lost"]
+
+
+def test_invalid_arguments() -> None:
+    webhook = TeamsWebhook("https://example.com/")
+    with pytest.raises(ValueError, match="window"):
+        TeamsLogHandler(webhook, window=0)
+    with pytest.raises(ValueError, match="max_records"):
+        TeamsLogHandler(webhook, max_records=0)
+    with pytest.raises(ValueError, match="capacity"):
+        TeamsLogHandler(webhook, capacity=0)
+    with pytest.raises(ValueError, match="max_length"):
+        TeamsLogHandler(webhook, max_length=0)
+    with pytest.raises(ValueError, match="layout"):
+        TeamsLogHandler(webhook, layout="list")  # type: ignore[arg-type]
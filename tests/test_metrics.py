@@ -0,0 +1,148 @@
+"""Instrumentation unit tests."""
+import asyncio
+import math
+import threading
+
+import httpx
+import pytest
+
+from msteams_webhooks import (
+    AdaptiveCard,
+    AsyncTeamsWebhook,
+    DispatchQueue,
+    MessageWriter,
+    MetricsCollector,
+    RetryPolicy,
+    TeamsWebhook,
+    TextBlock,
+)
+from msteams_webhooks.encoders import encode_message
+from msteams_webhooks.exceptions import TeamsRateLimitError, TeamsWebhookError
+from msteams_webhooks.metrics import Histogram
+
+
+def test_histogram() -> None:
+    histogram = Histogram([1, 2, 4, 8])
+    assert math.isnan(histogram.quantile(0.5))
+    for value in (0.5, 1.5, 1.5, 3, 3, 3, 3, 6, 6, 20):
+        histogram.observe(value)
+    assert histogram.counts == [1, 2, 4, 2, 1]
+    assert histogram.quantile(0.5) == 3.0  # noqa: PLR2004
+    assert histogram.quantile(1.0) == 20  # noqa: PLR2004
+    summary = histogram.summary()
+    assert summary["count"] == 10  # noqa: PLR2004
+    assert summary["mean"] == pytest.approx(4.75)
+    assert summary["max"] == 20  # noqa: PLR2004
+    with pytest.raises(ValueError, match="buckets"):
+        Histogram([2, 1])
+
+
+def test_webhook_records_requests() -> None:
+    responses = iter(["1", "429", "1", "500"])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        text = next(responses)
+        if text == "500":
+            return httpx.Response(500, text="Internal Server Error")
+        return httpx.Response(200, text=text)
+
+    metrics = MetricsCollector()
+    channel = TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        retry=RetryPolicy(max_attempts=2, base_delay=0.001),
+        observer=metrics,
+    )
+    card = AdaptiveCard(body=[TextBlock("Disk full")])
+    channel.send_card(card)
+    channel.send_card(AdaptiveCard(body=[TextBlock("CPU high")]))
+    with pytest.raises(TeamsWebhookError):
+        channel.send_raw_bytes(b'{"type":"message","attachments":[]}')
+    assert metrics.requests == {"ok": 2, "rate_limited": 1, "error": 1}
+    assert metrics.retries == 1
+    assert metrics.serialize_seconds.count == 2  # noqa: PLR2004
+    assert metrics.encode_seconds.count == 2  # noqa: PLR2004
+    assert metrics.request_seconds.count == 4  # noqa: PLR2004
+    assert metrics.payload_bytes.max == len(encode_message(card.to_json()))
+    summary = metrics.summary()
+    assert summary["requests"]["retries"] == 1
+    assert summary["request_seconds"]["count"] == 4  # noqa: PLR2004
+
+
+def test_queue_depth_and_writer() -> None:
+    release = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+        release.wait(5)
+        return httpx.Response(200, text="1")
+
+    metrics = MetricsCollector()
+    channel = TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        queue=DispatchQueue(),
+        observer=metrics,
+    )
+    for n in range(5):
+        channel.send_message(f"Message {n}")
+    release.set()
+    assert channel.close(timeout=5)
+    assert 4 <= metrics.max_queue_depth <= 5  # noqa: PLR2004
+    # The depth is reported again as the worker drains the queue.
+    assert metrics.queue_depth == 0
+    assert metrics.requests["ok"] == 5  # noqa: PLR2004
+
+    channel = TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        writer=MessageWriter(),
+        observer=metrics,
+    )
+    channel.send_message("Written")
+    assert metrics.encode_seconds.count == 6  # noqa: PLR2004
+    assert metrics.serialize_seconds.count == 5  # noqa: PLR2004
+
+
+def test_async_webhook_records_requests() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+        return httpx.Response(200, text="429")
+
+    metrics = MetricsCollector()
+
+    async def run() -> None:
+        channel = AsyncTeamsWebhook(
+            "https://example.com/",
+            transport=httpx.MockTransport(handler),
+            retry=RetryPolicy(max_attempts=3, base_delay=0.001),
+            observer=metrics,
+        )
+        with pytest.raises(TeamsRateLimitError):
+            await channel.send_message("Disk full")
+        await channel.close()
+
+    asyncio.run(run())
+    assert metrics.requests["rate_limited"] == 3  # noqa: PLR2004
+    assert metrics.retries == 2  # noqa: PLR2004
+
+
+def test_prometheus_export() -> None:
+    metrics = MetricsCollector(duration_buckets=[0.1, 1.0], size_buckets=[1024])
+    metrics.on_request(0.05, 2048, "ok")
+    metrics.on_request(0.5, 100, "rate_limited")
+    metrics.on_retry(2)
+    metrics.on_queue(5)
+    metrics.on_queue(3)
+    text = metrics.to_prometheus(prefix="teams")
+    assert "# TYPE teams_request_seconds histogram" in text
+    assert 'teams_request_seconds_bucket{le="0.1"} 1' in text
+    assert 'teams_request_seconds_bucket{le="1"} 2' in text
+    assert 'teams_request_seconds_bucket{le="+Inf"} 2' in text
+    assert "teams_request_seconds_sum 0.55" in text
+    assert "teams_request_seconds_count 2" in text
+    assert 'teams_payload_bytes_bucket{le="1024"} 1' in text
+    assert 'teams_requests_total{outcome="rate_limited"} 1' in text
+    assert "teams_retries_total 1" in text
+    assert "teams_queue_depth 3" in text
+    assert "# TYPE teams_queue_max_depth gauge" in text
+    assert "teams_queue_max_depth 5" in text
+    assert text.endswith("\n")
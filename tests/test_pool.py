@@ -0,0 +1,109 @@
+"""Connection pool unit tests."""
+import asyncio
+
+import httpx
+import pytest
+
+from msteams_webhooks import AsyncConnectionPool, AsyncTeamsWebhook, ConnectionPool, TeamsWebhook
+
+URL1 = "https://example.webhook.office.com/webhookb2/channel-1"
+URL2 = "https://example.webhook.office.com/webhookb2/channel-2"
+URL3 = "https://other.webhook.office.com/webhookb2/channel-3"
+
+
+def test_clients_shared_per_host() -> None:
+    with ConnectionPool(max_connections=10, keepalive_expiry=30.0) as pool:
+        channel1 = TeamsWebhook(URL1, pool=pool)
+        channel2 = TeamsWebhook(URL2, pool=pool)
+        channel3 = TeamsWebhook(URL3, pool=pool)
+        assert channel1.client is channel2.client
+        assert channel1.client is not channel3.client
+        assert len(pool) == 2  # noqa: PLR2004
+        assert pool.limits.max_connections == 10  # noqa: PLR2004
+        assert pool.limits.keepalive_expiry == 30.0  # noqa: PLR2004
+
+
+def test_closing_webhook_leaves_pool_open() -> None:
+    pool = ConnectionPool()
+    channel1 = TeamsWebhook(URL1, pool=pool)
+    channel2 = TeamsWebhook(URL2, pool=pool)
+    channel1.close()
+    assert not channel2.client.is_closed
+    pool.close()
+    assert channel2.client.is_closed
+    assert len(pool) == 0
+
+
+def test_unpooled_webhook_owns_client() -> None:
+    channel = TeamsWebhook(URL1)
+    channel.close()
+    assert channel.client.is_closed
+
+
+def test_async_pool() -> None:
+    async def run() -> None:
+        async with AsyncConnectionPool() as pool:
+            channel1 = AsyncTeamsWebhook(URL1, pool=pool)
+            channel2 = AsyncTeamsWebhook(URL2, pool=pool)
+            assert channel1.client is channel2.client
+            await channel1.close()
+            assert not channel2.client.is_closed
+        assert channel2.client.is_closed
+
+    asyncio.run(run())
+
+
+def test_transport_and_limits() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="1")
+
+    channel = TeamsWebhook(
+        URL1,
+        limits=httpx.Limits(max_connections=1),
+        transport=httpx.MockTransport(handler),
+    )
+    channel.send_message("Hello, World!")
+    assert len(requests) == 1
+    assert str(requests[0].url) == URL1
+
+
+def test_pool_rejects_client_settings() -> None:
+    transport = httpx.MockTransport(lambda _: httpx.Response(200))
+    with ConnectionPool() as pool:
+        with pytest.raises(ValueError, match="pool"):
+            TeamsWebhook(URL1, pool=pool, http2=True)
+        with pytest.raises(ValueError, match="pool"):
+            TeamsWebhook(URL1, pool=pool, transport=transport)
+        with pytest.raises(ValueError, match="pool"):
+            TeamsWebhook(URL1, pool=pool, verify=False)
+        with pytest.raises(ValueError, match="pool"):
+            TeamsWebhook(URL1, pool=pool, timeout=30.0)
+
+
+def test_pool_settings_used_by_clients() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="1")
+
+    with ConnectionPool(timeout=30.0, transport=httpx.MockTransport(handler)) as pool:
+        channel1 = TeamsWebhook(URL1, pool=pool)
+        channel3 = TeamsWebhook(URL3, pool=pool)
+        channel1.send_message("One")
+        channel3.send_message("Three")
+        assert channel1.client.timeout == httpx.Timeout(30.0)
+    assert [str(request.url) for request in requests] == [URL1, URL3]
+
+    async def run() -> None:
+        transport = httpx.MockTransport(handler)
+        async with AsyncConnectionPool(transport=transport) as pool:
+            await AsyncTeamsWebhook(URL2, pool=pool).send_message("Two")
+            with pytest.raises(ValueError, match="pool"):
+                AsyncTeamsWebhook(URL2, pool=pool, verify=False)
+
+    asyncio.run(run())
+    assert str(requests[-1].url) == URL2
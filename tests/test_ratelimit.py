@@ -0,0 +1,68 @@
+"""Rate limiter unit tests."""
+import asyncio
+
+import httpx
+import pytest
+from conftest import FakeClock
+
+from msteams_webhooks import AsyncTeamsWebhook, RateLimiter, TeamsWebhook, ratelimit
+
+
+def test_burst_is_not_delayed(clock: FakeClock) -> None:
+    limiter = RateLimiter(rate=2, burst=3)
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.sleeps == []
+
+
+def test_waits_for_next_token(clock: FakeClock) -> None:
+    limiter = RateLimiter(rate=4, burst=1)
+    limiter.acquire()
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.sleeps == [0.25, 0.25]
+
+
+def test_tokens_refill_over_time(clock: FakeClock) -> None:
+    limiter = RateLimiter(rate=1, burst=2)
+    limiter.acquire()
+    limiter.acquire()
+    clock.now += 10
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.sleeps == []
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match="rate"):
+        RateLimiter(rate=0)
+    with pytest.raises(ValueError, match="burst"):
+        RateLimiter(rate=1, burst=0)
+
+
+def test_webhook_acquires_token(clock: FakeClock) -> None:
+    channel = TeamsWebhook("https://example.com/", rate_limiter=RateLimiter(rate=10))
+    channel.client = httpx.Client(transport=httpx.MockTransport(lambda _: httpx.Response(200)))
+    channel.send_message("one")
+    channel.send_message("two")
+    assert clock.sleeps == [pytest.approx(0.1)]
+
+
+def test_async_webhook_acquires_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    delays: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        delays.append(seconds)
+
+    monkeypatch.setattr(ratelimit.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: 0.0)
+    channel = AsyncTeamsWebhook("https://example.com/", rate_limiter=RateLimiter(rate=2))
+    channel.client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda _: httpx.Response(200)),
+    )
+
+    async def send() -> None:
+        await asyncio.gather(*(channel.send_message(str(i)) for i in range(3)))
+
+    asyncio.run(send())
+    assert delays == [0.5, 1.0]
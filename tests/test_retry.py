@@ -0,0 +1,95 @@
+"""Retry policy unit tests."""
+import asyncio
+
+import httpx
+import pytest
+
+from msteams_webhooks import AsyncTeamsWebhook, RetryPolicy, TeamsWebhook, retry
+from msteams_webhooks.exceptions import TeamsRateLimitError, TeamsWebhookError
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    sleeps: list[float] = []
+
+    async def fake_async_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(retry.time, "sleep", sleeps.append)
+    monkeypatch.setattr(retry.asyncio, "sleep", fake_async_sleep)
+    return sleeps
+
+
+def flaky_transport(*responses: httpx.Response) -> httpx.MockTransport:
+    """Return a transport that replays `responses`, then succeeds."""
+    queue = list(responses)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if queue:
+            return queue.pop(0)
+        return httpx.Response(200, text="1")
+
+    return httpx.MockTransport(handler)
+
+
+def test_backoff_without_jitter() -> None:
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0, jitter=0.0)
+    assert [policy.backoff(n) for n in range(1, 6)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+
+def test_full_jitter_stays_within_bounds() -> None:
+    policy = RetryPolicy(base_delay=1.0, max_delay=8.0)
+    delays = [policy.backoff(4) for _ in range(100)]
+    assert all(0.0 <= delay <= 8.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_next_delay_limits() -> None:
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0, jitter=0.0, deadline=2.5)
+    assert policy.next_delay(1, TeamsRateLimitError(), elapsed=0.0) == 1.0
+    assert policy.next_delay(1, ValueError(), elapsed=0.0) is None
+    assert policy.next_delay(2, TeamsRateLimitError(), elapsed=1.0) is None
+    assert policy.next_delay(3, TeamsRateLimitError(), elapsed=0.0) is None
+
+
+def test_webhook_retries_rate_limit(no_sleep: list[float]) -> None:
+    channel = TeamsWebhook("https://example.com/", retry=RetryPolicy(jitter=0.0))
+    channel.client = httpx.Client(
+        transport=flaky_transport(httpx.Response(200, text="429"), httpx.Response(200, text="429")),
+    )
+    channel.send_message("Hello, World!")
+    assert channel.response.text == "1"
+    assert no_sleep == [0.5, 1.0]
+
+
+def test_webhook_gives_up(no_sleep: list[float]) -> None:
+    channel = TeamsWebhook("https://example.com/", retry=RetryPolicy(max_attempts=2))
+    channel.client = httpx.Client(transport=flaky_transport(*[httpx.Response(200, text="429")] * 2))
+    with pytest.raises(TeamsRateLimitError):
+        channel.send_message("Hello, World!")
+    assert len(no_sleep) == 1
+
+
+def test_webhook_does_not_retry_bad_request(no_sleep: list[float]) -> None:
+    channel = TeamsWebhook("https://example.com/", retry=RetryPolicy())
+    channel.client = httpx.Client(transport=flaky_transport(httpx.Response(200, text="400")))
+    with pytest.raises(TeamsWebhookError):
+        channel.send_message("Hello, World!")
+    assert no_sleep == []
+
+
+def test_async_webhook_retries_network_error(no_sleep: list[float]) -> None:
+    attempts = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise httpx.ReadError("Connection reset by peer", request=request)
+        return httpx.Response(200, text="1")
+
+    channel = AsyncTeamsWebhook("https://example.com/", retry=RetryPolicy(jitter=0.0))
+    channel.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    asyncio.run(channel.send_message("Hello, World!"))
+    assert attempts == 2
+    assert no_sleep == [0.5]
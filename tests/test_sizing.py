@@ -0,0 +1,200 @@
+"""Payload size guard and card splitting unit tests."""
+import asyncio
+import gc
+import json
+from typing import Optional
+
+import httpx
+import pytest
+
+from msteams_webhooks import (
+    AdaptiveCard,
+    AsyncTeamsWebhook,
+    ColumnarTable,
+    Fact,
+    FactSet,
+    Table,
+    TableCell,
+    TableRow,
+    TeamsWebhook,
+    TextBlock,
+)
+from msteams_webhooks.encoders import encode_message
+from msteams_webhooks.exceptions import TeamsPayloadTooLargeError
+from msteams_webhooks.sizing import MAX_PAYLOAD_SIZE, check_size, encode_card, split_card
+
+
+def row(text: str) -> TableRow:
+    return TableRow(cells=[TableCell(items=[TextBlock(text)])])
+
+
+def size(card: AdaptiveCard) -> int:
+    return len(encode_message(card.to_json()))
+
+
+def test_check_size() -> None:
+    check_size(b"x" * 10, 10)
+    check_size(b"x" * 10, None)
+    with pytest.raises(TeamsPayloadTooLargeError, match="11 bytes"):
+        check_size(b"x" * 11, 10)
+
+
+def test_split_body() -> None:
+    card = AdaptiveCard(body=[TextBlock(f"Line {i} " + "x" * 100) for i in range(50)])
+    pages = split_card(card, 1024)
+    assert len(pages) > 1
+    assert all(size(page) <= 1024 for page in pages)
+    texts = [element.text for page in pages for element in page.body]
+    assert texts == [element.text for element in card.body]
+
+
+def test_split_table_repeats_header() -> None:
+    rows = [row("Header"), *(row(f"Value {i} " + "x" * 50) for i in range(100))]
+    table = Table(rows=rows, first_row_as_headers=True)
+    card = AdaptiveCard(body=[TextBlock("Report"), table])
+    pages = split_card(card, 2048)
+    tables = [element for page in pages for element in page.body if isinstance(element, Table)]
+    assert len(tables) > 1
+    assert all(size(page) <= 2048 for page in pages)
+    assert all(t.rows[0] is rows[0] for t in tables)
+    assert [r for t in tables for r in t.rows[1:]] == rows[1:]
+    assert card.body[1] is table
+    assert len(table.rows) == 101
+
+
+def test_split_fact_set() -> None:
+    facts = [Fact(f"Key {i}", "x" * 40) for i in range(100)]
+    pages = split_card(AdaptiveCard(body=[FactSet(facts=facts)]), 1024)
+    assert all(size(page) <= 1024 for page in pages)
+    assert [f for page in pages for f in page.body[0].facts] == facts
+
+
+def test_split_columnar_table() -> None:
+    rows = [(f"host{i:03}", "x" * 40, i) for i in range(200)]
+    table = ColumnarTable(rows, headers=["Host", "Detail", "Index"])
+    pages = split_card(AdaptiveCard(body=[table]), 4096)
+    assert len(pages) > 1
+    assert all(size(page) <= 4096 for page in pages)
+    assert all(page.body[0].headers == ("Host", "Detail", "Index") for page in pages)
+    assert [r for page in pages for r in page.body[0].rows] == table.rows
+
+
+def test_split_columnar_table_without_headers() -> None:
+    table = ColumnarTable([("x" * 30,) * 8] * 300)
+    contents = encode_card(AdaptiveCard(body=[table]), split=True)
+    assert len(contents) > 1
+    assert all(len(content) <= MAX_PAYLOAD_SIZE for content in contents)
+    pages = split_card(AdaptiveCard(body=[table]), 4096)
+    assert all(size(page) <= 4096 for page in pages)
+    assert [r for page in pages for r in page.body[0].rows] == table.rows
+
+
+def test_unsplittable() -> None:
+    card = AdaptiveCard(body=[TextBlock("x" * 2000)])
+    with pytest.raises(TeamsPayloadTooLargeError):
+        split_card(card, 1024)
+
+
+def test_encode_card() -> None:
+    card = AdaptiveCard(body=[TextBlock("x" * 100) for _ in range(20)])
+    assert encode_card(card, max_size=None) == [encode_message(card.to_json())]
+    with pytest.raises(TeamsPayloadTooLargeError):
+        encode_card(card, max_size=1024)
+    contents = encode_card(card, max_size=1024, split=True)
+    assert len(contents) > 1
+    assert all(len(content) <= 1024 for content in contents)
+
+
+def test_repeated_splits_dont_link_pages() -> None:
+    card = AdaptiveCard(body=[TextBlock(f"Line {i} " + "x" * 100) for i in range(40)])
+    text_block = card.body[0]
+    for _ in range(20):
+        split_card(card, 1024)
+        encode_card(card, max_size=1024, split=True)
+    gc.collect()
+    assert text_block._parents is not None
+    assert len(text_block._parents) == 1
+
+
+def test_split_reused_until_card_changes() -> None:
+    card = AdaptiveCard(body=[TextBlock(f"Line {i} " + "x" * 100) for i in range(40)])
+    first = encode_card(card, max_size=1024, split=True)
+    again = encode_card(card, max_size=1024, split=True)
+    assert again == first
+    assert all(a is b for a, b in zip(again, first))
+    assert encode_card(card, max_size=2048, split=True) != first
+    card.body[-1].text = "Changed"
+    changed = encode_card(card, max_size=1024, split=True)
+    assert b"Changed" in changed[-1]
+    assert b"Changed" not in first[-1]
+
+
+def test_default_max_payload_size() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="1")
+
+    transport = httpx.MockTransport(handler)
+    channel = TeamsWebhook("https://example.com/", transport=transport)
+    assert channel.max_payload_size == MAX_PAYLOAD_SIZE
+    channel.send_message("x" * (MAX_PAYLOAD_SIZE - 1024))
+    with pytest.raises(TeamsPayloadTooLargeError):
+        channel.send_message("x" * MAX_PAYLOAD_SIZE)
+    assert len(requests) == 1
+    # Oversized messages are posted as is without the check.
+    channel = TeamsWebhook("https://example.com/", transport=transport, max_payload_size=None)
+    channel.send_message("x" * MAX_PAYLOAD_SIZE)
+    assert len(requests) == 2  # noqa: PLR2004
+
+
+def test_send_encoded() -> None:
+    requests: list[bytes] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.content)
+        return httpx.Response(200, text="1")
+
+    card = AdaptiveCard(body=[TextBlock(f"Line {i} " + "x" * 100) for i in range(20)])
+    contents = encode_card(card, max_size=1024, split=True)
+    channel = TeamsWebhook("https://example.com/", transport=httpx.MockTransport(handler))
+    channel.send_encoded(contents, card)
+    assert requests == contents
+
+    async def run() -> Optional[httpx.Response]:
+        transport = httpx.MockTransport(handler)
+        channel = AsyncTeamsWebhook("https://example.com/", transport=transport)
+        response = await channel.send_encoded(contents, card)
+        await channel.close()
+        return response
+
+    response = asyncio.run(run())
+    assert response is not None
+    assert response.text == "1"
+    assert requests == contents * 2
+
+
+def test_send_oversized() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="1")
+
+    card = AdaptiveCard(body=[TextBlock(f"Line {i} " + "x" * 100) for i in range(50)])
+    transport = httpx.MockTransport(handler)
+    channel = TeamsWebhook("https://example.com/", transport=transport, max_payload_size=1024)
+    with pytest.raises(TeamsPayloadTooLargeError):
+        channel.send_card(card)
+    assert not requests
+
+    channel.split_oversized = True
+    channel.send_card(card)
+    assert len(requests) > 1
+    texts = [
+        element["text"]
+        for request in requests
+        for element in json.loads(request.content)["attachments"][0]["content"]["body"]
+    ]
+    assert texts == [element.text for element in card.body]
@@ -0,0 +1,162 @@
+"""Durable spool unit tests."""
+import asyncio
+import pathlib
+import time
+
+import httpx
+import pytest
+
+from msteams_webhooks import AsyncTeamsWebhook, RetryPolicy, Spool, TeamsWebhook
+
+
+def drain(spool: Spool) -> list[bytes]:
+    contents = []
+    while (content := spool.peek()) is not None:
+        contents.append(content)
+        spool.ack()
+    return contents
+
+
+def test_append_and_replay_in_order(tmp_path: pathlib.Path) -> None:
+    with Spool(tmp_path) as spool:
+        for i in range(10):
+            spool.append(f"message {i}".encode())
+        spool.append(memoryview(b"view"))
+        assert len(spool) == 11
+        assert spool.peek() == spool.peek() == b"message 0"
+        assert drain(spool) == [f"message {i}".encode() for i in range(10)] + [b"view"]
+        assert len(spool) == 0
+        assert spool.peek() is None
+
+
+def test_survives_reopening(tmp_path: pathlib.Path) -> None:
+    spool = Spool(tmp_path, fsync="always", segment_size=64)
+    for i in range(20):
+        spool.append(f"message {i}".encode())
+    for _ in range(5):
+        spool.peek()
+        spool.ack()
+    spool.close()
+    with Spool(tmp_path) as spool:
+        assert len(spool) == 15
+        assert drain(spool) == [f"message {i}".encode() for i in range(5, 20)]
+
+
+def test_segments_retired(tmp_path: pathlib.Path) -> None:
+    with Spool(tmp_path, segment_size=100) as spool:
+        for i in range(50):
+            spool.append(f"message {i}".encode())
+        assert len(list(tmp_path.glob("*.seg"))) > 5
+        drain(spool)
+        assert len(list(tmp_path.glob("*.seg"))) == 1
+        spool.append(b"again")
+        assert drain(spool) == [b"again"]
+
+
+def test_torn_record_discarded(tmp_path: pathlib.Path) -> None:
+    with Spool(tmp_path, fsync="never") as spool:
+        spool.append(b"complete")
+        spool.append(b"torn by a crash")
+    (segment,) = tmp_path.glob("*.seg")
+    segment.write_bytes(segment.read_bytes()[:-3])
+    with Spool(tmp_path) as spool:
+        assert len(spool) == 1
+        spool.append(b"after")
+        assert drain(spool) == [b"complete", b"after"]
+
+
+def test_invalid_arguments(tmp_path: pathlib.Path) -> None:
+    with pytest.raises(ValueError, match="fsync"):
+        Spool(tmp_path, fsync="sometimes")  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="fsync_interval"):
+        Spool(tmp_path, fsync_interval=0)
+    with pytest.raises(ValueError, match="segment_size"):
+        Spool(tmp_path, segment_size=0)
+
+
+def test_webhook_spools_during_outage(tmp_path: pathlib.Path) -> None:
+    received: list[bytes] = []
+    outage = [True]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if outage[0]:
+            raise httpx.ConnectError("unreachable", request=request)
+        received.append(request.content)
+        if len(received) == 2:
+            # Bad requests can never succeed, so they are discarded rather than retried.
+            return httpx.Response(200, text="400 Bad Request")
+        return httpx.Response(200, text="1")
+
+    spool = Spool(tmp_path)
+    channel = TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        retry=RetryPolicy(max_attempts=1, base_delay=0.01, max_delay=0.01),
+        spool=spool,
+    )
+    for i in range(3):
+        channel.send_raw_bytes(f"message {i}".encode())
+    assert len(spool) == 3
+    outage[0] = False
+    channel.send_raw_bytes(b"message 3")
+    deadline = time.monotonic() + 5
+    while len(spool) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert received == [f"message {i}".encode() for i in range(4)]
+    assert spool.discarded == 1
+    channel.close()
+    spool.close()
+
+
+def test_webhook_replays_after_restart(tmp_path: pathlib.Path) -> None:
+    with Spool(tmp_path) as spool:
+        spool.append(b"left over")
+    received: list[bytes] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append(request.content)
+        return httpx.Response(200, text="1")
+
+    spool = Spool(tmp_path)
+    transport = httpx.MockTransport(handler)
+    channel = TeamsWebhook("https://example.com/", transport=transport, spool=spool)
+    deadline = time.monotonic() + 5
+    while len(spool) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert received == [b"left over"]
+    channel.close()
+    spool.close()
+
+
+def test_async_webhook_spools_during_outage(tmp_path: pathlib.Path) -> None:
+    received: list[bytes] = []
+    outage = [True]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if outage[0]:
+            raise httpx.ConnectError("unreachable", request=request)
+        received.append(await request.aread())
+        return httpx.Response(200, text="1")
+
+    async def run(spool: Spool) -> None:
+        channel = AsyncTeamsWebhook(
+            "https://example.com/",
+            transport=httpx.MockTransport(handler),
+            retry=RetryPolicy(max_attempts=1, base_delay=0.01, max_delay=0.01),
+            spool=spool,
+        )
+        await channel.send_raw_bytes(b"message 0")
+        await channel.send_raw_bytes(b"message 1")
+        assert len(spool) == 2
+        outage[0] = False
+        await channel.send_raw_bytes(b"message 2")
+        for _ in range(500):
+            if not len(spool):
+                break
+            await asyncio.sleep(0.01)
+        await channel.close()
+
+    with Spool(tmp_path) as spool:
+        asyncio.run(run(spool))
+        assert len(spool) == 0
+    assert received == [b"message 0", b"message 1", b"message 2"]
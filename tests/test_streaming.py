@@ -0,0 +1,194 @@
+"""Streaming message writer unit tests."""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from msteams_webhooks import (
+    AdaptiveCard,
+    AsyncTeamsWebhook,
+    Column,
+    ColumnarTable,
+    ColumnSet,
+    Container,
+    Fact,
+    FactSet,
+    HeroCard,
+    MessageWriter,
+    OpenURLAction,
+    OpenURLButton,
+    ReceiptCard,
+    ReceiptFact,
+    ReceiptItem,
+    TeamsWebhook,
+    TextBlock,
+)
+from msteams_webhooks.base import Entity
+from msteams_webhooks.cards import Card
+from msteams_webhooks.encoders import encode_message
+from msteams_webhooks.exceptions import TeamsPayloadTooLargeError
+
+CARDS = [
+    AdaptiveCard(
+        body=[
+            TextBlock('Quote " and \\ and — and \n', weight="bolder", max_lines=2, wrap=False),
+            ColumnSet(columns=[Column(items=[Container(items=[TextBlock("Nested")])])]),
+            FactSet(facts=[Fact("Host", "web01"), Fact("Disk", "95%")]),
+            ColumnarTable([("a", 1), ("b", 2.5)], headers=["Name", "Value"]),
+        ],
+        actions=[OpenURLAction("https://example.com/")],
+    ),
+    HeroCard(
+        title="Hero",
+        text="Text",
+        images=["https://example.com/a.png", "https://example.com/b.png"],
+        buttons=[OpenURLButton("Open", "https://example.com/")],
+    ),
+    ReceiptCard(
+        title="Receipt",
+        items=[ReceiptItem("Item", "$1", 2, image="https://example.com/c.png")],
+        facts=[ReceiptFact("Order", "1234")],
+        total="$2",
+    ),
+]
+
+
+def write(writer: MessageWriter, card: Card) -> bytes:
+    with writer.message(card) as content:
+        return bytes(content)
+
+
+@pytest.mark.parametrize("card", CARDS)
+def test_matches_serialize(card: Card) -> None:
+    written = write(MessageWriter(), card)
+    assert written == encode_message(card.to_json())
+
+
+def test_uses_cached_json() -> None:
+    cached = TextBlock("Cached")
+    cached.to_json()
+    card = AdaptiveCard(body=[cached, TextBlock("Not cached")])
+    written = write(MessageWriter(), card)
+    assert written == encode_message(card.to_json())
+
+
+def test_subclass_overriding_serialize() -> None:
+    class Shout(TextBlock):
+        __slots__ = ()
+
+        def _serialize(self) -> dict:
+            return {**super()._serialize(), "text": self.text.upper()}
+
+    card = AdaptiveCard(body=[Shout("hello")])
+    written = json.loads(write(MessageWriter(), card))
+    assert written["attachments"][0]["content"]["body"][0]["text"] == "HELLO"
+
+
+def test_subclass_overriding_public_serialize() -> None:
+    class Upper(TextBlock):
+        __slots__ = ()
+
+        def serialize(self) -> dict:
+            payload = super().serialize()
+            return {**payload, "text": payload["text"].upper()}
+
+    card = AdaptiveCard(body=[Container(items=[Upper("hello")])])
+    written = json.loads(write(MessageWriter(), card))
+    assert written["attachments"][0]["content"]["body"][0]["items"][0]["text"] == "HELLO"
+
+
+def test_deeply_nested() -> None:
+    element: Entity = TextBlock("Leaf")
+    for _ in range(5000):
+        element = Container(items=[element])
+    written = write(MessageWriter(), AdaptiveCard(body=[element]))
+    assert written.count(b'"type":"Container"') == 5000
+
+
+def test_buffers_reused() -> None:
+    writer = MessageWriter(max_buffers=1)
+    with writer.message(CARDS[0]), writer.message(CARDS[1]):
+        assert not writer._buffers
+    assert len(writer._buffers) == 1
+    buffer = writer._buffers[0]
+    write(writer, CARDS[0])
+    # A shorter message overwrites the buffer from the start, leaving no stale tail.
+    written = write(writer, CARDS[1])
+    assert len(written) < len(write(writer, CARDS[0]))
+    assert json.loads(written) == json.loads(encode_message(CARDS[1].to_json()))
+    assert writer._buffers == [buffer]
+
+
+def test_view_held_after_message() -> None:
+    writer = MessageWriter()
+    with writer.message(CARDS[0]) as content:
+        held = memoryview(content)
+    assert not writer._buffers
+    held.release()
+
+
+def test_send_card_with_writer() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="1")
+
+    writer = MessageWriter()
+    channel = TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        writer=writer,
+    )
+    for card in CARDS:
+        channel.send_card(card)
+    for request, card in zip(requests, CARDS):
+        assert json.loads(request.content) == json.loads(encode_message(card.to_json()))
+        assert request.headers["Content-Length"] == str(len(request.content))
+        assert request.headers["Content-Type"] == "application/json"
+    assert len(writer._buffers) == 1
+
+
+def test_send_oversized_with_writer() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="1")
+
+    card = AdaptiveCard(body=[TextBlock("x" * 100) for _ in range(20)])
+    channel = TeamsWebhook(
+        "https://example.com/",
+        transport=httpx.MockTransport(handler),
+        writer=MessageWriter(),
+        max_payload_size=1024,
+    )
+    with pytest.raises(TeamsPayloadTooLargeError):
+        channel.send_card(card)
+    channel.split_oversized = True
+    channel.send_card(card)
+    assert len(requests) > 1
+
+
+def test_async_send_card_with_writer() -> None:
+    requests: list[bytes] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(await request.aread())
+        return httpx.Response(200, text="1")
+
+    async def run() -> None:
+        channel = AsyncTeamsWebhook(
+            "https://example.com/",
+            transport=httpx.MockTransport(handler),
+            writer=MessageWriter(),
+        )
+        await channel.send_card(CARDS[0])
+        results = await channel.send_many(CARDS)
+        assert all(result.exception is None for result in results)
+        await channel.close()
+
+    asyncio.run(run())
+    expected = [json.loads(encode_message(card.to_json())) for card in [CARDS[0], *CARDS]]
+    assert sorted(map(json.dumps, map(json.loads, requests))) == sorted(map(json.dumps, expected))
@@ -0,0 +1,66 @@
+"""Card template unit tests."""
+import json
+
+import httpx
+import pytest
+
+from msteams_webhooks import (
+    AdaptiveCard,
+    CardTemplate,
+    Fact,
+    FactSet,
+    Placeholder,
+    TeamsWebhook,
+    TextBlock,
+)
+
+
+def build_card(title: str, host: str, severity: str, max_lines: int) -> AdaptiveCard:
+    return AdaptiveCard(
+        body=[
+            TextBlock(title, weight="bolder", max_lines=max_lines),
+            TextBlock(f'Host "{host}" is {severity}'),
+            FactSet(facts=[Fact("Host", host), Fact("Severity", severity)]),
+        ],
+    )
+
+
+def test_render_matches_card() -> None:
+    template = CardTemplate(
+        build_card(
+            Placeholder("title"),
+            Placeholder("host"),
+            Placeholder("severity"),
+            Placeholder("max_lines"),  # type: ignore[arg-type]
+        ),
+    )
+    assert template.placeholders == {"title", "host", "severity", "max_lines"}
+    values = {"title": "Disk — full", "host": "web01", "severity": 'critical "!"', "max_lines": 2}
+    rendered = json.loads(template.render(**values))
+    expected = {"type": "message", "attachments": [build_card(**values).serialize()]}
+    assert rendered == expected
+
+
+def test_missing_value() -> None:
+    template = CardTemplate(AdaptiveCard(body=[TextBlock(Placeholder("title"))]))
+    with pytest.raises(KeyError):
+        template.render()
+
+
+def test_invalid_placeholder_name() -> None:
+    with pytest.raises(ValueError, match="identifier"):
+        Placeholder("not valid")
+
+
+def test_send_template() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text="1")
+
+    template = CardTemplate(AdaptiveCard(body=[TextBlock(Placeholder("text"))]))
+    channel = TeamsWebhook("https://example.com/", transport=httpx.MockTransport(handler))
+    channel.send_template(template, text="Hello, World!")
+    assert requests[0].content == template.render(text="Hello, World!")
+    assert requests[0].headers["Content-Type"] == "application/json"
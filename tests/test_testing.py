@@ -0,0 +1,114 @@
+"""Mock Teams server unit tests."""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from msteams_webhooks import (
+    AdaptiveCard,
+    AsyncTeamsWebhook,
+    MockTeamsServer,
+    TeamsWebhook,
+    TextBlock,
+    testing,
+)
+from msteams_webhooks.exceptions import TeamsRateLimitError, TeamsWebhookError
+
+URL = "https://example.webhook.office.com/webhookb2/test"
+
+
+def test_accepts_messages() -> None:
+    server = MockTeamsServer()
+    channel = TeamsWebhook(URL, transport=server.transport())
+    channel.send_message("hello")
+    channel.send_card(AdaptiveCard(body=[TextBlock("world")]))
+    assert channel.response.text == "1"
+    assert server.accepted == server.requests == 2  # noqa: PLR2004
+    texts = [m["attachments"][0]["content"]["body"][0]["text"] for m in server.messages]
+    assert texts == ["hello", "world"]
+    server.reset()
+    assert server.requests == 0
+    assert server.messages == []
+
+
+def test_rejects_malformed_messages() -> None:
+    server = MockTeamsServer()
+    channel = TeamsWebhook(URL, transport=server.transport())
+    bad = (
+        b"not json",
+        b"[]",
+        b'{"type": "message", "attachments": []}',
+        b'{"type": "message", "attachments": [{"contentType": "x"}]}',
+        b'{"type": "message", "attachments": [{"contentType":'
+        b' "application/vnd.microsoft.card.adaptive", "content": {"type": "Card"}}]}',
+    )
+    for content in bad:
+        with pytest.raises(TeamsWebhookError, match="Bad request"):
+            channel.send_raw_bytes(content)
+    channel.send_raw_bytes(b'{"text": "legacy"}')
+    assert server.malformed == len(bad)
+    assert server.messages == [{"text": "legacy"}]
+
+
+def test_rejects_oversized_messages() -> None:
+    server = MockTeamsServer(max_payload_size=100)
+    channel = TeamsWebhook(URL, transport=server.transport(), max_payload_size=None)
+    with pytest.raises(TeamsWebhookError, match="413"):
+        channel.send_message("x" * 100)
+    assert server.too_large == 1
+    assert server.accepted == 0
+
+
+def test_rate_limits_each_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 0.0
+    monkeypatch.setattr(testing.time, "monotonic", lambda: now)
+    server = MockTeamsServer(rate=1, burst=2)
+    first = TeamsWebhook(URL, transport=server.transport())
+    second = TeamsWebhook(URL + "2", transport=server.transport())
+    first.send_message("one")
+    first.send_message("two")
+    with pytest.raises(TeamsRateLimitError):
+        first.send_message("three")
+    second.send_message("other channel")
+    now = 1.0
+    first.send_message("four")
+    assert server.rate_limited == 1
+    assert server.accepted == 4  # noqa: PLR2004
+
+
+def test_async_latency() -> None:
+    server = MockTeamsServer(latency=0.05, jitter=0.01, seed=1)
+
+    async def run() -> float:
+        channel = AsyncTeamsWebhook(URL, transport=server.async_transport())
+        started = time.monotonic()
+        await asyncio.gather(*(channel.send_message(f"{i}") for i in range(10)))
+        elapsed = time.monotonic() - started
+        await channel.close()
+        return elapsed
+
+    # Requests wait out their latency concurrently.
+    elapsed = asyncio.run(run())
+    assert 0.05 <= elapsed < 0.5  # noqa: PLR2004
+    assert server.accepted == 10  # noqa: PLR2004
+
+
+def test_asgi_app() -> None:
+    server = MockTeamsServer()
+
+    async def run() -> None:
+        transport = httpx.ASGITransport(app=server)
+        channel = AsyncTeamsWebhook(URL, transport=transport)
+        await channel.send_message("over asgi")
+        with pytest.raises(TeamsWebhookError, match="Bad request"):
+            await channel.send_raw_bytes(b"{}")
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get(URL)
+            assert response.status_code == 405  # noqa: PLR2004
+        await channel.close()
+
+    asyncio.run(run())
+    assert server.accepted == 1
+    assert server.malformed == 1
+    assert server.messages[0]["attachments"][0]["content"]["body"][0]["text"] == "over asgi"